@@ -0,0 +1,97 @@
+"""
+Fit time and number of function evaluations with finite difference versus analytic Jacobians,
+for every FitMethods entry.
+
+nfev counts the model evaluations of the final fit. With the analytic Jacobian leastsq no longer
+needs one extra evaluation per free parameter and iteration, the Jacobian itself is not counted.
+The times include the estimators, which often run fits of simpler models themselves.
+
+    poetry run python benchmarks/bench_analytic_jacobian.py --points 1000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic, FitMethods  # noqa: E402
+
+
+def lorentzian_dips(x, centers, width=0.2, depth=0.3):
+    return 1 - sum(depth * width**2 / ((x - center)**2 + width**2) for center in centers)
+
+
+def make_data(name, estimator, x, rng):
+    """ Noisy data matching the fit, so that every model is fitted to a sensible signal. """
+    if name in ('decayexponential', 'decayexponentialstretched', 'biexponential'):
+        y = 2 * np.exp(-x / 1.2) + np.exp(-x / 5) + 0.5
+    elif name == 'hyperbolicsaturation':
+        y = 3 * x / (x + 2) + 0.1 * x
+    elif name == 'linear':
+        y = 0.5 * x + 1
+    elif name == 'antibunching':
+        y = 1 - 0.8 * np.exp(-np.abs(x - 5) / 0.5)
+    elif name.startswith(('gaussian', 'lorentzian')):
+        centers = {'lorentziandouble': (4, 6), 'lorentziantriple': (3, 5, 7),
+                   'gaussiandouble': (4, 6)}.get(name, (5,))
+        y = lorentzian_dips(x, centers)
+        if estimator == 'peak':
+            y = 2 - y
+    else:
+        y = (2 * np.sin(2 * np.pi * 0.5 * x + 0.3) * np.exp(-x / 5)
+             + 0.5 * np.sin(2 * np.pi * 1.3 * x) + 1)
+    return y + rng.normal(0, 0.02, x.size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=300, help='number of points per fit')
+    parser.add_argument('--number', type=int, default=3, help='fits per repeat')
+    parser.add_argument('--repeat', type=int, default=3, help='number of repeats')
+    parser.add_argument('--fit', nargs='*', default=[fit.name for fit in FitMethods],
+                        help='names of the FitMethods entries')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    x = np.linspace(0, 10, args.points)
+
+    print('{0:>30}  {1:>21}  {2:>21}  {3:>8}'.format(
+        'fit', 'finite differences', 'analytic Jacobian', 'speedup'))
+    for name in args.fit:
+        fit_function = FitMethods[name]
+        if name not in analysis.fit_list['1d']:
+            print('{0:>30}  skipped, only 1d fits are compared'.format(name))
+            continue
+        estimators = [key for key in analysis.fit_list['1d'][name]
+                      if key not in ('make_fit', 'make_model')]
+        estimator = 'generic' if 'generic' in estimators else estimators[0]
+        y = make_data(name, estimator, x, np.random.default_rng(0))
+        timings, results = dict(), dict()
+        for analytic in (False, True):
+            analysis.use_analytic_jacobian = analytic
+
+            def fit():
+                return analysis.perform_fit(x, y, fit_function, estimator=estimator)[2]
+
+            try:
+                results[analytic] = fit()
+            except Exception as error:
+                print('{0:>30}  failed: {1}: {2}'.format(name, type(error).__name__, error))
+                break
+            timings[analytic] = min(
+                timeit.repeat(fit, number=args.number, repeat=args.repeat)) / args.number
+        else:
+            print('{0:>30}  {1:8.2f} ms {2:5d} nfev  {3:8.2f} ms {4:5d} nfev  {5:7.2f}x  '
+                  'redchi {6:.5f} / {7:.5f}'.format(
+                      name, timings[False] * 1e3, results[False].nfev, timings[True] * 1e3,
+                      results[True].nfev, timings[False] / timings[True], results[False].redchi,
+                      results[True].redchi))
+    analysis.use_analytic_jacobian = True
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Cold start time and peak RSS of a short lived process running a single fit type.
+
+Every run is a fresh interpreter that imports AnalysisLogic, does one fit and reports the wall
+clock time, the peak resident set size and the fitmethods modules that got imported.
+
+    poetry run python benchmarks/bench_cold_start.py --fit linear
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+CHILD = r"""
+import json, resource, sys, time
+start = time.perf_counter()
+sys.path.append({root!r})
+import numpy as np
+from market_analytics.analysis_logic import AnalysisLogic, FitMethods
+analysis = AnalysisLogic()
+x = np.linspace(0, 10, 200)
+y = 2 * np.sin(2 * np.pi * 0.5 * x + 0.3) * np.exp(-x / 5) + 0.1 * x + 1
+analysis.perform_fit(x, y, FitMethods[{fit!r}])
+elapsed = time.perf_counter() - start
+modules = sorted(name for name in sys.modules if name.endswith('methods') and '.' not in name)
+print(json.dumps({{'time': elapsed,
+                  'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                  'modules': modules}}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fit', default='linear', help='name of the FitMethods entry')
+    parser.add_argument('--repeat', type=int, default=5, help='number of fresh processes')
+    args = parser.parse_args()
+
+    code = CHILD.format(root=ROOT, fit=args.fit)
+    runs = []
+    for _ in range(args.repeat):
+        out = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True,
+                             text=True).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+
+    print('fit: {0}'.format(args.fit))
+    print('best time: {0:8.1f} ms'.format(min(run['time'] for run in runs) * 1e3))
+    print('peak RSS:  {0:8.1f} MB'.format(min(run['rss'] for run in runs) / 1024))
+    print('imported:  {0}'.format(', '.join(runs[0]['modules'])))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Time of compute_ft across series lengths, compared to the former full complex FFT of a zero-padded
+copy with a freshly built window, and with padding to a fast FFT length.
+
+The former path is kept here as the reference, the spectra of both are compared. The fast length
+variant returns a longer, finer spectrum and is timed only.
+
+    poetry run python benchmarks/bench_compute_ft.py --sizes 1000,100000,10000000 --window hann
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.signal import windows
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic  # noqa: E402
+
+
+def full_fft(x_val, y_val, zeropad_num, window):
+    """ Spectrum as computed before, the whole FFT of a zero-padded copy. """
+    corrected_y = y_val - y_val.mean()
+    ampl_norm_fact = 1.0
+    if window == 'hann':
+        corrected_y = corrected_y * windows.hann(len(y_val))
+        ampl_norm_fact = 1.0/0.5
+    zeropad_arr = np.zeros(len(corrected_y)*(zeropad_num+1))
+    zeropad_arr[:len(corrected_y)] = corrected_y
+    fft_y = np.abs(np.fft.fft(zeropad_arr))
+    fft_y = (2/len(y_val)) * fft_y * ampl_norm_fact
+    middle = int((len(zeropad_arr)+1)//2)
+    fft_x = np.fft.fftfreq(len(zeropad_arr), d=np.round(x_val[-1] - x_val[-2], 12))
+    return abs(fft_x[:middle]), fft_y[:middle]
+
+
+def best_time(function, repeats):
+    """ Shortest wall time of repeated calls and the last result. """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000,1000000',
+                        help='comma-separated numbers of points, e.g. up to 10000000')
+    parser.add_argument('--window', default='none', choices=['none', 'hann'],
+                        help='window applied before the FFT')
+    parser.add_argument('--zeropad', type=int, default=1, help='zeropad_num of compute_ft')
+    parser.add_argument('--repeats', type=int, default=5, help='timed calls per variant')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    # loads sinemethods, compute_ft itself is a module function
+    analysis.make_sine_model()
+    compute_ft = sys.modules['sinemethods'].compute_ft
+    rng = np.random.default_rng(0)
+    for size in [int(size) for size in args.sizes.split(',')]:
+        # prime number of points plus one, the worst case for the FFT length
+        x = np.linspace(0, 100, size + 1)
+        y = np.sin(2*np.pi*0.37*x) + rng.normal(0, 0.5, x.size)
+
+        full_time, (full_x, full_y) = best_time(
+            lambda: full_fft(x, y, args.zeropad, args.window), args.repeats)
+        new_time, (new_x, new_y) = best_time(
+            lambda: compute_ft(x, y, zeropad_num=args.zeropad, window=args.window),
+            args.repeats)
+        fast_time, (fast_x, _) = best_time(
+            lambda: compute_ft(x, y, zeropad_num=args.zeropad, window=args.window,
+                               fast_length=True), args.repeats)
+        difference = np.abs(new_y - full_y).max() / full_y.max()
+        print('{0:>9} points: full fft {1:8.4f} s, compute_ft {2:8.4f} s ({3:4.1f}x), fast '
+              'length {4:8.4f} s ({5} instead of {6} bins), same x {7}, max relative '
+              'difference {8:.1e}'.format(
+                  x.size, full_time, new_time, full_time / new_time, fast_time, fast_x.size,
+                  new_x.size, np.array_equal(new_x, full_x), difference))
+
+
+if __name__ == '__main__':
+    main()
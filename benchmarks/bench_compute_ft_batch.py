@@ -0,0 +1,81 @@
+"""
+Time and peak memory of compute_ft_batch on a panel of series compared to calling compute_ft once
+per series, for a few block sizes.
+
+Every series is a noisy sine of its own frequency. The spectra of both ways and the peak frequency
+per series (the largest spectral value besides the zero frequency) are compared.
+
+    poetry run python benchmarks/bench_compute_ft_batch.py --series 500 --points 1000,10000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic  # noqa: E402
+
+
+def timed(function):
+    """ Wall time, peak traced memory in MB and result of a call. """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--series', type=int, default=500, help='number of series in the panel')
+    parser.add_argument('--points', default='1000,10000',
+                        help='comma-separated numbers of points per series')
+    parser.add_argument('--window', default='hann', help='window applied before the FFT')
+    parser.add_argument('--zeropad', type=int, default=1, help='zeropad_num of the spectra')
+    parser.add_argument('--block-sizes', default='1048576,4194304,33554432',
+                        help='comma-separated max_block_size values of compute_ft_batch')
+    parser.add_argument('--workers', type=int, default=None, help='threads of the FFT')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    # loads sinemethods, compute_ft itself is a module function
+    analysis.make_sine_model()
+    compute_ft = sys.modules['sinemethods'].compute_ft
+    rng = np.random.default_rng(0)
+    for points in [int(points) for points in args.points.split(',')]:
+        x = np.linspace(0, 100, points)
+        frequencies = rng.uniform(0.05, 2, args.series)
+        y = (np.sin(2*np.pi*frequencies[:, None]*x + rng.uniform(-np.pi, np.pi, (args.series, 1)))
+             + rng.normal(0, 0.5, (args.series, points)))
+
+        def loop():
+            spectra = [compute_ft(x, row, zeropad_num=args.zeropad, window=args.window)[1]
+                       for row in y]
+            return np.array(spectra)
+
+        loop_time, loop_memory, loop_spectra = timed(loop)
+        print('{0:>6} series x {1:>7} points: loop {2:8.4f} s, peak {3:8.1f} MB'.format(
+            args.series, points, loop_time, loop_memory))
+        for block_size in [int(size) for size in args.block_sizes.split(',')]:
+            batch_time, batch_memory, (dft_x, spectra, peaks) = timed(
+                lambda: analysis.compute_ft_batch(x, y, zeropad_num=args.zeropad,
+                                                  window=args.window, workers=args.workers,
+                                                  max_block_size=block_size))
+            loop_peaks = dft_x[1 + loop_spectra[:, 1:].argmax(axis=1)]
+            print('{0:>30}: batch {1:8.4f} s ({2:4.1f}x), peak {3:8.1f} MB, max_block_size '
+                  '{4:>9}, same spectra {5}, same peaks {6}, peaks within one bin of the '
+                  'sines {7}/{8}'.format(
+                      '', batch_time, loop_time / batch_time, batch_memory, block_size,
+                      np.array_equal(spectra, loop_spectra), np.array_equal(peaks, loop_peaks),
+                      int((np.abs(peaks - frequencies) <= dft_x[1]).sum()), args.series))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Time of the double dip search across series lengths compared to the original loops, which walk
+the data point by point and restart for every lowered threshold (tests/double_dip_loops.py).
+tests/test_double_dip.py checks that both searches return the same indices.
+
+The timed series hold two noisy Lorentzian dips, once on a flat baseline and once on a ramp which
+stays above the end threshold towards one border, so the original search restarts until its
+minimal threshold there. The loops are only run up to --loop-max points.
+
+    poetry run python benchmarks/bench_double_dip.py --sizes 1000,100000,1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic  # noqa: E402
+from tests.double_dip_loops import loop_search_double_dip, lorentzian  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000,1000000',
+                        help='comma-separated numbers of points per series')
+    parser.add_argument('--loop-max', type=int, default=100000,
+                        help='longest series to run the original loops on')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    # the searches which find no second dip log a warning
+    analysis.log.setLevel('CRITICAL')
+    analysis.log.parent.setLevel('CRITICAL')
+    rng = np.random.default_rng(0)
+    # loads generalmethods before the first timing
+    analysis._search_double_dip(np.arange(3.), -np.arange(3.))
+
+    for size in [int(size) for size in args.sizes.split(',')]:
+        x = np.linspace(0, 1, size)
+        dips = -lorentzian(x, 0.35, 0.01) - 0.6 * lorentzian(x, 0.6, 0.02)
+        noise = rng.normal(0, 0.01, size)
+        for kind, y in (('flat', dips + noise), ('ramp', dips - 0.6 * x + noise)):
+            start = time.perf_counter()
+            indices = analysis._search_double_dip(x, y)
+            search_time = time.perf_counter() - start
+            if size <= args.loop_max:
+                start = time.perf_counter()
+                loop_indices = loop_search_double_dip(y)
+                loop_time = time.perf_counter() - start
+                compared = 'loops {0:8.4f} s ({1:7.1f}x), same indices {2}'.format(
+                    loop_time, loop_time / search_time, tuple(indices) == tuple(loop_indices))
+            else:
+                compared = 'loops skipped'
+            print('{0:>5} {1:>8} points: search {2:8.4f} s, {3}'.format(
+                kind, size, search_time, compared))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Batch fit time with and without a per-fit budget (max_nfev and timeout) on a batch where a share
+of the series is pure noise, and how many fits the budget stopped.
+
+The noise series are the ones that tend to run long, the budget bounds their cost while the clean
+series should be unaffected (same chisqr).
+
+    poetry run python benchmarks/bench_fit_budgets.py --series 40 --max-nfev 100 --timeout 1
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic  # noqa: E402
+
+FITS = ['sinestretchedexponentialdecay', 'sinedoublewithtwoexpdecay',
+        'sinetriplewiththreeexpdecay']
+
+
+def make_batch(x, series, noise_share, rng):
+    """ Damped sines with noise, the first noise_share of the columns only noise. """
+    y = np.empty((x.size, series))
+    noisy = int(round(noise_share * series))
+    for i in range(series):
+        if i < noisy:
+            y[:, i] = rng.normal(0, 1, x.size)
+        else:
+            y[:, i] = (rng.uniform(0.5, 2) * np.sin(2 * np.pi * rng.uniform(0.3, 2) * x
+                                                     + rng.uniform(-np.pi, np.pi))
+                       * np.exp(-x / rng.uniform(3, 10)) + rng.normal(0, 0.05, x.size))
+    return y, noisy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=500, help='number of points per series')
+    parser.add_argument('--series', type=int, default=20, help='number of series per batch')
+    parser.add_argument('--noise-share', type=float, default=0.25,
+                        help='share of series that are pure noise')
+    parser.add_argument('--max-nfev', type=int, default=100,
+                        help='function evaluations per fit of the budgeted run')
+    parser.add_argument('--timeout', type=float, default=None,
+                        help='wall-clock time in seconds per fit of the budgeted run, it includes '
+                             'the estimator')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, args.points)
+    for fit_function in FITS:
+        y, noisy = make_batch(x, args.series, args.noise_share, rng)
+
+        start = time.perf_counter()
+        free = analysis.perform_fits(x, y, fit_function)
+        free_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        budgeted = analysis.perform_fits(x, y, fit_function, max_nfev=args.max_nfev,
+                                         timeout=args.timeout)
+        budgeted_time = time.perf_counter() - start
+
+        clean = slice(noisy, None)
+        stopped = budgeted.timed_out | budgeted.max_nfev_reached
+        same = np.isclose(free.chisqr[clean], budgeted.chisqr[clean], rtol=1e-6)
+        same = same[~stopped[clean]]
+        print('{0:>30}: no budget {1:7.3f} s (max nfev {2:5d}), budget {3:7.3f} s, stopped '
+              '{4} timeout / {5} max_nfev of {6}, clean fits unchanged {7}/{8}'.format(
+                  fit_function, free_time, int(free.nfev.max()), budgeted_time,
+                  int(budgeted.timed_out.sum()), int(budgeted.max_nfev_reached.sum()),
+                  args.series, int(same.sum()), same.size))
+
+
+if __name__ == '__main__':
+    main()
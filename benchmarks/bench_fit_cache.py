@@ -0,0 +1,50 @@
+"""
+perform_fit with an empty and with a filled fit result cache.
+
+    poetry run python benchmarks/bench_fit_cache.py
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic, FitMethods  # noqa: E402
+
+
+FITS = ('linear', 'decayexponential', 'hyperbolicsaturation', 'sinetriple',
+        'sinedoublewithexpdecay')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=500, help='number of data points')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(4)
+    x = np.arange(args.points, dtype=float)
+    y = (np.sin(2 * np.pi * x / 40) * np.exp(-x / 300) + 0.5 * np.sin(2 * np.pi * x / 13)
+         + 0.5 + rng.normal(0, 0.1, x.size))
+
+    with tempfile.TemporaryDirectory() as directory:
+        analysis = AnalysisLogic()
+        cache = analysis.enable_fit_cache(os.path.join(directory, 'fits.sqlite'))
+        for name in FITS:
+            timings = []
+            for _ in range(2):
+                start = time.perf_counter()
+                analysis.perform_fit(x, y, FitMethods[name])
+                timings.append(time.perf_counter() - start)
+            print('{0:>24}: miss {1:8.2f} ms, hit {2:8.2f} ms'.format(
+                name, timings[0] * 1e3, timings[1] * 1e3))
+        print(cache)
+        analysis.disable_fit_cache()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Cost and outcome of fits whose minimizer raises, under both fit failure policies.
+
+A share of the series in the batch has gaps (NaN values), which makes model.fit raise. With the
+"fallback" policy those are fitted once more with the fallback minimizer settings, with "error"
+they get an error result right away. Printed are the batch time, the time per failing series and
+the failure counts of the fit logic.
+
+    poetry run python benchmarks/bench_fit_failures.py --series 40 --gap-share 0.5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic  # noqa: E402
+
+FITS = ['linear', 'decayexponential', 'hyperbolicsaturation']
+
+
+def make_batch(x, series, gap_share, rng):
+    """ Noisy exponential decays, the first gap_share of the columns with a few NaN values. """
+    y = (rng.uniform(1, 3, series) * np.exp(-x[:, None] / rng.uniform(2, 5, series))
+         + rng.normal(0, 0.02, (x.size, series)))
+    gapped = int(round(gap_share * series))
+    for i in range(gapped):
+        y[rng.choice(x.size, size=3, replace=False), i] = np.nan
+    return y, gapped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=500, help='number of points per series')
+    parser.add_argument('--series', type=int, default=20, help='number of series per batch')
+    parser.add_argument('--gap-share', type=float, default=0.5,
+                        help='share of series with NaN values')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    # the fits of series with gaps log a warning each
+    analysis.log.setLevel('CRITICAL')
+    analysis.log.parent.setLevel('CRITICAL')
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, args.points)
+    for fit_function in FITS:
+        y, gapped = make_batch(x, args.series, args.gap_share, rng)
+        clean = analysis.perform_fits(x, y[:, gapped:], fit_function)
+        for policy in ('fallback', 'error'):
+            analysis.fit_failure_policy = policy
+            analysis.fit_failures.clear()
+            start = time.perf_counter()
+            summaries = analysis.perform_fits(x, y, fit_function)
+            elapsed = time.perf_counter() - start
+            same = np.allclose(summaries.chisqr[gapped:], clean.chisqr, rtol=1e-9)
+            print('{0:>22} {1:>8}: {2:7.3f} s, {3:3d} fallback / {4:3d} error of {5} '
+                  'gapped series, fit_failures {6}, clean fits unchanged {7}'.format(
+                      fit_function, policy, elapsed, int(summaries.fallback.sum()),
+                      int(summaries.error.sum()), gapped, dict(analysis.fit_failures), same))
+        analysis.fit_failure_policy = 'fallback'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Micro-benchmark of the AnalysisLogic construction time.
+
+"rebuild" drops the process wide fit registry before every construction, which is what every
+AnalysisLogic() used to do. "cached" is the construction with an already built registry.
+
+    poetry run python benchmarks/bench_fit_logic_construction.py
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic  # noqa: E402
+
+
+def rebuild():
+    AnalysisLogic.reload_fit_methods()
+    return AnalysisLogic()
+
+
+def cached():
+    return AnalysisLogic()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=200, help='constructions per repeat')
+    parser.add_argument('--repeat', type=int, default=5, help='number of repeats')
+    args = parser.parse_args()
+
+    # warm up the imports of the fitmethods modules
+    cached()
+
+    for name, func in (('rebuild', rebuild), ('cached', cached)):
+        timings = timeit.repeat(func, number=args.number, repeat=args.repeat)
+        best = min(timings) / args.number
+        print('{0:>8}: {1:10.1f} us per AnalysisLogic()'.format(name, best * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,309 @@
+"""
+Benchmark suite of AnalysisLogic.perform_fit over every fit in FitLogic.fit_list.
+
+Every fit runs on seeded synthetic data of its own model with known parameters, for each size
+(number of points, a square grid for the 2d fits) and noise level (standard deviation relative
+to the peak-to-peak of the clean data). Recorded per case are the wall time (best and median of
+the repeats), nfev, the peak memory allocated during the fit (tracemalloc, in a separate run) and
+the parameter recovery error: the largest error of a known parameter, relative to its true value
+(absolute for true values of zero, phases wrapped), minimized over the order of the components of
+multi-component fits.
+
+The results are written as JSON. Given a baseline (an earlier output), every case that got slower,
+used more memory or evaluations, recovers its parameters worse or started to fail beyond the
+thresholds is reported, and the script exits with status 1.
+
+    poetry run python benchmarks/bench_fit_suite.py --sizes 100,1000,10000 --output fits.json
+    poetry run python benchmarks/bench_fit_suite.py --baseline fits.json --time-threshold 0.5
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+import lmfit
+import numpy as np
+import scipy
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic  # noqa: E402
+
+C0 = 2.8675e9
+HF_SPLITTING = 2.15e6
+
+# Estimator, x range and true parameters of the synthetic data of every fit. Parameters of the
+# template left out keep their default (e.g. beta of a plain exponential decay) and are not
+# compared.
+CASES = {
+    'antibunching': ('dip', (-100, 100), {'n': 1, 'a': 1, 'b': 0.5, 'tau0': 0, 'tau1': 15,
+                                          'tau2': 40}),
+    'biexponential': ('generic', (0, 10), {'e0_amplitude': 2, 'e0_lifetime': 0.7, 'e0_beta': 1,
+                                           'e1_amplitude': 1, 'e1_lifetime': 5, 'e1_beta': 1,
+                                           'offset': 0.5}),
+    'decayexponential': ('generic', (0, 10), {'amplitude': 2, 'lifetime': 3, 'beta': 1,
+                                              'offset': 0.5}),
+    'decayexponentialstretched': ('generic', (0, 10), {'amplitude': 2, 'lifetime': 3,
+                                                       'beta': 1.5, 'offset': 0.5}),
+    'gaussian': ('peak', (0, 10), {'amplitude': 3, 'center': 5, 'sigma': 0.8, 'offset': 1}),
+    'gaussiandouble': ('peak', (0, 10), {'g0_amplitude': 3, 'g0_center': 3, 'g0_sigma': 0.5,
+                                         'g1_amplitude': 2, 'g1_center': 7, 'g1_sigma': 0.7,
+                                         'offset': 1}),
+    'gaussianlinearoffset': ('peak', (0, 10), {'amplitude': 3, 'center': 5, 'sigma': 0.8,
+                                               'offset': 1, 'slope': 0.1}),
+    'hyperbolicsaturation': ('generic', (0, 10), {'I_sat': 5, 'P_sat': 2, 'slope': 0.1,
+                                                  'offset': 0.5}),
+    'linear': ('generic', (0, 10), {'slope': 2, 'offset': 1}),
+    'lorentzian': ('dip', (0, 10), {'amplitude': -2, 'center': 5, 'sigma': 0.5, 'offset': 3}),
+    'lorentziandouble': ('dip', (0, 10), {'l0_amplitude': -2, 'l0_center': 3, 'l0_sigma': 0.4,
+                                          'l1_amplitude': -1.5, 'l1_center': 7, 'l1_sigma': 0.5,
+                                          'offset': 3}),
+    'lorentziantriple': ('N14', (2.865e9, 2.875e9), {
+        'l0_amplitude': -0.3, 'l0_center': C0, 'l0_sigma': 2e5,
+        'l1_amplitude': -0.3, 'l1_center': C0 + HF_SPLITTING, 'l1_sigma': 2e5,
+        'l2_amplitude': -0.3, 'l2_center': C0 + 2 * HF_SPLITTING, 'l2_sigma': 2e5, 'offset': 1}),
+    'poissonian': ('generic', (0, 30), {'amplitude': 100, 'mu': 10}),
+    'poissoniandouble': ('generic', (0, 60), {'p0_amplitude': 100, 'p0_mu': 12,
+                                              'p1_amplitude': 60, 'p1_mu': 35}),
+    'sine': ('generic', (0, 10), {'amplitude': 2, 'frequency': 0.7, 'phase': 0.3, 'offset': 1}),
+    'sinedouble': ('generic', (0, 10), {'s1_amplitude': 2, 's1_frequency': 0.7, 's1_phase': 0.3,
+                                        's2_amplitude': 1, 's2_frequency': 1.9, 's2_phase': 1.2,
+                                        'offset': 1}),
+    'sinedoublewithexpdecay': ('generic', (0, 10), {
+        's1_amplitude': 2, 's1_frequency': 0.7, 's1_phase': 0.3, 's2_amplitude': 1,
+        's2_frequency': 1.9, 's2_phase': 1.2, 'beta': 1, 'lifetime': 6, 'offset': 1}),
+    'sinedoublewithtwoexpdecay': ('generic', (0, 10), {
+        'e1_amplitude': 2, 'e1_frequency': 0.7, 'e1_phase': 0.3, 'e1_beta': 1, 'e1_lifetime': 6,
+        'e2_amplitude': 1, 'e2_frequency': 1.9, 'e2_phase': 1.2, 'e2_beta': 1, 'e2_lifetime': 3,
+        'offset': 1}),
+    'sineexponentialdecay': ('generic', (0, 10), {'amplitude': 2, 'frequency': 0.7,
+                                                  'phase': 0.3, 'beta': 1, 'lifetime': 4,
+                                                  'offset': 1}),
+    'sinestretchedexponentialdecay': ('generic', (0, 10), {'amplitude': 2, 'frequency': 0.7,
+                                                           'phase': 0.3, 'beta': 1.5,
+                                                           'lifetime': 4, 'offset': 1}),
+    'sinetriple': ('generic', (0, 10), {
+        's1_amplitude': 2, 's1_frequency': 0.7, 's1_phase': 0.3, 's2_amplitude': 1,
+        's2_frequency': 1.9, 's2_phase': 1.2, 's3_amplitude': 0.6, 's3_frequency': 3.1,
+        's3_phase': -0.8, 'offset': 1}),
+    'sinetriplewithexpdecay': ('generic', (0, 10), {
+        's1_amplitude': 2, 's1_frequency': 0.7, 's1_phase': 0.3, 's2_amplitude': 1,
+        's2_frequency': 1.9, 's2_phase': 1.2, 's3_amplitude': 0.6, 's3_frequency': 3.1,
+        's3_phase': -0.8, 'beta': 1, 'lifetime': 6, 'offset': 1}),
+    'sinetriplewiththreeexpdecay': ('generic', (0, 10), {
+        'e1_amplitude': 2, 'e1_frequency': 0.7, 'e1_phase': 0.3, 'e1_beta': 1, 'e1_lifetime': 6,
+        'e2_amplitude': 1, 'e2_frequency': 1.9, 'e2_phase': 1.2, 'e2_beta': 1, 'e2_lifetime': 4,
+        'e3_amplitude': 0.6, 'e3_frequency': 3.1, 'e3_phase': -0.8, 'e3_beta': 1,
+        'e3_lifetime': 3, 'offset': 1}),
+    # count rates, the estimator bounds the amplitude to at least 100
+    'twoDgaussian': ('generic', (0, 10), {'amplitude': 1000, 'center_x': 4, 'center_y': 6,
+                                          'sigma_x': 1.2, 'sigma_y': 0.8, 'theta': 0,
+                                          'offset': 100}),
+}
+
+# The slope of the gaussian with linear offset is a constant as well, only its sum with the
+# offset is determined by the data.
+NOT_COMPARED = {'gaussianlinearoffset': ('offset', 'slope')}
+
+
+def make_data(analysis, fit_function, dims, size, noise, rng):
+    """ Axis (a pair of flattened grid axes for 2d fits) and noisy data of a case. """
+    _, x_range, truth = CASES[fit_function]
+    model, params = analysis.get_model_template(fit_function)
+    for name, value in truth.items():
+        params[name].set(value=value)
+    if dims == '2d':
+        side = max(int(round(np.sqrt(size))), 2)
+        grid = np.linspace(*x_range, side)
+        x_grid, y_grid = np.meshgrid(grid, grid, indexing='ij')
+        x = (x_grid.ravel(), y_grid.ravel())
+    else:
+        x = np.linspace(*x_range, size)
+    clean = model.eval(params=params, x=x)
+    return x, clean + noise * np.ptp(clean) * rng.standard_normal(clean.size)
+
+
+def _error(name, fitted, true):
+    # phases are periodic in 2 pi, the orientation of the 2d gaussian in pi
+    if name.endswith('phase'):
+        return abs(np.angle(np.exp(1j * (fitted - true)))) / np.pi
+    if name == 'theta':
+        return abs(np.angle(np.exp(2j * (fitted - true)))) / np.pi
+    return abs(fitted - true) / (abs(true) if true != 0 else 1)
+
+
+def recovery_error(params, truth):
+    """
+    Largest error of the known parameters, minimized over the order of numbered components like
+    s1_/s2_ or g0_/g1_.
+    """
+    prefixes = sorted({match.group(1) for name in truth
+                       for match in [re.match(r'^([a-z]+\d+)_', name)] if match})
+    best = np.inf
+    for order in itertools.permutations(prefixes):
+        mapping = dict(zip(prefixes, order))
+        worst = 0
+        for name, true in truth.items():
+            match = re.match(r'^([a-z]+\d+)_', name)
+            fitted_name = mapping[match.group(1)] + name[match.end(1):] if match else name
+            worst = max(worst, _error(name, params[fitted_name].value, true))
+        best = min(best, worst)
+    return float(best)
+
+
+def run_case(analysis, fit_function, dims, size, noise, seed, repeats, curve):
+    """ Metrics of one case, or the error it raised. """
+    estimator, _, truth = CASES[fit_function]
+    rng = np.random.default_rng(seed)
+    x, y = make_data(analysis, fit_function, dims, size, noise, rng)
+    case = {'fit': fit_function, 'estimator': estimator, 'dims': dims, 'size': int(y.size),
+            'noise': noise}
+
+    def fit():
+        return analysis.perform_fit(x, y, fit_function, estimator=estimator, dims=dims,
+                                    curve=curve)[2]
+
+    try:
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fit()
+            times.append(time.perf_counter() - start)
+        # traced after the timed runs, which loaded the fit modules, tracing slows the fit down
+        tracemalloc.start()
+        result = fit()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    except Exception as e:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        case['error'] = repr(e)
+        return case
+
+    case.update({'time_s': min(times), 'time_median_s': statistics.median(times),
+                 'nfev': int(result.nfev), 'peak_memory_mb': peak / 2**20,
+                 'recovery_error': recovery_error(
+                    result.params, {name: value for name, value in truth.items()
+                                    if name not in NOT_COMPARED.get(fit_function, ())}),
+                 'success': bool(result.success),
+                 'fit_status': getattr(result, 'fit_status', None), 'error': None})
+    return case
+
+
+def regressions(results, baseline, args):
+    """ Description of every case that regressed compared to the baseline. """
+    previous = {(case['fit'], case['size'], case['noise']): case for case in baseline['results']}
+    found = []
+    for case in results:
+        old = previous.get((case['fit'], case['size'], case['noise']))
+        if old is None or old.get('error'):
+            continue
+        name = '{0} size {1} noise {2}'.format(case['fit'], case['size'], case['noise'])
+        if case.get('error'):
+            found.append('{0}: fails now with {1}'.format(name, case['error']))
+            continue
+        if (case['time_s'] > old['time_s'] * (1 + args.time_threshold)
+                and case['time_s'] - old['time_s'] > args.min_time):
+            found.append('{0}: time {1:.4f} s -> {2:.4f} s'.format(
+                name, old['time_s'], case['time_s']))
+        if (case['peak_memory_mb'] > old['peak_memory_mb'] * (1 + args.memory_threshold)
+                and case['peak_memory_mb'] - old['peak_memory_mb'] > args.min_memory):
+            found.append('{0}: peak memory {1:.2f} MB -> {2:.2f} MB'.format(
+                name, old['peak_memory_mb'], case['peak_memory_mb']))
+        if case['nfev'] > old['nfev'] * (1 + args.nfev_threshold):
+            found.append('{0}: nfev {1} -> {2}'.format(name, old['nfev'], case['nfev']))
+        if case['recovery_error'] > old['recovery_error'] + args.recovery_threshold:
+            found.append('{0}: recovery error {1:.3g} -> {2:.3g}'.format(
+                name, old['recovery_error'], case['recovery_error']))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='100,1000,10000',
+                        help='comma-separated numbers of points, e.g. up to 1000000')
+    parser.add_argument('--noise', default='0.01,0.1',
+                        help='comma-separated noise levels relative to the data range')
+    parser.add_argument('--fits', default=None,
+                        help='comma-separated fits to run, default all of FitLogic.fit_list')
+    parser.add_argument('--repeats', type=int, default=3, help='timed runs per case, at least 1')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic data')
+    parser.add_argument('--curve', action='store_true', help='also evaluate the fit curve')
+    parser.add_argument('--output', default=None, help='JSON file to write the results to')
+    parser.add_argument('--baseline', default=None, help='JSON results to compare against')
+    parser.add_argument('--time-threshold', type=float, default=0.25,
+                        help='allowed relative increase of the best time')
+    parser.add_argument('--min-time', type=float, default=0.002,
+                        help='time increases below this many seconds are ignored')
+    parser.add_argument('--memory-threshold', type=float, default=0.25,
+                        help='allowed relative increase of the peak memory')
+    parser.add_argument('--min-memory', type=float, default=0.1,
+                        help='memory increases below this many MB are ignored')
+    parser.add_argument('--nfev-threshold', type=float, default=0.25,
+                        help='allowed relative increase of nfev')
+    parser.add_argument('--recovery-threshold', type=float, default=0.01,
+                        help='allowed absolute increase of the recovery error')
+    parser.add_argument('--verbose', action='store_true', help='show the log of the fits')
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+    analysis = AnalysisLogic()
+    sizes = [int(size) for size in args.sizes.split(',')]
+    noise_levels = [float(noise) for noise in args.noise.split(',')]
+    fits = [(dims, fit) for dims, dim_fits in analysis.fit_list.items() for fit in dim_fits]
+    if args.fits:
+        fits = [(dims, fit) for dims, fit in fits if fit in args.fits.split(',')]
+
+    results = []
+    for (dims, fit_function), size, noise in itertools.product(fits, sizes, noise_levels):
+        if fit_function not in CASES:
+            print('{0:>30}: no synthetic data defined, skipped'.format(fit_function))
+            continue
+        case = run_case(analysis, fit_function, dims, size, noise, args.seed, args.repeats,
+                        args.curve)
+        results.append(case)
+        if case['error']:
+            print('{0:>30} {1:>8} points, noise {2:5.3f}: {3}'.format(
+                fit_function, case['size'], noise, case['error']))
+        else:
+            print('{0:>30} {1:>8} points, noise {2:5.3f}: {3:9.4f} s, nfev {4:5d}, peak '
+                  '{5:8.2f} MB, recovery error {6:.2e}'.format(
+                      fit_function, case['size'], noise, case['time_s'], case['nfev'],
+                      case['peak_memory_mb'], case['recovery_error']))
+
+    report = {
+        'config': {'sizes': sizes, 'noise': noise_levels, 'repeats': args.repeats,
+                   'seed': args.seed, 'curve': args.curve},
+        'environment': {'python': platform.python_version(), 'numpy': np.__version__,
+                        'scipy': scipy.__version__, 'lmfit': lmfit.__version__,
+                        'platform': platform.platform(), 'cpus': os.cpu_count(),
+                        'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=1)
+        print('Results written to {0}'.format(args.output))
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        found = regressions(results, baseline, args)
+        print('{0} regression(s) compared to {1}'.format(len(found), args.baseline))
+        for line in found:
+            print('  ' + line)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
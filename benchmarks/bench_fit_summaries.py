@@ -0,0 +1,66 @@
+"""
+Memory held by the results of a batch of fits: compact FitSummaries versus keeping every
+ModelResult.
+
+    poetry run python benchmarks/bench_fit_summaries.py --series 100
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic, FitMethods  # noqa: E402
+
+
+def measure(func):
+    """ Run func and return its result, the run time and the memory still held afterwards. """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fit', default='sineexponentialdecay', help='name of the FitMethods entry')
+    parser.add_argument('--series', type=int, default=20, help='number of series to fit')
+    parser.add_argument('--points', type=int, default=200, help='number of points per series')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, args.points)
+    phases = rng.uniform(0, np.pi, args.series)
+    y = (2 * np.sin(2 * np.pi * 0.5 * x[:, None] + phases) * np.exp(-x[:, None] / 5) + 1
+         + rng.normal(0, 0.05, (args.points, args.series)))
+    fit_function = FitMethods[args.fit]
+
+    # warm up the model templates and imports so they are not counted
+    analysis.perform_fits(x, y[:, :1], fit_function)
+
+    for keep_results in (False, True):
+        summaries, elapsed, held = measure(
+            lambda: analysis.perform_fits(x, y, fit_function, keep_results=keep_results))
+        print('keep_results={0!s:5}: {1:7.2f} s, {2:10.1f} kB held ({3:8.2f} kB per fit)'.format(
+            keep_results, elapsed, held / 1024, held / 1024 / args.series))
+        del summaries
+
+    summaries = analysis.perform_fits(x, y[:, :1], fit_function)
+    _, elapsed, _ = measure(lambda: summaries.result(0, x=x, y=y[:, 0]))
+    print('lazy rebuild of one ModelResult: {0:.2f} ms'.format(elapsed * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Evaluation time of the fused multi-sine models versus the composite lmfit models they replace.
+
+The composite models are built like before. That both agree in parameters, values, Jacobians and
+fits is checked in tests/test_fused_sine_models.py.
+
+    poetry run python benchmarks/bench_fused_sine_models.py --points 10000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic  # noqa: E402
+
+
+def composite_model(analysis, name):
+    """ The model as composed from its building blocks before the fused implementation. """
+    no_of_sines = 2 if name.startswith('sinedouble') else 3
+    if name.endswith(('twoexpdecay', 'threeexpdecay')):
+        model = analysis.make_sineexpdecaywithoutoffset_model(prefix='e1_')[0]
+        for index in range(2, no_of_sines + 1):
+            model = model + analysis.make_sineexpdecaywithoutoffset_model(
+                prefix='e{0}_'.format(index))[0]
+    else:
+        model = analysis.make_sinewithoutoffset_model(prefix='s1_')[0]
+        for index in range(2, no_of_sines + 1):
+            model = model + analysis.make_sinewithoutoffset_model(
+                prefix='s{0}_'.format(index))[0]
+        if name.endswith('withexpdecay'):
+            model = model * analysis.make_bareexponentialdecay_model()[0]
+    return model + analysis.make_constant_model()[0]
+
+
+def random_params(params, rng):
+    """ Random values for all parameters, including the otherwise fixed beta. """
+    params = params.copy()
+    for name, param in params.items():
+        if name.endswith('frequency'):
+            param.set(value=rng.uniform(0.1, 2))
+        elif name.endswith('phase'):
+            param.set(value=rng.uniform(-np.pi, np.pi))
+        elif name.endswith('lifetime'):
+            param.set(value=rng.uniform(2, 20))
+        elif name.endswith('beta'):
+            param.set(value=rng.uniform(0.8, 1.5), vary=True)
+        else:
+            param.set(value=rng.uniform(0.5, 2))
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=1000, help='number of x values')
+    parser.add_argument('--number', type=int, default=200, help='evaluations per repeat')
+    parser.add_argument('--repeat', type=int, default=5, help='number of repeats')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 20, args.points)
+
+    for name in ('sinedouble', 'sinetriple', 'sinedoublewithexpdecay', 'sinetriplewithexpdecay',
+                 'sinedoublewithtwoexpdecay', 'sinetriplewiththreeexpdecay'):
+        fused, params = analysis.get_model_template(name)
+        composite = composite_model(analysis, name)
+        params = random_params(params, rng)
+        timings = [min(timeit.repeat(lambda: model.eval(params=params, x=x), number=args.number,
+                                     repeat=args.repeat)) / args.number
+                   for model in (composite, fused)]
+        print('{0:>28}: composite {1:8.1f} us, fused {2:8.1f} us ({3:4.2f}x)'.format(
+            name, timings[0] * 1e6, timings[1] * 1e6, timings[0] / timings[1]))
+
+
+if __name__ == '__main__':
+    main()
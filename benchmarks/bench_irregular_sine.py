@@ -0,0 +1,91 @@
+"""
+Sine fits on irregularly sampled series, directly (the estimators switch to a Lomb-Scargle
+periodogram unless only a few points of an equidistant grid are missing) and after resampling onto
+an equidistant grid by linear interpolation, plus the time of compute_lomb_scargle across series
+lengths.
+
+The series are noisy sines with a random frequency, sampled with scattered missing values (like
+after dropna), with gaps of missing values, or at random times like trades. A fit recovers the
+frequency if it is within 1 % of the true one.
+
+    poetry run python benchmarks/bench_irregular_sine.py --series 20 --sizes 1000,10000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic  # noqa: E402
+
+FITS = ['sine', 'sineexponentialdecay', 'sinestretchedexponentialdecay']
+
+
+def make_series(points, kind, rng):
+    """ Irregular x values of the given kind, noisy sine data and its frequency. """
+    x = np.linspace(0, 30, points)
+    if kind == 'dropna':
+        x = x[rng.random(points) > 0.3]
+    elif kind == 'gaps':
+        keep = np.ones(points, bool)
+        keep[rng.integers(0, points - points // 15, 4)[:, None] + np.arange(points // 15)] = False
+        x = x[keep]
+    else:
+        x = np.sort(rng.uniform(0, 30, points))
+    frequency = rng.uniform(0.1, 1.5)
+    y = (1.5*np.sin(2*np.pi*frequency*x + rng.uniform(-np.pi, np.pi)) * np.exp(-x/40) + 1
+         + rng.normal(0, 0.2, x.size))
+    return x, y, frequency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=600, help='points per series before dropping')
+    parser.add_argument('--series', type=int, default=12, help='series per fit and sampling kind')
+    parser.add_argument('--sizes', default='1000,3000,10000',
+                        help='comma-separated series lengths to time compute_lomb_scargle on')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    # the fits of the resampled series may log warnings
+    analysis.log.setLevel('CRITICAL')
+    analysis.log.parent.setLevel('CRITICAL')
+    rng = np.random.default_rng(0)
+    for fit_function in FITS:
+        for kind in ('dropna', 'gaps', 'trades'):
+            stats = {'direct': [0, 0, 0.0], 'resampled': [0, 0, 0.0]}
+            for _ in range(args.series):
+                x, y, frequency = make_series(args.points, kind, rng)
+                grid = np.linspace(x[0], x[-1], x.size)
+                for name, (fit_x, fit_y) in (('direct', (x, y)),
+                                             ('resampled', (grid, np.interp(grid, x, y)))):
+                    start = time.perf_counter()
+                    _, _, result = analysis.perform_fit(fit_x, fit_y, fit_function, curve=False)
+                    stats[name][2] += time.perf_counter() - start
+                    stats[name][0] += abs(result.params['frequency'].value - frequency) < \
+                        0.01 * frequency
+                    stats[name][1] += result.nfev
+            print('{0:>30} {1:>7}: direct {2:3d}/{3} recovered, {4:6.1f} nfev, {5:.3f} s per '
+                  'fit; resampled {6:3d}/{3} recovered, {7:6.1f} nfev, {8:.3f} s per fit'.format(
+                      fit_function, kind, stats['direct'][0], args.series,
+                      stats['direct'][1] / args.series, stats['direct'][2] / args.series,
+                      stats['resampled'][0], stats['resampled'][1] / args.series,
+                      stats['resampled'][2] / args.series))
+
+    compute_lomb_scargle = sys.modules['sinemethods'].compute_lomb_scargle
+    for size in [int(size) for size in args.sizes.split(',')]:
+        x = np.sort(rng.uniform(0, 30, size))
+        y = np.sin(2*np.pi*0.7*x) + rng.normal(0, 0.2, size)
+        start = time.perf_counter()
+        ls_x, ls_y = compute_lomb_scargle(x, y)
+        print('{0:>30} {1:>7} points: {2:.3f} s for {3} frequencies, peak at {4:.4f}'.format(
+            'compute_lomb_scargle', size, time.perf_counter() - start, ls_x.size,
+            ls_x[ls_y.argmax()]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Fit time of the multi-sine fits in full and in lean mode, and the cost of building the
+result_str_dict of a lean result on first access.
+
+leastsq (the default method) always estimates the covariance from its final Jacobian, so lean
+mode only defers the result_str_dict there, also for the fits the estimators run internally. With
+methods that honor calc_covar, e.g. --method nelder, the covariance itself is skipped and only
+calculated when the result_str_dict is accessed. Full fits with such methods fail if no stderr
+could be estimated and are shown as nan.
+
+    poetry run python benchmarks/bench_lean_fits.py --points 1000 --method leastsq
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic, FitMethods  # noqa: E402
+
+MULTI_SINE_FITS = ('sinedouble', 'sinedoublewithexpdecay', 'sinedoublewithtwoexpdecay',
+                   'sinetriple', 'sinetriplewithexpdecay', 'sinetriplewiththreeexpdecay')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=300, help='number of points per fit')
+    parser.add_argument('--method', default='leastsq', help='lmfit method of the final fit')
+    parser.add_argument('--number', type=int, default=5, help='fits per repeat')
+    parser.add_argument('--repeat', type=int, default=3, help='number of repeats')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, args.points)
+    y = (2 * np.sin(2 * np.pi * 0.5 * x + 0.3) * np.exp(-x / 5)
+         + 0.7 * np.sin(2 * np.pi * 1.3 * x + 1) * np.exp(-x / 3) + 1
+         + rng.normal(0, 0.05, x.size))
+
+    print('{0:>28}  {1:>10}  {2:>10}  {3:>8}  {4:>16}'.format(
+        'fit', 'full', 'lean', 'speedup', 'result_str_dict'))
+    for name in MULTI_SINE_FITS:
+        fitter = analysis.prepare(FitMethods[name])
+        timings = dict()
+        for lean in (False, True):
+            try:
+                timings[lean] = min(timeit.repeat(
+                    lambda: fitter._fit_result(x, y, lean=lean, method=args.method),
+                    number=args.number, repeat=args.repeat)) / args.number
+            except TypeError:
+                # the result_str_dict of a full fit needs the stderr the method did not provide
+                timings[lean] = np.nan
+
+        results = [fitter._fit_result(x, y, lean=True, method=args.method)
+                   for _ in range(args.number)]
+        access = min(timeit.repeat(lambda: [result.result_str_dict for result in results],
+                                   number=1, repeat=1)) / args.number
+        print('{0:>28}  {1:7.2f} ms  {2:7.2f} ms  {3:7.2f}x  {4:10.3f} ms'.format(
+            name, timings[False] * 1e3, timings[True] * 1e3, timings[False] / timings[True],
+            access * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Throughput of linear and exponential decay fits, with the closed-form linear least-squares
+solution and with the iterative leastsq fit of make_linear_fit.
+
+The exponential decay estimator always solves its log-linear fit in closed form, the switch only
+affects the final linear fit.
+
+    poetry run python benchmarks/bench_linear_fits.py --points 100 1000 100000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic, FitMethods  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, nargs='+', default=[100, 1000, 10000],
+                        help='numbers of points per fit')
+    parser.add_argument('--number', type=int, default=20, help='fits per repeat')
+    parser.add_argument('--repeat', type=int, default=3, help='number of repeats')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    rng = np.random.default_rng(0)
+
+    for points in args.points:
+        x = np.linspace(0, 10, points)
+        data = {'linear': 0.5 * x + 1 + rng.normal(0, 0.1, points),
+                'decayexponential': 2 * np.exp(-x / 1.5) + 0.5 + rng.normal(0, 0.02, points)}
+        for name, y in data.items():
+            timings = dict()
+            for closed_form in (False, True):
+                analysis.use_closed_form_linear_fit = closed_form
+                timings[closed_form] = min(timeit.repeat(
+                    lambda: analysis.perform_fit(x, y, FitMethods[name]), number=args.number,
+                    repeat=args.repeat)) / args.number
+            print('{0:>16} {1:7d} points: leastsq {2:8.0f} fits/s, closed form {3:8.0f} fits/s '
+                  '({4:5.2f}x)'.format(name, points, 1 / timings[False], 1 / timings[True],
+                                       timings[False] / timings[True]))
+    analysis.use_closed_form_linear_fit = True
+
+
+if __name__ == '__main__':
+    main()
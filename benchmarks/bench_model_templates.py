@@ -0,0 +1,62 @@
+"""
+Benchmark of AnalysisLogic.perform_fit with and without the cached model templates.
+
+"rebuilt" clears the model template cache before every fit, so every fit builds its lmfit model
+again, "cached" reuses the templates. The fitted values of both runs are compared as well.
+
+    poetry run python benchmarks/bench_model_templates.py
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic, FitMethods  # noqa: E402
+import qudi_fit_logic  # noqa: E402
+
+
+FITS = ('linear', 'decayexponential', 'sine', 'sineexponentialdecay', 'sinedoublewithexpdecay',
+        'sinetriplewiththreeexpdecay')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=200, help='number of data points')
+    parser.add_argument('--number', type=int, default=5, help='fits per repeat')
+    parser.add_argument('--repeat', type=int, default=3, help='number of repeats')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, args.points)
+    y = 2 * np.sin(2 * np.pi * 0.5 * x + 0.3) * np.exp(-x / 5) + 1 + rng.normal(0, 0.05, x.size)
+
+    for name in FITS:
+        fit_function = FitMethods[name]
+
+        def rebuilt():
+            qudi_fit_logic._model_templates.clear()
+            return analysis.perform_fit(x, y, fit_function)
+
+        def cached():
+            return analysis.perform_fit(x, y, fit_function)
+
+        best_values = rebuilt()[2].best_values
+        if best_values != cached()[2].best_values:
+            print('{0}: fitted values differ'.format(name))
+
+        timings = dict()
+        for label, func in (('rebuilt', rebuilt), ('cached', cached)):
+            timings[label] = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+            timings[label] /= args.number
+        print('{0:>28}: rebuilt {1:8.2f} ms, cached {2:8.2f} ms per fit'.format(
+            name, timings['rebuilt'] * 1e3, timings['cached'] * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Chi-square and fit time of AnalysisLogic.perform_multistart_fit compared to a single perform_fit
+from the estimator, for the multi-component fits.
+
+Every fit runs on several noisy data sets with random component parameters, the sines on short
+records of about one to ten periods where the estimator is least reliable. The multi-start fit
+wins a data set if its chi-square is more than 1 % below the one of the single fit.
+
+    poetry run python benchmarks/bench_multistart.py --points 300 --starts 16 --workers 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic  # noqa: E402
+
+HF_SPLITTING = 2.15e6
+
+
+def sinetriple_data(points, duration, rng, decay=False):
+    """ Three sines with random frequencies, amplitudes and phases on an offset. """
+    x = np.linspace(0, duration, points)
+    y = 1 + rng.normal(0, 0.1, points)
+    for _ in range(3):
+        y = y + (rng.uniform(0.3, 1.5) * np.sin(2 * np.pi * rng.uniform(0.3, 3) * x
+                                                 + rng.uniform(-np.pi, np.pi)))
+    if decay:
+        y = (y - 1) * np.exp(-x / rng.uniform(1, 2) / duration) + 1
+    return x, y
+
+
+def lorentziantriple_data(points, duration, rng):
+    """ Three dips split by the N14 hyperfine splitting at a random position of a 10 MHz scan. """
+    x = np.linspace(2.865e9, 2.875e9, points)
+    center = rng.uniform(2.866e9, 2.869e9)
+    width = rng.uniform(1e5, 4e5)
+    y = 1 + rng.normal(0, 0.02, points)
+    for i in range(3):
+        y = y - rng.uniform(0.2, 0.4) / (1 + ((x - center - i * HF_SPLITTING) / width) ** 2)
+    return x, y
+
+
+FITS = {
+    'sinetriple': ('generic', sinetriple_data),
+    'sinetriplewithexpdecay': ('generic', lambda *args: sinetriple_data(*args, decay=True)),
+    'lorentziantriple': ('N14', lorentziantriple_data),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=300, help='number of points per fit')
+    parser.add_argument('--duration', type=float, default=3,
+                        help='length of the x axis of the sine fits')
+    parser.add_argument('--datasets', type=int, default=8, help='data sets per fit')
+    parser.add_argument('--starts', type=int, default=16, help='starting points per fit')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes')
+    parser.add_argument('--budget', type=float, default=None,
+                        help='wall-clock budget in seconds of every multi-start fit')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    rng = np.random.default_rng(0)
+    for fit_function, (estimator, make_data) in FITS.items():
+        single_time = multi_time = 0
+        wins = distinct = 0
+        ratios = []
+        for seed in range(args.datasets):
+            x, y = make_data(args.points, args.duration, rng)
+
+            start = time.perf_counter()
+            _, _, single = analysis.perform_fit(x, y, fit_function, estimator=estimator,
+                                                curve=False)
+            single_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            _, _, multi = analysis.perform_multistart_fit(
+                x, y, fit_function, estimator=estimator, starts=args.starts,
+                workers=args.workers, budget=args.budget, seed=seed, curve=False)
+            multi_time += time.perf_counter() - start
+
+            ratios.append(multi.chisqr / single.chisqr)
+            wins += multi.chisqr < 0.99 * single.chisqr
+            distinct += len(multi.alternatives)
+
+        print('{0:>22}: single {1:7.3f} s, multi-start {2:7.3f} s, better in {3} of {4} data '
+              'sets, median chisqr ratio {5:.4f}, {6:.1f} distinct solutions'.format(
+                  fit_function, single_time / args.datasets, multi_time / args.datasets, wins,
+                  args.datasets, np.median(ratios), distinct / args.datasets))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Throughput of AnalysisLogic.perform_fits in fits per second, serial and with a process pool.
+
+    poetry run python benchmarks/bench_perform_fits.py --series 400 --workers 1 2 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic, FitMethods  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fit', default='sineexponentialdecay', help='name of the FitMethods entry')
+    parser.add_argument('--series', type=int, default=200, help='number of series to fit')
+    parser.add_argument('--points', type=int, default=250, help='number of points per series')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, os.cpu_count()],
+                        help='worker counts to compare, 1 is the serial path')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, args.points)
+    phases = rng.uniform(0, np.pi, args.series)
+    y = (2 * np.sin(2 * np.pi * 0.5 * x[:, None] + phases) * np.exp(-x[:, None] / 5) + 1
+         + rng.normal(0, 0.05, (args.points, args.series)))
+
+    reference = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        results = analysis.perform_fits(x, y, FitMethods[args.fit], workers=workers).to_frame()
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = results
+        elif not results.equals(reference):
+            print('results with {0} workers differ from the first run'.format(workers))
+        print('{0:>3} worker(s): {1:8.2f} s, {2:8.1f} fits/s, {3} of {4} successful'.format(
+            workers, elapsed, args.series / elapsed, int(results['success'].sum()), args.series))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Per-call overhead of AnalysisLogic.perform_fit compared to a fitter from AnalysisLogic.prepare.
+
+Both are timed on the same data, the difference is the setup that prepare only does once. The
+fitted values of both paths are compared as well.
+
+    poetry run python benchmarks/bench_prepared_fit.py
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic, FitMethods  # noqa: E402
+
+
+FITS = ('linear', 'sine', 'sineexponentialdecay')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=50, help='number of data points')
+    parser.add_argument('--number', type=int, default=50, help='fits per repeat')
+    parser.add_argument('--repeat', type=int, default=5, help='number of repeats')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, args.points)
+    y = 2 * np.sin(2 * np.pi * 0.5 * x + 0.3) * np.exp(-x / 5) + 1 + rng.normal(0, 0.05, x.size)
+
+    for name in FITS:
+        fit_function = FitMethods[name]
+        fitter = analysis.prepare(fit_function, estimator="generic")
+
+        def perform_fit():
+            return analysis.perform_fit(x, y, fit_function)
+
+        if perform_fit()[2].best_values != fitter(x, y)[2].best_values:
+            print('{0}: fitted values differ'.format(name))
+
+        timings = dict()
+        for label, func in (('perform_fit', perform_fit), ('prepared', lambda: fitter(x, y))):
+            timings[label] = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+            timings[label] /= args.number
+        print('{0:>22}: perform_fit {1:8.3f} ms, prepared {2:8.3f} ms, overhead saved {3:8.3f} ms'
+              ''.format(name, timings['perform_fit'] * 1e3, timings['prepared'] * 1e3,
+                        (timings['perform_fit'] - timings['prepared']) * 1e3))
+
+
+if __name__ == '__main__':
+    main()
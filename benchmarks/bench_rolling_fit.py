@@ -0,0 +1,64 @@
+"""
+AnalysisLogic.perform_rolling_fit compared to calling perform_fit on every window by hand.
+
+The series is a sine with slowly drifting frequency and a decaying envelope that restarts every
+300 points, so that the lifetime changes from window to window.
+
+    poetry run python benchmarks/bench_rolling_fit.py --window 200 --step 10
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic, FitMethods  # noqa: E402
+
+
+FITS = ('sine', 'sineexponentialdecay', 'sinedouble')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=1200, help='length of the series')
+    parser.add_argument('--window', type=int, default=200, help='points per window')
+    parser.add_argument('--step', type=int, default=10, help='points between windows')
+    parser.add_argument('--workers', type=int, default=1, help='workers of the rolling fit')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    rng = np.random.default_rng(2)
+    x = np.arange(args.points, dtype=float)
+    frequency = 0.02 + 1e-5 * x
+    y = (np.exp(-(x % 300) / 400) * np.sin(2 * np.pi * np.cumsum(frequency)) + 0.5
+         + rng.normal(0, 0.1, args.points))
+    starts = range(0, args.points - args.window + 1, args.step)
+
+    for name in FITS:
+        start = time.perf_counter()
+        rolling = analysis.perform_rolling_fit(x, y, FitMethods[name], window=args.window,
+                                               step=args.step, workers=args.workers).to_frame()
+        rolling_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        chisqr = []
+        for s in starts:
+            try:
+                chisqr.append(analysis.perform_fit(x[s:s + args.window], y[s:s + args.window],
+                                                   FitMethods[name])[2].chisqr)
+            except Exception:
+                chisqr.append(np.nan)
+        manual_time = time.perf_counter() - start
+
+        print('{0:>22}: rolling {1:7.2f} s ({2:5.1%} warm starts, {3:5.0f} mean nfev), '
+              'per window {4:7.2f} s, median chisqr ratio {5:.4f}'.format(
+                  name, rolling_time, rolling['warm_start'].mean(), rolling['nfev'].mean(),
+                  manual_time, np.nanmedian(rolling['chisqr'].to_numpy() / np.array(chisqr))))
+
+
+if __name__ == '__main__':
+    main()
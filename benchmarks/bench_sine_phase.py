@@ -0,0 +1,81 @@
+"""
+Time of the sine estimators and their phase search across series lengths, compared to the
+original loop over all phase steps.
+
+The series hold a few periods of a noisy sine, so the number of phase steps (points per period)
+grows with the length like for long records sampled finely. The loop evaluates one full-length
+sine per phase step and is only run up to --loop-max points; where it runs, the phase steps of
+both searches are compared.
+
+    poetry run python benchmarks/bench_sine_phase.py --sizes 1000,10000,100000,1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic  # noqa: E402
+
+ESTIMATORS = {
+    'baresine': ('estimate_baresine', 'make_baresine_model'),
+    'sinewithoutoffset': ('estimate_sinewithoutoffset', 'make_sinewithoutoffset_model'),
+    'sineexponentialdecay': ('estimate_sineexponentialdecay', 'make_sineexponentialdecay_model'),
+}
+
+
+def loop_phase_step(x, y, frequency, amplitude, iter_steps):
+    """ Phase step of the original search, one sine per step. """
+    sum_res = np.zeros(iter_steps)
+    for iter_s in range(iter_steps):
+        func_val = amplitude * np.sin(2*np.pi*frequency*x + iter_s/iter_steps*2*np.pi)
+        sum_res[iter_s] = np.abs(y - func_val).sum()
+    return int(sum_res.argmax())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help='comma-separated numbers of points per series')
+    parser.add_argument('--periods', type=float, default=3.3, help='periods in every series')
+    parser.add_argument('--loop-max', type=int, default=20000,
+                        help='longest series to run the original loop on')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    rng = np.random.default_rng(0)
+    for size in [int(size) for size in args.sizes.split(',')]:
+        x = np.linspace(0, 1, size)
+        frequency = args.periods
+        y = 1.5 * np.sin(2*np.pi*frequency*x + 0.7) + rng.normal(0, 0.3, size)
+        for name, (estimate, make_model) in ESTIMATORS.items():
+            data = y if name == 'sineexponentialdecay' else y - y.mean()
+            _, params = getattr(analysis, make_model)()
+            start = time.perf_counter()
+            getattr(analysis, estimate)(x, data, params)
+            estimate_time = time.perf_counter() - start
+            print('{0:>22} {1:>8} points: estimator {2:8.4f} s, phase {3:+.4f}'.format(
+                name, size, estimate_time, params['phase'].value))
+
+        iter_steps = int(1/(frequency*np.ediff1d(x).min()))
+        start = time.perf_counter()
+        step = analysis._search_phase_step(x, y - y.mean(), frequency, 1.5, iter_steps)
+        search_time = time.perf_counter() - start
+        if size <= args.loop_max:
+            start = time.perf_counter()
+            loop_step = loop_phase_step(x, y - y.mean(), frequency, 1.5, iter_steps)
+            loop_time = time.perf_counter() - start
+            compared = 'loop {0:8.4f} s, same phase step {1}'.format(loop_time,
+                                                                      step == loop_step)
+        else:
+            compared = 'loop skipped'
+        print('{0:>22} {1:>8} points: {2} phase steps, search {3:8.4f} s, {4}'.format(
+            'phase search', size, iter_steps, search_time, compared))
+
+
+if __name__ == '__main__':
+    main()
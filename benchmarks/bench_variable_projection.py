@@ -0,0 +1,95 @@
+"""
+Fit time, function evaluations and robustness of the sum-of-sines fits with and without the
+variable projection solver.
+
+Every fit runs once from the estimator and several times from perturbed starting values (random
+phases, amplitudes off by up to a factor of two and frequencies off by a few percent), passed as
+add_params. A perturbed fit counts as converged if its reduced chi-square is within 1 % of the
+best one found. nfev counts the model evaluations of the final lmfit fit, with variable projection
+that fit only polishes the separable solution.
+
+    poetry run python benchmarks/bench_variable_projection.py --points 1000 --starts 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from lmfit import Parameters
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic, FitMethods  # noqa: E402
+
+SINE_FITS = [fit.name for fit in FitMethods if fit.name.startswith('sine')]
+
+
+def make_data(x, rng):
+    """ Two decaying sines on an offset with noise. """
+    return (2 * np.sin(2 * np.pi * 0.5 * x + 0.3) * np.exp(-x / 5)
+            + 0.7 * np.sin(2 * np.pi * 1.3 * x + 1) * np.exp(-x / 3) + 1
+            + rng.normal(0, 0.05, x.size))
+
+
+def perturbed_params(params, rng, frequency_error):
+    """ Starting values around the estimated ones, used instead of the estimator. """
+    start = Parameters()
+    for name, param in params.items():
+        value = param.value
+        if name.endswith('phase'):
+            value = rng.uniform(-np.pi, np.pi)
+        elif name.endswith('amplitude'):
+            value *= rng.uniform(0.5, 2)
+        elif name.endswith('frequency'):
+            value *= 1 + rng.uniform(-frequency_error, frequency_error)
+        start.add(name, value=np.clip(value, param.min, param.max), min=param.min,
+                  max=param.max, vary=param.vary)
+    return start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=500, help='number of points per fit')
+    parser.add_argument('--starts', type=int, default=10, help='perturbed starts per fit')
+    parser.add_argument('--frequency-error', type=float, default=0.05,
+                        help='maximum relative frequency error of the perturbed starts')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, args.points)
+    y = make_data(x, rng)
+
+    print('{0:>30}  {1:>27}  {2:>27}'.format('fit', 'leastsq', 'variable projection'))
+    for name in SINE_FITS:
+        fitter = analysis.prepare(FitMethods[name])
+        row = dict()
+        estimated = fitter._fit_result(x, y).init_params
+        starts = [perturbed_params(estimated, np.random.default_rng(i), args.frequency_error)
+                  for i in range(args.starts)]
+        for variable_projection in (False, True):
+            analysis.use_variable_projection = variable_projection
+            begin = time.perf_counter()
+            result = fitter._fit_result(x, y)
+            elapsed = time.perf_counter() - begin
+            redchis = []
+            for start in starts:
+                try:
+                    redchis.append(fitter._make_fit(x_axis=x, data=y, estimator=fitter._estimator,
+                                                    add_params=start).redchi)
+                except Exception:
+                    redchis.append(np.inf)
+            row[variable_projection] = (elapsed, result.nfev, result.redchi, redchis)
+        best = min(min(row[True][3]), min(row[False][3]), row[True][2], row[False][2])
+        print('{0:>30}  {1}  {2}'.format(name, *[
+            '{0:7.1f} ms {1:4d} nfev {2:3d}/{3:<3d}'.format(
+                elapsed * 1e3, nfev, sum(redchi <= 1.01 * best for redchi in redchis),
+                len(redchis))
+            for elapsed, nfev, _, redchis in (row[False], row[True])]))
+    analysis.use_variable_projection = False
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Refit after one appended point: perform_fit with the estimator versus a warm start from the
+previous result.
+
+    poetry run python benchmarks/bench_warm_start.py
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic, FitMethods  # noqa: E402
+
+
+FITS = ('linear', 'sine', 'sineexponentialdecay', 'sinetriple')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=300, help='number of points before the update')
+    parser.add_argument('--number', type=int, default=10, help='fits per repeat')
+    parser.add_argument('--repeat', type=int, default=3, help='number of repeats')
+    args = parser.parse_args()
+
+    analysis = AnalysisLogic()
+    rng = np.random.default_rng(3)
+    x = np.arange(args.points + 1, dtype=float)
+    y = (np.sin(2 * np.pi * x / 40) * np.exp(-x / 500) + 0.5 * np.sin(2 * np.pi * x / 13 + 1)
+         + 0.3 * np.sin(2 * np.pi * x / 90) + rng.normal(0, 0.1, x.size))
+
+    for name in FITS:
+        fit_function = FitMethods[name]
+        previous = analysis.perform_fit(x[:-1], y[:-1], fit_function)[2]
+
+        def cold():
+            return analysis.perform_fit(x, y, fit_function)[2]
+
+        def warm():
+            return analysis.perform_fit(x, y, fit_function, warm_start=previous)[2]
+
+        cold_result, warm_result = cold(), warm()
+        timings = dict()
+        for label, func in (('cold', cold), ('warm', warm)):
+            timings[label] = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+            timings[label] /= args.number
+        print('{0:>22}: estimator {1:7.2f} ms (nfev {2:4d}, redchi {3:.5f}), warm start {4:7.2f} ms '
+              '(nfev {5:4d}, redchi {6:.5f}, used {7})'.format(
+                  name, timings['cold'] * 1e3, cold_result.nfev, cold_result.redchi,
+                  timings['warm'] * 1e3, warm_result.nfev, warm_result.redchi,
+                  warm_result.warm_start))
+
+
+if __name__ == '__main__':
+    main()
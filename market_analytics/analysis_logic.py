@@ -1,17 +1,23 @@
 from __future__ import annotations
 
 import logging
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait
 from enum import Enum
-from typing import Tuple, TYPE_CHECKING
+from typing import Dict, Tuple
 
 import numpy as np
 import pandas as pd
+from lmfit import Parameters
+from lmfit.model import ModelResult
 
+from fit_cache import FitResultCache
+from fit_summary import STATUS_FLAGS, FitSummaries, summarise_result
+from multistart import StartState, start_states, state_params, unique_solutions
 from qudi_fit_logic import FitLogic
 
-if TYPE_CHECKING:
-    from lmfit.model import ModelResult
-
 logging.basicConfig(format='%(name)s :: %(levelname)s :: %(message)s', level=logging.INFO)
 
 
@@ -40,10 +46,473 @@ class FitMethods(Enum):
     antibunching: str = "antibunching"
 
 
+# Settings of the fit logic that change the result of a fit. Worker processes take them over from
+# the fit logic that started them and the fit cache keys on them.
+_FIT_SETTINGS = ("use_analytic_jacobian", "use_closed_form_linear_fit", "use_variable_projection",
+                 "fit_failure_policy", "fallback_fit_kwargs")
+
+
+def _fit_settings(fit_logic: FitLogic) -> dict:
+    return {name: getattr(fit_logic, name) for name in _FIT_SETTINGS}
+
+
+def _warm_start_estimator(start_params: Parameters):
+    """
+    Estimator that skips the estimation and starts the fit from the values, bounds, vary flags and
+    expressions of start_params instead, e.g. the best-fit parameters of the previous window.
+    """
+    def estimate_warm_start(x_axis, data, params, *args, **kwargs):
+        for name, param in params.items():
+            if name not in start_params:
+                continue
+            start = start_params[name]
+            if start.expr is not None:
+                param.set(expr=start.expr)
+            elif param.expr is None:
+                param.set(min=start.min, max=start.max, vary=start.vary)
+                param.set(value=float(np.clip(start.value, start.min, start.max)))
+        return 0, params
+    return estimate_warm_start
+
+
+def _is_diverged(result: ModelResult, reference_redchi: float | None, divergence_factor: float) -> bool:
+    """ Whether a warm-started fit failed, left the finite range or got much worse than before. """
+    if not result.success or not np.isfinite(result.chisqr):
+        return True
+    if not all(np.isfinite(param.value) for param in result.params.values()):
+        return True
+    return reference_redchi is not None and result.redchi > divergence_factor * reference_redchi
+
+
+def _deadline_callback(deadline: float):
+    """ iter_cb of a fit that stops it once time.perf_counter() has passed the deadline. """
+    def stop_at_deadline(params, iteration, residual, *args, **kwargs):
+        return time.perf_counter() > deadline
+    return stop_at_deadline
+
+
+def _fit_status(result: ModelResult, deadline: float | None, max_nfev_is_budget: bool) -> str:
+    """
+    "error" for the error result of a fit that raised, "timeout" if the fit was stopped at its
+    deadline, "max_nfev" if it was stopped by its max_nfev and that is the budget of the fit,
+    otherwise "success" or "failed".
+    """
+    if getattr(result, "fit_error", None) is not None:
+        return "error"
+    if getattr(result, "aborted", False):
+        if deadline is not None and time.perf_counter() > deadline:
+            return "timeout"
+        if max_nfev_is_budget:
+            return "max_nfev"
+    return "success" if result.success else "failed"
+
+
+class PreparedFit:
+    """
+    Reusable fitter for one fit function and estimator, created by AnalysisLogic.prepare.
+
+    The fit description is validated and the fit, model and estimator references are looked up
+    once, so that calling the object only runs the estimator and the fit itself. The fit curve is
+    evaluated on fit_granularity_fact times as many points as the data, unless a grid is given or
+    the curve is not requested.
+    """
+
+    def __init__(
+            self,
+            fit_logic: FitLogic,
+            fit_function: str | FitMethods,
+            estimator: str = "generic",
+            dims: str = "1d",
+            granularity: float = 10):
+        if isinstance(fit_function, FitMethods):
+            fit_function = fit_function.name
+
+        fit = {dims: {'default': {'fit_function': fit_function, 'estimator': estimator}}}
+        user_fit = fit_logic.validate_load_fits(fit)[dims]["default"]
+
+        self.fit_function = fit_function
+        self.estimator = estimator
+        self.dims = dims
+        self.fit_granularity_fact = granularity
+        self.units = [f'independent variable {i + 1}' for i in range(int(dims[0]))]
+        self.units.append('dependent variable')
+        self._fit_logic = fit_logic
+        self._make_fit = user_fit["make_fit"]
+        self._estimator = user_fit["estimator"]
+
+    def __call__(
+            self,
+            x: pd.Series,
+            y: pd.Series,
+            warm_start: ModelResult | Parameters | None = None,
+            divergence_factor: float = 2.0,
+            curve: bool = True,
+            fit_x: np.ndarray | None = None,
+            granularity: float | None = None,
+            lean: bool = False,
+            max_nfev: int | None = None,
+            timeout: float | None = None,
+    ) -> Tuple[np.ndarray | None, np.ndarray | None, ModelResult]:
+        """
+        Run the fit, see AnalysisLogic.perform_fit for the arguments. The returned result has the
+        attributes warm_start, which is True if the fit started from the given warm start, and
+        fit_status.
+        """
+        if isinstance(x, pd.Series) or isinstance(x, pd.Index):
+            x = x.to_numpy()
+        if isinstance(y, pd.Series):
+            y = y.to_numpy()
+        limits = {"max_nfev": max_nfev,
+                  "deadline": None if timeout is None else time.perf_counter() + timeout}
+
+        # warm-started fits bypass the cache, their result depends on the starting point, as do
+        # fits with a budget, and lean results lack what the cache stores
+        cache = self._fit_logic.fit_cache
+        if warm_start is not None or lean or max_nfev is not None or timeout is not None:
+            cache = None
+        result = None
+        if cache is not None:
+            key = cache.key(x, y, self.fit_function, self.estimator, dims=self.dims,
+                            settings=_fit_settings(self._fit_logic),
+                            source_hash=self._fit_logic._fit_registry["source_hash"])
+            model = self._fit_logic.get_model_template(self.fit_function)[0]
+            result = cache.get(key, model, x, y)
+            if result is not None:
+                result.fit_status = _fit_status(result, None, False)
+                result.warm_start = False
+        if result is None and warm_start is not None:
+            result = self._warm_fit_result(x, y, warm_start, divergence_factor, lean=lean,
+                                           **limits)
+        if result is None:
+            result = self._fit_result(x, y, lean=lean, **limits)
+            result.warm_start = False
+            if cache is not None and result.fit_status != "error":
+                cache.put(key, self.fit_function, result)
+
+        if not curve:
+            return None, None, result
+        fit_x, fit_y = self.fit_curve(result, x, fit_x=fit_x, granularity=granularity)
+        return fit_x, fit_y, result
+
+    def fit_curve(
+            self,
+            result: ModelResult,
+            x: pd.Series | np.ndarray,
+            fit_x: pd.Series | np.ndarray | None = None,
+            granularity: float | None = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate the fitted model, e.g. for a fit that was run with curve=False.
+
+        Args:
+            result: result of a fit with this fitter
+            x: x values of the fit, the default grid spans them
+            fit_x: grid to evaluate the model on instead, e.g. np.arange(0, 200) to extrapolate
+            granularity: number of grid points per data point of the default grid, defaults to
+                fit_granularity_fact
+
+        Returns:
+            the grid and the model values on it
+        """
+        if fit_x is None:
+            if granularity is None:
+                granularity = self.fit_granularity_fact
+            x = np.asarray(x)
+            fit_x = np.linspace(start=x[0], stop=x[-1], num=int(len(x) * granularity))
+        else:
+            fit_x = np.asarray(fit_x)
+        return fit_x, result.model.eval(x=fit_x, params=result.params)
+
+    def _fit_result(
+            self,
+            x: np.ndarray,
+            y: np.ndarray,
+            estimator=None,
+            max_nfev: int | None = None,
+            deadline: float | None = None,
+            nfev_cap: int | None = None,
+            **kwargs) -> ModelResult:
+        """
+        Run the fit on numpy arrays without the fit curve, optionally with another estimator.
+
+        The fit is stopped after max_nfev function evaluations or once time.perf_counter() passes
+        deadline, result.fit_status tells if it was (see _fit_status). nfev_cap limits the function
+        evaluations as well, but a fit stopped by it only counts as failed. Additional keyword
+        arguments are passed on to the model fit.
+        """
+        caps = [cap for cap in (max_nfev, nfev_cap) if cap is not None]
+        if caps:
+            kwargs["max_nfev"] = min(caps)
+        if deadline is not None:
+            kwargs["iter_cb"] = _deadline_callback(deadline)
+        # the axes are passed by position, the 2d fits call them xy_axes
+        result = self._make_fit(
+            x,
+            y,
+            estimator=self._estimator if estimator is None else estimator,
+            units=self.units,
+            add_params=None,
+            **kwargs)
+        max_nfev_is_budget = max_nfev is not None and (nfev_cap is None or max_nfev <= nfev_cap)
+        result.fit_status = _fit_status(result, deadline, max_nfev_is_budget)
+        return result
+
+    def _warm_fit_result(
+            self,
+            x: np.ndarray,
+            y: np.ndarray,
+            warm_start: ModelResult | Parameters,
+            divergence_factor: float,
+            **kwargs) -> ModelResult | None:
+        """
+        Run the fit starting from a previous result or its parameters instead of the estimator.
+
+        Returns None if the fit raised, failed, gave non-finite values or, if warm_start is a
+        ModelResult, a reduced chi-square more than divergence_factor times the previous one. A
+        fit stopped by its max_nfev or deadline is returned as it is, it is not retried.
+        """
+        if isinstance(warm_start, ModelResult):
+            start_params, reference_redchi = warm_start.params, warm_start.redchi
+        else:
+            start_params, reference_redchi = warm_start, None
+        try:
+            result = self._fit_result(x, y, _warm_start_estimator(start_params), **kwargs)
+        except Exception as e:
+            logging.getLogger(__name__).debug(f"Warm-started {self.fit_function} fit failed: {e!r}")
+            return None
+        if (result.fit_status not in ("timeout", "max_nfev")
+                and _is_diverged(result, reference_redchi, divergence_factor)):
+            return None
+        result.warm_start = True
+        return result
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}({self.fit_function!r}, estimator={self.estimator!r}, "
+                f"dims={self.dims!r})")
+
+
+def _worker_fitter_for(fit_function: str, estimator: str, settings: dict) -> PreparedFit:
+    """ Fitter of a worker process, on a fit logic with the settings of the parent process. """
+    fit_logic = AnalysisLogic()
+    for name, value in settings.items():
+        setattr(fit_logic, name, value)
+    return fit_logic.prepare(fit_function, estimator=estimator)
+
+
+def _pop_fit_failures(fitter: PreparedFit) -> Counter:
+    """ The fit_failures counted by the fit logic of a worker since the last call, to be added to
+    the ones of the parent process. """
+    failures = fitter._fit_logic.fit_failures
+    fitter._fit_logic.fit_failures = Counter()
+    return failures
+
+
+# State of a perform_fits worker process, set up once by _init_fit_worker
+_worker_fitter = None
+_worker_x = None
+_worker_fit_kwargs = {}
+
+
+def _init_fit_worker(fit_function: str, estimator: str, settings: dict, x: np.ndarray,
+                     fit_kwargs: dict):
+    global _worker_fitter, _worker_x, _worker_fit_kwargs
+    _worker_fitter = _worker_fitter_for(fit_function, estimator, settings)
+    _worker_x = x
+    _worker_fit_kwargs = fit_kwargs
+
+
+def _fit_worker_column(y: np.ndarray) -> Tuple[Dict[str, float], Counter]:
+    row = _fit_column(_worker_fitter, _worker_x, y, **_worker_fit_kwargs)[0]
+    return row, _pop_fit_failures(_worker_fitter)
+
+
+def _fit_column(
+        fitter: PreparedFit,
+        x: np.ndarray,
+        y: np.ndarray,
+        **fit_kwargs) -> Tuple[Dict[str, float], ModelResult | None]:
+    """
+    Fit one series of a batch, fit_kwargs (lean, max_nfev, timeout) are passed on to the fitter.
+    Returns the summary row and the result, a failing fit gives a row with success set to False
+    and no result.
+    """
+    try:
+        _, _, result = fitter(x, y, curve=False, **fit_kwargs)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Fit of {fitter.fit_function} failed: {e!r}")
+        return {"success": False}, None
+    return summarise_result(result), result
+
+
+def _fit_windows(
+        fitter: PreparedFit,
+        x: np.ndarray,
+        y: np.ndarray,
+        starts: np.ndarray,
+        window: int,
+        divergence_factor: float,
+        keep_results: bool = False,
+        lean: bool = False,
+        max_nfev: int | None = None,
+        timeout: float | None = None) -> Tuple[list, list | None]:
+    """
+    Fit consecutive windows of a series and return their summary rows and, if keep_results is
+    set, their results. The first window uses the estimator, every following one
+    starts from the result of the previous window and only falls back to the estimator if that
+    fit diverges. A warm start may use at most twice the function evaluations of the last fit
+    that started from the estimator, running out of them also counts as diverging. max_nfev and
+    timeout are the budget of every window, a window stopped by them is not refitted.
+    """
+    log = logging.getLogger(__name__)
+    rows = []
+    results = [] if keep_results else None
+    previous = None
+    nfev_cap = None
+    for start in starts:
+        x_window = x[start:start + window]
+        y_window = y[start:start + window]
+        limits = {"max_nfev": max_nfev,
+                  "deadline": None if timeout is None else time.perf_counter() + timeout}
+        result = None
+        if previous is not None:
+            result = fitter._warm_fit_result(x_window, y_window, previous, divergence_factor,
+                                             nfev_cap=nfev_cap, lean=lean, **limits)
+        warm_start = result is not None
+        try:
+            if result is None:
+                result = fitter._fit_result(x_window, y_window, lean=lean, **limits)
+                nfev_cap = max(2 * result.nfev, 50)
+        except Exception as e:
+            log.warning(f"Fit of {fitter.fit_function} on window starting at {start} failed: {e!r}")
+            rows.append({"success": False, "warm_start": False})
+            if keep_results:
+                results.append(None)
+            previous = None
+            continue
+
+        row = summarise_result(result)
+        row["warm_start"] = warm_start
+        rows.append(row)
+        if keep_results:
+            results.append(result)
+        previous = result if result.success else None
+    return rows, results
+
+
+# State of a perform_rolling_fit worker process, set up once by _init_rolling_worker
+_rolling_worker_args = None
+
+
+def _init_rolling_worker(
+        fit_function: str,
+        estimator: str,
+        settings: dict,
+        x: np.ndarray,
+        y: np.ndarray,
+        window: int,
+        divergence_factor: float,
+        fit_kwargs: dict):
+    global _rolling_worker_args
+    fitter = _worker_fitter_for(fit_function, estimator, settings)
+    _rolling_worker_args = (fitter, x, y, window, divergence_factor, fit_kwargs)
+
+
+def _rolling_worker_chunk(starts: np.ndarray) -> Tuple[list, Counter]:
+    fitter, x, y, window, divergence_factor, fit_kwargs = _rolling_worker_args
+    rows = _fit_windows(fitter, x, y, starts, window, divergence_factor, **fit_kwargs)[0]
+    return rows, _pop_fit_failures(fitter)
+
+
+# State of a perform_multistart_fit worker process, set up once by _init_multistart_worker
+_multistart_worker_args = None
+
+
+def _init_multistart_worker(
+        fit_function: str,
+        estimator: str,
+        settings: dict,
+        x: np.ndarray,
+        y: np.ndarray,
+        max_nfev: int | None,
+        timeout: float | None):
+    global _multistart_worker_args
+    fitter = _worker_fitter_for(fit_function, estimator, settings)
+    _multistart_worker_args = (fitter, x, y, max_nfev, timeout)
+
+
+def _multistart_worker_fit(state: StartState) -> Tuple[dict, np.ndarray | None, Counter]:
+    fitter, x, y, max_nfev, timeout = _multistart_worker_args
+    row, best_fit = _fit_start(fitter, x, y, state, max_nfev=max_nfev, timeout=timeout)
+    return row, best_fit, _pop_fit_failures(fitter)
+
+
+def _terminate_workers(executor: ProcessPoolExecutor):
+    """
+    Stop the worker processes of executor, together with the fits they are running, and shut it
+    down. Queued work is cancelled.
+    """
+    if hasattr(executor, "terminate_workers"):
+        executor.terminate_workers()
+        return
+    # before Python 3.14 the pool only exposes its processes privately, and shutdown drops them
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join()
+
+
+def _fit_start(
+        fitter: PreparedFit,
+        x: np.ndarray,
+        y: np.ndarray,
+        state: StartState,
+        max_nfev: int | None = None,
+        timeout: float | None = None) -> Tuple[dict, np.ndarray | None]:
+    """
+    Run a lean fit from one starting point of a multi-start fit, with the budget of max_nfev
+    function evaluations and timeout seconds. Returns the summary row and the best fit, a
+    failing fit gives a row with success set to False and no best fit.
+    """
+    deadline = None if timeout is None else time.perf_counter() + timeout
+    try:
+        result = fitter._fit_result(x, y, _warm_start_estimator(state_params(state)), lean=True,
+                                    max_nfev=max_nfev, deadline=deadline)
+    except Exception as e:
+        logging.getLogger(__name__).debug(
+            f"Fit of {fitter.fit_function} from a start failed: {e!r}")
+        return {"success": False}, None
+    return summarise_result(result), result.best_fit
+
+
 class AnalysisLogic(FitLogic):
     def __init__(self):
         super().__init__()
         self.log = logging.getLogger(__name__)
+        self.fit_cache = None
+
+    def enable_fit_cache(self, path: str, max_entries: int = 1000) -> FitResultCache:
+        """
+        Put an on-disk cache in front of perform_fit (and fitters from prepare), so that fitting
+        the exact same data with the same fit and estimator again is answered from the cache.
+        Changing a setting of the fit logic (e.g. use_analytic_jacobian or fit_failure_policy) or
+        the fitmethods sources gives new entries. Warm-started fits are not cached.
+
+        Args:
+            path: sqlite file of the cache, shared between sessions
+            max_entries: number of results kept, the least recently used ones are evicted
+
+        Returns:
+            the cache, its hits and misses attributes count the lookups
+        """
+        self.fit_cache = FitResultCache(path, max_entries=max_entries)
+        return self.fit_cache
+
+    def disable_fit_cache(self):
+        """ Stop using the fit cache, the file is left in place. """
+        if self.fit_cache is not None:
+            self.fit_cache.close()
+        self.fit_cache = None
 
     def perform_fit(
             self,
@@ -51,7 +520,16 @@ class AnalysisLogic(FitLogic):
             y: pd.Series,
             fit_function: str | FitMethods,
             estimator: str = "generic",
-            dims: str = "1d") -> Tuple[np.ndarray, np.ndarray, ModelResult]:
+            dims: str = "1d",
+            warm_start: ModelResult | Parameters | None = None,
+            divergence_factor: float = 2.0,
+            curve: bool = True,
+            fit_x: np.ndarray | None = None,
+            granularity: float = 10,
+            lean: bool = False,
+            max_nfev: int | None = None,
+            timeout: float | None = None,
+    ) -> Tuple[np.ndarray | None, np.ndarray | None, ModelResult]:
         """
         Fits available:
             | Dimension | Fit                           |
@@ -80,30 +558,385 @@ class AnalysisLogic(FitLogic):
         Estimators:
             - generic
             - dip
+
+        Warm start:
+            Passing a previous ModelResult (or its params) as warm_start, e.g. after new data was
+            appended, starts the fit from those values, bounds and vary flags and skips the
+            estimator. The estimator is used as a fallback if the warm-started fit raises,
+            fails, gives non-finite values or, for a ModelResult, a reduced chi-square more than
+            divergence_factor times the previous one. result.warm_start tells which one was used.
+
+        Fit curve:
+            The returned fit_x and fit_y evaluate the fitted model on granularity times as many
+            points as x, spanning x. Pass a grid as fit_x to evaluate it there instead, e.g.
+            np.arange(0, 200) to extrapolate. With curve=False no curve is evaluated and None is
+            returned for both, which saves the evaluation in jobs that never plot.
+
+        Lean fits:
+            With lean=True the human-readable result_str_dict is only made when it is first
+            read, and methods other than leastsq and least_squares skip the uncertainty estimation
+            (calc_covar=False), e.g. to screen many candidate models by their best-fit values and
+            chisqr. The result is a plain ModelResult whose result_str_dict is a mapping that
+            calculates missing uncertainties when it is first read. With leastsq, the default
+            method, the fit itself costs as much as a full one. Lean fits are not cached.
+
+        Budgets:
+            max_nfev limits the function evaluations of the fit and timeout its wall-clock time in
+            seconds, counted from the call and checked at every function evaluation (the estimator
+            itself is not interrupted). A fit that runs out of either stops where it is and its
+            result is returned as it is, with success set to False and result.fit_status set to
+            "max_nfev" or "timeout" (otherwise "success" or "failed"). It is not retried, neither
+            from the estimator after a warm start. Like lean results, the result_str_dict of a
+            stopped fit is made on first access. Fits with a budget are not cached.
+
+        Failures:
+            If the minimizer raises, the fit is not repeated as it is. By default
+            (fit_failure_policy "fallback") it is run once with the fallback_fit_kwargs of the
+            fit logic (least_squares, NaN values omitted) and result.fallback is True. If that
+            raises too, or with the policy "error", an error result at the starting values is
+            returned, with success False, result.fit_status "error" and the exception in
+            result.fit_error. fit_failures counts both cases per fit. Errors of the estimator
+            itself are still raised.
+        """
+
+        return self.prepare(fit_function, estimator=estimator, dims=dims)(
+            x, y, warm_start=warm_start, divergence_factor=divergence_factor, curve=curve,
+            fit_x=fit_x, granularity=granularity, lean=lean, max_nfev=max_nfev, timeout=timeout)
+
+    def prepare(
+            self,
+            fit_function: str | FitMethods,
+            estimator: str = "generic",
+            dims: str = "1d",
+            granularity: float = 10) -> PreparedFit:
         """
+        Validate a fit once and return a fitter that can be called repeatedly with (x, y), e.g.
 
+            fitter = analysis.prepare(FitMethods.sine, estimator="generic")
+            for y in series:
+                fit_x, fit_y, result = fitter(x, y)
+
+        Each call gives the same result as perform_fit with the same arguments. granularity is
+        the default number of fit curve points per data point.
+        """
+        return PreparedFit(self, fit_function, estimator=estimator, dims=dims,
+                           granularity=granularity)
+
+    def perform_multistart_fit(
+            self,
+            x: pd.Series | np.ndarray,
+            y: pd.Series | np.ndarray,
+            fit_function: str | FitMethods,
+            estimator: str = "generic",
+            starts: int = 16,
+            workers: int | None = 1,
+            budget: float | None = None,
+            spread: float = 0.1,
+            seed: int | None = None,
+            curve: bool = True,
+            max_nfev: int | None = None,
+            timeout: float | None = None,
+    ) -> Tuple[np.ndarray | None, np.ndarray | None, ModelResult]:
+        """
+        Fit from many starting points and keep the best solution, for multi-component fits such
+        as sinetriple, sinetriplewithexpdecay or lorentziantriple, whose result depends strongly
+        on the starting point of the estimator.
+
+        The first start is the estimator output. Every other one perturbs it (see
+        multistart.perturb_values), every second one also takes its frequencies or centers from
+        the strongest peaks of the spectrum or the data. The local fits are lean and run in
+        parallel if workers > 1. Solutions with the same fitted curve (within 1e-3 times the
+        standard deviation of y) are merged, e.g. those with permuted components.
+
+        Args:
+            x: x values of the series
+            y: the series
+            fit_function: 1d fit, see perform_fit
+            estimator: estimator of the first start, see perform_fit
+            starts: number of starting points, including the estimator output
+            workers: number of worker processes, 1 fits in this process and None uses one
+                process per CPU, see perform_fits
+            budget: wall-clock time in seconds of the whole fit, counted from the call (the
+                estimator itself is not interrupted). Starts that have not finished by then are
+                dropped, worker processes still fitting are terminated. The final full
+                fit of the best solution gets the time left, at most timeout. If none is left, it
+                stops at its first function evaluation with fit_status "timeout" and keeps the
+                best-fit values of the best start
+            spread: relative width of the random perturbations
+            seed: seed of the random starting points
+            max_nfev: function evaluations of every start and of the final fit, see perform_fit
+            timeout: wall-clock time in seconds of every start and of the final fit
+
+        Returns:
+            fit_x, fit_y and the result of the best solution by chisqr like perform_fit, refitted
+            in full from the best-fit values of its start. result.alternatives holds the distinct
+            solutions as FitSummaries ranked by chisqr (the best one first), labelled by the index
+            of their start.
+        """
         if isinstance(x, pd.Series) or isinstance(x, pd.Index):
             x = x.to_numpy()
         if isinstance(y, pd.Series):
             y = y.to_numpy()
         if isinstance(fit_function, FitMethods):
             fit_function = fit_function.name
+        if starts < 1:
+            raise ValueError(f"starts must be at least 1, got {starts}")
+        if workers is None:
+            workers = os.cpu_count()
 
-        fit = {dims: {'default': {'fit_function': fit_function, 'estimator': estimator}}}
-        user_fit = self.validate_load_fits(fit)
-
-        use_settings = {}
-        for key in user_fit[dims]["default"]["parameters"].keys():
-            use_settings[key] = False
-        user_fit[dims]["default"]["use_settings"] = use_settings
-
-        fc = self.make_fit_container("test", dims)
-        fc.set_fit_functions(user_fit[dims])
-        fc.set_current_fit("default")
-        fc.use_settings = None
-        fit_x, fit_y, result = fc.do_fit(x, y)
+        begin = time.perf_counter()
+        deadline = None if budget is None else begin + budget
+        fitter = self.prepare(fit_function, estimator=estimator)
+        model, params = self.get_model_template(fit_function)
+        _, params = fitter._estimator(x, y, params)
+        states = start_states(params, x, y, starts, np.random.default_rng(seed), spread=spread)
+
+        rows = [None] * len(states)
+        best_fits = [None] * len(states)
+        if workers <= 1 or len(states) <= 1:
+            for i, state in enumerate(states):
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                rows[i], best_fits[i] = _fit_start(fitter, x, y, state, max_nfev=max_nfev,
+                                                   timeout=timeout)
+        else:
+            executor = ProcessPoolExecutor(max_workers=min(workers, len(states)),
+                                           initializer=_init_multistart_worker,
+                                           initargs=(fit_function, estimator,
+                                                     _fit_settings(self), x, y, max_nfev,
+                                                     timeout))
+            not_done = ()
+            try:
+                futures = {executor.submit(_multistart_worker_fit, state): i
+                           for i, state in enumerate(states)}
+                wait_timeout = None if deadline is None else max(deadline - time.perf_counter(), 0)
+                done, not_done = wait(futures, timeout=wait_timeout)
+                for future in done:
+                    rows[futures[future]], best_fits[futures[future]], failures = future.result()
+                    self.fit_failures.update(failures)
+            finally:
+                if not_done:
+                    _terminate_workers(executor)
+                else:
+                    executor.shutdown(wait=deadline is None, cancel_futures=True)
+
+        finished = [i for i, row in enumerate(rows) if row is not None]
+        if len(finished) < len(states):
+            self.log.info(f"Multi-start budget of {budget} s used up after {len(finished)} of "
+                          f"{len(states)} {fit_function} starts")
+        solved = [i for i in finished
+                  if best_fits[i] is not None and np.isfinite(rows[i]["chisqr"])]
+        if not solved:
+            raise RuntimeError(f"None of the {len(finished)} finished starts of the "
+                               f"{fit_function} fit gave a solution")
+        order = sorted(solved, key=lambda i: (not rows[i]["success"], rows[i]["chisqr"]))
+        unique = unique_solutions(order, best_fits, tolerance=1e-3 * np.std(y))
+
+        best = unique[0]
+        best_state = {name: (rows[best][name] if expr is None else value, min_, max_, vary, expr)
+                      for name, (value, min_, max_, vary, expr) in states[best].items()}
+        if deadline is not None:
+            remaining = max(deadline - time.perf_counter(), 0)
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        fit_x, fit_y, result = fitter(x, y, warm_start=state_params(best_state), curve=curve,
+                                      max_nfev=max_nfev, timeout=timeout)
+        result.alternatives = FitSummaries.from_rows(
+            fit_function, pd.Index(unique, name="start"), list(params), [rows[i] for i in unique],
+            flags=STATUS_FLAGS, model=model)
+        self.log.debug(f"{len(finished)} {fit_function} starts in "
+                       f"{time.perf_counter() - begin:.3f} s, {len(solved)} solved, "
+                       f"{len(unique)} distinct solutions")
         return fit_x, fit_y, result
 
+    def perform_fits(
+            self,
+            x: pd.Series | np.ndarray,
+            y: pd.DataFrame | np.ndarray,
+            fit_function: str | FitMethods,
+            estimator: str = "generic",
+            workers: int | None = 1,
+            keep_results: bool = False,
+            lean: bool = False,
+            max_nfev: int | None = None,
+            timeout: float | None = None) -> FitSummaries:
+        """
+        Fit the same model to every column of y, e.g. one column per asset.
+
+        Args:
+            x: x values shared by all columns
+            y: 2D array of shape (len(x), number of series) or DataFrame with one series per column,
+                a 1D array or Series is fitted as a single series
+            fit_function: 1d fit, see perform_fit
+            estimator: estimator of the fit, see perform_fit
+            workers: number of worker processes, 1 fits in this process and None uses one
+                process per CPU. The workers fit with the settings of this fit logic (e.g.
+                fit_failure_policy) and their fit_failures are added to its own
+            keep_results: keep the full ModelResult of every fit, only possible with workers=1
+                since results cannot be sent back from worker processes
+            lean: run lean fits, see perform_fit. The stderr are NaN where the fit method skipped
+                the uncertainty estimation
+            max_nfev: function evaluations of every fit, see perform_fit
+            timeout: wall-clock time in seconds of every fit, see perform_fit
+
+        Returns:
+            FitSummaries with one entry per column of y, labelled by the column names, holding
+            the best-fit values, their stderr (NaN if it could not be estimated), chisqr, redchi,
+            nfev, success and the flags "timed_out", "max_nfev_reached", "fallback" and "error"
+            (see perform_fit). Fits raising an exception have success set to False.
+            to_frame() gives a DataFrame, result(i) the (kept or rebuilt) ModelResult.
+        """
+        if isinstance(x, pd.Series) or isinstance(x, pd.Index):
+            x = x.to_numpy()
+        if isinstance(y, pd.DataFrame):
+            labels = y.columns
+            y = y.to_numpy()
+        elif isinstance(y, pd.Series):
+            labels = pd.Index([y.name])
+            y = y.to_numpy()[:, np.newaxis]
+        else:
+            y = np.asarray(y)
+            if y.ndim == 1:
+                y = y[:, np.newaxis]
+            labels = None
+        if y.ndim != 2:
+            raise ValueError(f"y must be a 2D array with one series per column, got {y.ndim} "
+                             f"dimensions")
+        if y.shape[0] != len(x):
+            raise ValueError(f"y has {y.shape[0]} rows, expected one per x value ({len(x)})")
+        if labels is None:
+            labels = pd.RangeIndex(y.shape[1])
+        if isinstance(fit_function, FitMethods):
+            fit_function = fit_function.name
+        if workers is None:
+            workers = os.cpu_count()
+        if keep_results and workers > 1:
+            raise ValueError("keep_results needs workers=1, results can not be sent back from "
+                             "worker processes")
+
+        # validates the fit before any work is sent to other processes
+        fitter = self.prepare(fit_function, estimator=estimator)
+        model, params = self.get_model_template(fit_function)
+        columns = [y[:, i] for i in range(y.shape[1])]
+        fit_kwargs = {"lean": lean, "max_nfev": max_nfev, "timeout": timeout}
+
+        start = time.perf_counter()
+        results = None
+        if workers <= 1 or len(columns) <= 1:
+            rows = []
+            results = [] if keep_results else None
+            for column in columns:
+                row, result = _fit_column(fitter, x, column, **fit_kwargs)
+                rows.append(row)
+                if keep_results:
+                    results.append(result)
+        else:
+            workers = min(workers, len(columns))
+            chunksize = max(1, len(columns) // (4 * workers))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_fit_worker,
+                                     initargs=(fit_function, estimator, _fit_settings(self), x,
+                                               fit_kwargs)) as executor:
+                rows = []
+                for row, failures in executor.map(_fit_worker_column, columns,
+                                                  chunksize=chunksize):
+                    rows.append(row)
+                    self.fit_failures.update(failures)
+        elapsed = time.perf_counter() - start
+        self.log.debug(f"{len(rows)} {fit_function} fits with {workers} worker(s) in "
+                       f"{elapsed:.3f} s ({len(rows) / elapsed:.1f} fits/s)")
+
+        return FitSummaries.from_rows(fit_function, labels, list(params), rows,
+                                      flags=STATUS_FLAGS, model=model, results=results)
+
+    def perform_rolling_fit(
+            self,
+            x: pd.Series | np.ndarray,
+            y: pd.Series | np.ndarray,
+            fit_function: str | FitMethods,
+            window: int,
+            step: int = 1,
+            estimator: str = "generic",
+            workers: int | None = 1,
+            divergence_factor: float = 2.0,
+            keep_results: bool = False,
+            lean: bool = False,
+            max_nfev: int | None = None,
+            timeout: float | None = None) -> FitSummaries:
+        """
+        Fit a model over sliding windows of a series to follow how its parameters drift.
+
+        Only the first window of every chunk runs the estimator. The following windows start from
+        the best-fit parameters of the previous window and fall back to the estimator if that fit
+        fails, gives non-finite values or a reduced chi-square more than divergence_factor times
+        the one of the previous window.
+
+        Args:
+            x: x values of the series
+            y: the series, its index is used to label the windows if it is a pd.Series
+            fit_function: 1d fit, see perform_fit
+            window: number of points in each window
+            step: number of points between the starts of two windows
+            estimator: estimator for the first window and the fallback, see perform_fit
+            workers: number of worker processes, the windows are split into one contiguous chunk
+                per worker. 1 fits in this process and None uses one process per CPU, see
+                perform_fits
+            divergence_factor: allowed increase of the reduced chi-square between two windows
+            keep_results: keep the full ModelResult of every window, only possible with workers=1
+            lean: run lean fits, see perform_fit
+            max_nfev: function evaluations of every window, see perform_fit
+            timeout: wall-clock time in seconds of every window, shared by its warm start and the
+                fallback to the estimator. A window stopped by its budget is not refitted
+
+        Returns:
+            FitSummaries labelled by the last x value (or y index label) of every window with the
+            fields of perform_fits and "warm_start", which is True if the fit started from the
+            previous window. to_frame() gives the time-indexed parameter frame.
+        """
+        labels = None
+        if isinstance(y, pd.Series):
+            labels = y.index
+            y = y.to_numpy()
+        if isinstance(x, pd.Series) or isinstance(x, pd.Index):
+            x = x.to_numpy()
+        if labels is None:
+            labels = pd.Index(x)
+        if isinstance(fit_function, FitMethods):
+            fit_function = fit_function.name
+        if window > len(y) or window < 2 or step < 1:
+            raise ValueError(f"Invalid window {window} and step {step} for {len(y)} points")
+        if workers is None:
+            workers = os.cpu_count()
+        if keep_results and workers > 1:
+            raise ValueError("keep_results needs workers=1, results can not be sent back from "
+                             "worker processes")
+
+        fitter = self.prepare(fit_function, estimator=estimator)
+        model, params = self.get_model_template(fit_function)
+        starts = np.arange(0, len(y) - window + 1, step)
+        fit_kwargs = {"lean": lean, "max_nfev": max_nfev, "timeout": timeout}
+
+        begin = time.perf_counter()
+        results = None
+        if workers <= 1 or len(starts) <= 1:
+            rows, results = _fit_windows(fitter, x, y, starts, window, divergence_factor,
+                                         keep_results=keep_results, **fit_kwargs)
+        else:
+            chunks = np.array_split(starts, min(workers, len(starts)))
+            with ProcessPoolExecutor(max_workers=len(chunks), initializer=_init_rolling_worker,
+                                     initargs=(fit_function, estimator, _fit_settings(self), x,
+                                               y, window, divergence_factor,
+                                               fit_kwargs)) as executor:
+                rows = []
+                for chunk_rows, failures in executor.map(_rolling_worker_chunk, chunks):
+                    rows.extend(chunk_rows)
+                    self.fit_failures.update(failures)
+        elapsed = time.perf_counter() - begin
+        self.log.debug(f"{len(rows)} rolling {fit_function} fits with {workers} worker(s) in "
+                       f"{elapsed:.3f} s ({len(rows) / elapsed:.1f} fits/s)")
+
+        return FitSummaries.from_rows(fit_function, labels[starts + window - 1], list(params), rows,
+                                      flags=("warm_start",) + STATUS_FLAGS, model=model,
+                                      results=results)
+
     def get_all_fits(self) -> Tuple[list, list]:
         one_d_fits = list(self.fit_list['1d'].keys())
         two_d_fits = list(self.fit_list['2d'].keys())
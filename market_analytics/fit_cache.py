@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+from lmfit import Parameters
+from lmfit.model import ModelResult
+
+logging.basicConfig(format='%(name)s :: %(levelname)s :: %(message)s', level=logging.INFO)
+
+# Fit statistics stored next to the parameters, copied back onto the rebuilt ModelResult
+_STATS = ("chisqr", "redchi", "aic", "bic", "rsquared", "nfev", "ndata", "nvarys", "nfree",
+          "success", "errorbars", "message", "method", "var_names", "init_values", "fallback")
+
+
+def _dump_params(params: Parameters) -> str:
+    """
+    Serialize parameters to json. Parameters.dumps also pickles the expression interpreter,
+    which is much slower than the fit of a small model.
+    """
+    return json.dumps([(p.name, p.value, p.vary, p.min, p.max, p.expr, p.brute_step, p.stderr,
+                        p.correl) for p in params.values()], default=_to_builtin)
+
+
+def _load_params(dumped: str) -> Parameters:
+    params = Parameters()
+    state = json.loads(dumped)
+    params.add_many(*[(name, value, vary, min_, max_, expr, brute_step)
+                      for name, value, vary, min_, max_, expr, brute_step, _, _ in state])
+    for name, *_, stderr, correl in state:
+        params[name].stderr = stderr
+        params[name].correl = correl
+    return params
+
+
+def _update_digest(digest, value):
+    """ Feed a fit setting or keyword argument into a hash, arrays by their contents. """
+    if isinstance(value, dict):
+        for name in sorted(value, key=str):
+            digest.update(f"{name}=".encode())
+            _update_digest(digest, value[name])
+            digest.update(b"\0")
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}(".encode())
+        for item in value:
+            _update_digest(digest, item)
+            digest.update(b",")
+        digest.update(b")")
+    elif isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.data)
+    else:
+        digest.update(repr(value).encode())
+
+
+def _to_builtin(value):
+    """ json default for numpy scalars and arrays """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def rebuild_model_result(
+        model,
+        params: Parameters,
+        stats: dict,
+        covar: Optional[np.ndarray] = None,
+        x: Optional[np.ndarray] = None,
+        y: Optional[np.ndarray] = None) -> ModelResult:
+    """
+    Build a ModelResult from stored best-fit parameters and fit statistics without fitting again.
+
+    Args:
+        model: the model of the fit, e.g. from FitLogic.get_model_template
+        params: best-fit parameters, including stderr
+        stats: attributes copied onto the result, e.g. chisqr, redchi, nfev and success
+        covar: covariance matrix, needed for eval_uncertainty
+        x: x values of the fit, used for best_fit and as default for eval
+        y: data of the fit, used for the residual
+
+    Returns:
+        result that can be evaluated and inspected like the original one
+    """
+    result = ModelResult(model, params, data=y, fcn_kws=None if x is None else {"x": x})
+    result.params = params
+    result.init_params = params
+    result.userkws = {} if x is None else {"x": x}
+    for name, value in stats.items():
+        setattr(result, name, value)
+    result.covar = covar
+    if covar is not None:
+        params.create_uvars(covar=covar)
+    result.best_values = model._make_all_args(params)
+    if x is not None:
+        result.best_fit = model.eval(params=params, x=x)
+        if y is not None:
+            result.residual = result.best_fit - y
+    return result
+
+
+class FitResultCache:
+    """
+    Opt-in on-disk cache of fit results, see AnalysisLogic.enable_fit_cache.
+
+    Entries are keyed by a hash of the x and y contents, the fit name, dimension and estimator, the
+    serialized add_params, the further keyword arguments of the fit, the settings of the fit logic
+    (e.g. use_analytic_jacobian) and the hash of the fitmethods sources, so that a changed fit
+    method or setting never returns an old result. They store the best-fit parameters (with
+    stderr and correlations), the covariance matrix, the fit statistics and the result_str_dict. A
+    hit rebuilds a ModelResult that can be evaluated and inspected like the original one. The
+    cache holds at most max_entries results, the least recently used ones are evicted first.
+    """
+
+    def __init__(self, path: str, max_entries: int = 1000):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.log = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        # a lost entry only costs a refit, so do not wait for the disk on every stored result
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS fits ("
+                "key TEXT PRIMARY KEY, fit_name TEXT, params TEXT, covar TEXT, stats TEXT, "
+                "result_str_dict TEXT, last_used REAL)")
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS fits_last_used ON fits (last_used)")
+
+    @staticmethod
+    def key(
+            x: np.ndarray,
+            y: np.ndarray,
+            fit_name: str,
+            estimator: str,
+            add_params: Optional[Parameters] = None,
+            dims: str = "1d",
+            fit_kwargs: Optional[dict] = None,
+            settings: Optional[dict] = None,
+            source_hash: str = "") -> str:
+        """
+        Fingerprint of a fit, a hash of the data contents and the fit description.
+
+        Args:
+            x: x values of the fit
+            y: data of the fit
+            fit_name: name of the fit, e.g. "sine"
+            estimator: name of the estimator
+            add_params: parameters passed to the fit on top of the estimated ones
+            dims: dimension of the fit
+            fit_kwargs: further keyword arguments of the fit, e.g. weights, max_nfev or method
+            settings: settings of the fit logic that change the result, e.g. fit_failure_policy
+            source_hash: hash of the fitmethods sources the fit comes from
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        for array in (x, y):
+            _update_digest(digest, array)
+        for text in (fit_name, dims, estimator, source_hash):
+            digest.update(text.encode())
+            digest.update(b"\0")
+        if add_params is not None:
+            digest.update(_dump_params(add_params).encode())
+        digest.update(b"\0")
+        _update_digest(digest, fit_kwargs or {})
+        digest.update(b"\0")
+        _update_digest(digest, settings or {})
+        return digest.hexdigest()
+
+    def get(self, key: str, model, x: np.ndarray, y: np.ndarray) -> Optional[ModelResult]:
+        """
+        Look up a fit result and rebuild it for the given model and data.
+
+        Returns None (and counts a miss) if the key is not cached.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT params, covar, stats, result_str_dict FROM fits WHERE key = ?",
+                (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE fits SET last_used = ? WHERE key = ?", (time.time(), key))
+
+        params_json, covar_json, stats_json, str_dict_json = row
+        params = _load_params(params_json)
+        covar = json.loads(covar_json)
+        stats = json.loads(stats_json)
+        # entries stored before fallback was kept come from fits that did not fall back
+        stats.setdefault("fallback", False)
+        result = rebuild_model_result(model, params, stats,
+                                      covar=None if covar is None else np.array(covar), x=x, y=y)
+        if str_dict_json is not None:
+            result.result_str_dict = json.loads(str_dict_json)
+        result.from_cache = True
+        return result
+
+    def put(self, key: str, fit_name: str, result: ModelResult):
+        """ Store a fit result and evict the least recently used ones beyond max_entries. """
+        stats = {name: getattr(result, name, None) for name in _STATS}
+        covar = getattr(result, "covar", None)
+        str_dict = getattr(result, "result_str_dict", None)
+        entry = (key, fit_name, _dump_params(result.params),
+                 json.dumps(covar, default=_to_builtin),
+                 json.dumps(stats, default=_to_builtin),
+                 None if str_dict is None else json.dumps(str_dict, default=_to_builtin),
+                 time.time())
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO fits VALUES (?, ?, ?, ?, ?, ?, ?)", entry)
+            self._connection.execute(
+                "DELETE FROM fits WHERE key IN (SELECT key FROM fits ORDER BY last_used DESC "
+                "LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM fits").fetchone()[0]
+
+    def clear(self):
+        """ Remove all entries and reset the hit and miss counters. """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM fits")
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self._connection.close()
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}({self.path!r}, max_entries={self.max_entries}, "
+                f"hits={self.hits}, misses={self.misses})")
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from lmfit.model import ModelResult
+
+from fit_cache import rebuild_model_result
+
+# Fit statistics kept for every fit besides the parameter values and their stderr
+SUMMARY_STATS = ("chisqr", "redchi", "nfev", "success")
+
+# Flags of fits stopped by their budget, refitted with the fallback of the fit method after
+# raising, or failed with an error result, see AnalysisLogic.perform_fit
+STATUS_FLAGS = ("timed_out", "max_nfev_reached", "fallback", "error")
+
+
+def summarise_result(result: ModelResult) -> dict:
+    """
+    Flatten a fit result into best-fit values, stderr, chisqr, redchi, nfev, success and the
+    status flags.
+    """
+    summary = {}
+    for name, param in result.params.items():
+        summary[name] = param.value
+        summary[f"{name}_stderr"] = np.nan if param.stderr is None else param.stderr
+    for name in SUMMARY_STATS:
+        summary[name] = getattr(result, name)
+    fit_status = getattr(result, "fit_status", None)
+    summary["timed_out"] = fit_status == "timeout"
+    summary["max_nfev_reached"] = fit_status == "max_nfev"
+    summary["fallback"] = bool(getattr(result, "fallback", False))
+    summary["error"] = fit_status == "error"
+    return summary
+
+
+class FitSummary:
+    """ Best-fit values, stderr and fit statistics of a single fit, without data or curves. """
+
+    __slots__ = ("values", "stderr", "chisqr", "redchi", "nfev", "success")
+
+    def __init__(
+            self,
+            values: Dict[str, float],
+            stderr: Dict[str, float],
+            chisqr: float,
+            redchi: float,
+            nfev: int,
+            success: bool):
+        self.values = values
+        self.stderr = stderr
+        self.chisqr = chisqr
+        self.redchi = redchi
+        self.nfev = nfev
+        self.success = success
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={value:.6g}" for name, value in self.values.items())
+        return (f"{type(self).__name__}({values}, redchi={self.redchi:.6g}, nfev={self.nfev}, "
+                f"success={self.success})")
+
+
+class FitSummaries:
+    """
+    Compact results of many fits of one model, e.g. from AnalysisLogic.perform_fits.
+
+    The values and stderr of all parameters and the fit statistics are held in one numpy
+    structured array (fields "<parameter>", "<parameter>_stderr", "chisqr", "redchi", "nfev",
+    "success" and any extra flags), so that tens of thousands of fits only take a few bytes per
+    parameter. Full ModelResults are only kept if requested, otherwise result() rebuilds one from
+    the summary and the model template.
+    """
+
+    __slots__ = ("fit_name", "labels", "param_names", "table", "_model", "_results")
+
+    def __init__(
+            self,
+            fit_name: str,
+            labels: pd.Index,
+            param_names: Sequence[str],
+            table: np.ndarray,
+            model=None,
+            results: Optional[List[Optional[ModelResult]]] = None):
+        self.fit_name = fit_name
+        self.labels = labels
+        self.param_names = tuple(param_names)
+        self.table = table
+        self._model = model
+        self._results = results
+
+    @classmethod
+    def from_rows(
+            cls,
+            fit_name: str,
+            labels: pd.Index,
+            param_names: Sequence[str],
+            rows: Sequence[dict],
+            flags: Sequence[str] = (),
+            model=None,
+            results: Optional[List[Optional[ModelResult]]] = None) -> FitSummaries:
+        """
+        Build the table from one dict per fit as made by summarise_result. Missing entries, e.g.
+        of fits that raised, are NaN for floats, 0 for nfev and False for flags.
+        """
+        dtype = ([(name, "f8") for name in param_names]
+                 + [(f"{name}_stderr", "f8") for name in param_names]
+                 + [("chisqr", "f8"), ("redchi", "f8"), ("nfev", "i8"), ("success", "?")]
+                 + [(flag, "?") for flag in flags])
+        table = np.zeros(len(rows), dtype=dtype)
+        for name, kind in dtype:
+            if kind == "f8":
+                table[name] = np.nan
+        for i, row in enumerate(rows):
+            for name, value in row.items():
+                if name in table.dtype.names:
+                    table[name][i] = np.nan if value is None else value
+        return cls(fit_name, labels, param_names, table, model=model, results=results)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __getitem__(self, i: int) -> FitSummary:
+        row = self.table[i]
+        return FitSummary(
+            values={name: float(row[name]) for name in self.param_names},
+            stderr={name: float(row[f"{name}_stderr"]) for name in self.param_names},
+            chisqr=float(row["chisqr"]),
+            redchi=float(row["redchi"]),
+            nfev=int(row["nfev"]),
+            success=bool(row["success"]))
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        # column access, e.g. summaries.frequency or summaries.success
+        table = object.__getattribute__(self, "table")
+        if name in table.dtype.names:
+            return table[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def to_frame(self) -> pd.DataFrame:
+        """ DataFrame with one row per fit and one column per field of the table. """
+        return pd.DataFrame(self.table, index=self.labels)
+
+    def result(
+            self,
+            i: int,
+            x: Optional[np.ndarray] = None,
+            y: Optional[np.ndarray] = None) -> ModelResult:
+        """
+        Full ModelResult of fit i. Kept results are returned as they are, otherwise one is rebuilt
+        from the summary and the model template. A rebuilt result has no covariance, pass the x
+        (and y) values of the fit to get best_fit (and the residual).
+        """
+        if self._results is not None and self._results[i] is not None:
+            return self._results[i]
+        if self._model is None:
+            raise ValueError(f"No model to rebuild the result of {self.fit_name} fit {i}")
+        row = self.table[i]
+        params = self._model.make_params()
+        for name in self.param_names:
+            params[name].value = float(row[name])
+            stderr = float(row[f"{name}_stderr"])
+            params[name].stderr = None if np.isnan(stderr) else stderr
+        stats = {name: row[name].item() for name in SUMMARY_STATS}
+        return rebuild_model_result(self._model, params, stats, x=x, y=y)
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}({self.fit_name!r}, {len(self)} fits, "
+                f"{int(self.table['success'].sum())} successful)")
@@ -35,22 +35,30 @@ def estimate_antibunching_dip(self, x_axis, data, params):
 
 
 def make_antibunching_fit(self, x_axis, data, estimator, units=None, add_params=None, **kwargs):
-    model, params = self.make_antibunching_model()
+    model, params = self.get_model_template('antibunching')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
 
-    try:
-        result = model.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        result = model.fit(data, x=x_axis, params=params, **kwargs)
-        self.log.warning('The 1D antibunching fit did not work. Error '
-                         'message: {0}\n'.format(result.message))
+    result = self._fit_model(model, data, params, 'antibunching', x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._antibunching_result_str_dict, units)
+
+
+def _antibunching_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_antibunching_fit.
+
+    @param lmfit.model.ModelResult result: result of the antibunching fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
+    if units is None:
+        units = ['arb. unit', 'arb. unit']
 
     # Write the parameters to allow human-readable output to be generated
     result_str_dict = OrderedDict()
-    result.result_str_dict = result_str_dict
-
-    return result
+    return result_str_dict
@@ -22,7 +22,7 @@ top-level directory of this distribution and at <https://github.com/Ulm-IQO/qudi
 
 import numpy as np
 from lmfit.models import Model
-from scipy.ndimage import filters
+from scipy import ndimage
 
 
 ############################################################################
@@ -69,6 +69,21 @@ def make_barestretchedexponentialdecay_model(self, prefix=None):
         """
         return np.exp(-np.power(x / lifetime, beta))
 
+    def barestretchedexponentialdecay_derivatives(x, beta, lifetime):
+        """ Bare stretched exponential decay and its partial derivatives after
+        beta and lifetime.
+
+        @return tuple: (numpy.array value, dict with the partial derivatives by
+                       parameter name)
+        """
+        scaled = x / lifetime
+        stretched = np.power(scaled, beta)
+        value = np.exp(-stretched)
+        # (x/lifetime)**beta * log(x/lifetime) goes to zero for x -> 0
+        log_scaled = np.log(np.where(scaled > 0, scaled, 1.0))
+        return value, {'beta': -value * stretched * log_scaled,
+                       'lifetime': value * stretched * beta / lifetime}
+
     if not isinstance(prefix, str) and prefix is not None:
 
         self.log.error('The passed prefix <{0}> of type {1} is not a string and'
@@ -79,6 +94,7 @@ def make_barestretchedexponentialdecay_model(self, prefix=None):
     else:
         model = Model(barestretchedexponentialdecay_function,
                       independent_vars=['x'], prefix=prefix)
+    model.derivatives = barestretchedexponentialdecay_derivatives
 
     params = model.make_params()
 
@@ -213,19 +229,27 @@ def make_decayexponential_fit(self, x_axis, data, estimator, units=None, add_par
                            initial fitting values, best fitting values, data
                            with best fit with given axis,...
     """
-    exponentialdecay, params = self.make_decayexponential_model()
+    exponentialdecay, params = self.get_model_template('decayexponential')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = exponentialdecay.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        result = exponentialdecay.fit(data, x=x_axis, params=params, **kwargs)
-        self.log.warning('The exponentialdecay with offset fit did not work. '
-                         'Message: {}'.format(str(result.message)))
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    kwargs = self._add_analytic_jacobian(exponentialdecay, params, kwargs)
+    result = self._fit_model(exponentialdecay, data, params, 'decayexponential', x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._decayexponential_result_str_dict, units)
+
+
+def _decayexponential_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_decayexponential_fit.
+
+    @param lmfit.model.ModelResult result: result of the decayexponential fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
 
+    @return dict: values, errors and units by displayed parameter name
+    """
     if units is None:
         units = ['arb. unit', 'arb. unit']
 
@@ -242,10 +266,7 @@ def make_decayexponential_fit(self, x_axis, data, estimator, units=None, add_par
     result_str_dict['Offset'] = {'value': result.params['offset'].value,
                                  'error': result.params['offset'].stderr,
                                  'unit': units[1]}  # offset
-
-    result.result_str_dict = result_str_dict
-
-    return result
+    return result_str_dict
 
 
 def estimate_decayexponential(self, x_axis, data, params):
@@ -283,9 +304,8 @@ def estimate_decayexponential(self, x_axis, data, params):
     # remove all the data that can be smaller than or equals to std.
     # when the data is smaller than std, it is beyond resolution
     # which is not helpful to our fitting.
-    for i in range(0, len(x_axis)):
-        if data_level[i] <= data_level.std():
-            break
+    beyond_resolution = np.flatnonzero(data_level <= data_level.std())
+    i = beyond_resolution[0] if beyond_resolution.size else len(x_axis) - 1
 
     # values and bound of parameter.
     ampl = data[-max(1, int(len(x_axis) / 10)):].std()
@@ -294,15 +314,15 @@ def estimate_decayexponential(self, x_axis, data, params):
     try:
         data_level_log = np.log(data_level[0:i])
 
-        # linear fit, see linearmethods.py
-        linear_result = self.make_linear_fit(x_axis=x_axis[0:i], data=data_level_log, estimator=self.estimate_linear)
-        params['lifetime'].set(value=-1 / linear_result.params['slope'].value, min=min_lifetime)
+        # closed-form linear fit, see linearmethods.py
+        slope, intercept, _ = self._linear_least_squares(x_axis[0:i], data_level_log)
+        params['lifetime'].set(value=-1 / slope, min=min_lifetime)
 
         # amplitude can be positive of negative
         if data[0] < data[-1]:
-            params['amplitude'].set(value=-np.exp(linear_result.params['offset'].value), max=-ampl)
+            params['amplitude'].set(value=-np.exp(intercept), max=-ampl)
         else:
-            params['amplitude'].set(value=np.exp(linear_result.params['offset'].value), min=ampl)
+            params['amplitude'].set(value=np.exp(intercept), min=ampl)
     except:
         self.log.warning('Lifetime too small in estimate_exponentialdecay, beyond resolution!')
 
@@ -334,19 +354,29 @@ def make_decayexponentialstretched_fit(self, x_axis, data, estimator, units=None
                            initial fitting values, best fitting values, data
                            with best fit with given axis,...
     """
-    stret_exp_decay_offset, params = self.make_decayexponentialstretched_model()
+    stret_exp_decay_offset, params = self.get_model_template('decayexponentialstretched')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = stret_exp_decay_offset.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        result = stret_exp_decay_offset.fit(data, x=x_axis, params=params, **kwargs)
-        self.log.warning('The double exponentialdecay with offset fit did not work. '
-                         'Message: {}'.format(str(result.message)))
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    kwargs = self._add_analytic_jacobian(stret_exp_decay_offset, params, kwargs)
+    result = self._fit_model(stret_exp_decay_offset, data, params, 'decayexponentialstretched',
+                             x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._decayexponentialstretched_result_str_dict,
+                                   units)
+
+
+def _decayexponentialstretched_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_decayexponentialstretched_fit.
 
+    @param lmfit.model.ModelResult result: result of the decayexponentialstretched fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
     if units is None:
         units = ['arb. unit', 'arb. unit']
 
@@ -367,10 +397,7 @@ def make_decayexponentialstretched_fit(self, x_axis, data, estimator, units=None
     result_str_dict['Beta'] = {'value': result.params['beta'].value,
                                'error': result.params['beta'].stderr,
                                'unit': ''}  # Beta (exponent of exponential exponent)
-
-    result.result_str_dict = result_str_dict
-
-    return result
+    return result_str_dict
 
 
 def estimate_decayexponentialstretched(self, x_axis, data, params):
@@ -393,7 +420,7 @@ def estimate_decayexponentialstretched(self, x_axis, data, params):
     # Smooth very radically the provided data, so that noise fluctuations will
     # not disturb the parameter estimation.
     std_dev = 10
-    data_smoothed = filters.gaussian_filter1d(data, std_dev)
+    data_smoothed = ndimage.gaussian_filter1d(data, std_dev)
 
     # calculation of offset, take the last 10% from the end of the data
     # and perform the mean from those.
@@ -465,18 +492,29 @@ def make_biexponential_fit(self, x_axis, data, estimator,
     if units is None:
         units = ['arb. unit', 'arb. unit']
 
-    model, params = self.make_biexponential_model()
+    model, params = self.get_model_template('biexponential')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = model.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        result = model.fit(data, x=x_axis, params=params, **kwargs)
-        self.log.warning('The double gaussian dip fit did not work: {0}'.format(
-            result.message))
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    kwargs = self._add_analytic_jacobian(model, params, kwargs)
+    result = self._fit_model(model, data, params, 'biexponential', x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._biexponential_result_str_dict, units)
+
+
+def _biexponential_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_biexponential_fit.
+
+    @param lmfit.model.ModelResult result: result of the biexponential fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
+    if units is None:
+        units = ['arb. unit', 'arb. unit']
 
     # Write the parameters to allow human-readable output to be generated
     result_str_dict = dict()
@@ -508,9 +546,7 @@ def make_biexponential_fit(self, x_axis, data, estimator,
     result_str_dict['offset'] = {'value': result.params['offset'].value,
                                  'error': result.params['offset'].stderr,
                                  'unit': units[1]}  # offset
-
-    result.result_str_dict = result_str_dict
-    return result
+    return result_str_dict
 
 
 def estimate_biexponential(self, x_axis, data, params):
@@ -548,9 +584,8 @@ def estimate_biexponential(self, x_axis, data, params):
     # remove all the data that can be smaller than or equals to std.
     # when the data is smaller than std, it is beyond resolution
     # which is not helpful to our fitting.
-    for i in range(0, len(x_axis)):
-        if data_level[i] <= data_level.std():
-            break
+    beyond_resolution = np.flatnonzero(data_level <= data_level.std())
+    i = beyond_resolution[0] if beyond_resolution.size else len(x_axis) - 1
 
     # values and bound of parameter.
     ampl = data[-max(1, int(len(x_axis) / 10)):].std()
@@ -559,18 +594,18 @@ def estimate_biexponential(self, x_axis, data, params):
     try:
         data_level_log = np.log(data_level[0:i])
 
-        # linear fit, see linearmethods.py
-        linear_result = self.make_linear_fit(x_axis=x_axis[0:i], data=data_level_log, estimator=self.estimate_linear)
-        params['e0_lifetime'].set(value=-1 / linear_result.params['slope'].value, min=min_lifetime)
-        params['e1_lifetime'].set(value=-1 / linear_result.params['slope'].value, min=min_lifetime)
+        # closed-form linear fit, see linearmethods.py
+        slope, intercept, _ = self._linear_least_squares(x_axis[0:i], data_level_log)
+        params['e0_lifetime'].set(value=-1 / slope, min=min_lifetime)
+        params['e1_lifetime'].set(value=-1 / slope, min=min_lifetime)
 
         # amplitude can be positive of negative
         if data[0] < data[-1]:
-            params['e0_amplitude'].set(value=-np.exp(linear_result.params['offset'].value), max=-ampl)
-            params['e1_amplitude'].set(value=-np.exp(linear_result.params['offset'].value), max=-ampl)
+            params['e0_amplitude'].set(value=-np.exp(intercept), max=-ampl)
+            params['e1_amplitude'].set(value=-np.exp(intercept), max=-ampl)
         else:
-            params['e0_amplitude'].set(value=np.exp(linear_result.params['offset'].value), min=ampl)
-            params['e1_amplitude'].set(value=np.exp(linear_result.params['offset'].value), min=ampl)
+            params['e0_amplitude'].set(value=np.exp(intercept), min=ampl)
+            params['e1_amplitude'].set(value=np.exp(intercept), min=ampl)
     except:
         self.log.warning('Lifetime too small in estimate_exponential, beyond resolution!')
 
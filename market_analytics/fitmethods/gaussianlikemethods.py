@@ -28,7 +28,7 @@ from lmfit import Parameters
 from collections import OrderedDict
 
 from scipy.interpolate import InterpolatedUnivariateSpline
-from scipy.ndimage import filters
+from scipy import ndimage
 
 ############################################################################
 #                                                                          #
@@ -75,6 +75,18 @@ def make_gaussianwithoutoffset_model(self, prefix=None):
         """
         return np.exp(- np.power((center - x), 2) / (2 * np.power(sigma, 2)))
 
+    def physical_gauss_derivatives(x, center, sigma):
+        """ Gaussian with unit height and its partial derivatives after center and
+        sigma.
+
+        @return tuple: (numpy.array value, dict with the partial derivatives by
+                       parameter name)
+        """
+        distance = center - x
+        value = np.exp(- np.power(distance, 2) / (2 * np.power(sigma, 2)))
+        return value, {'center': -value * distance / np.power(sigma, 2),
+                       'sigma': value * np.power(distance, 2) / np.power(sigma, 3)}
+
     amplitude_model, params = self.make_amplitude_model(prefix=prefix)
 
     if not isinstance(prefix, str) and prefix is not None:
@@ -85,6 +97,7 @@ def make_gaussianwithoutoffset_model(self, prefix=None):
     else:
         gaussian_model = Model(physical_gauss, independent_vars=['x'],
                                prefix=prefix)
+    gaussian_model.derivatives = physical_gauss_derivatives
 
     full_gaussian_model = amplitude_model * gaussian_model
 
@@ -318,18 +331,27 @@ def make_gaussian_fit(self, x_axis, data, estimator, units=None, add_params=None
                           with best fit with given axis,...
     """
 
-    mod_final, params = self.make_gaussian_model()
+    mod_final, params = self.get_model_template('gaussian')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = mod_final.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        self.log.warning('The 1D gaussian peak fit did not work. Error '
-                       'message: {0}\n'.format(result.message))
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    kwargs = self._add_analytic_jacobian(mod_final, params, kwargs)
+    result = self._fit_model(mod_final, data, params, 'gaussian', x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._gaussian_result_str_dict, units)
+
+
+def _gaussian_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_gaussian_fit.
+
+    @param lmfit.model.ModelResult result: result of the gaussian fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
 
+    @return dict: values, errors and units by displayed parameter name
+    """
     if units is None:
             units = ['arb. unit', 'arb. unit']
 
@@ -354,9 +376,7 @@ def make_gaussian_fit(self, x_axis, data, estimator, units=None, add_params=None
     result_str_dict['Contrast'] = {'value': result.params['contrast'].value,
                                         'error': result.params['contrast'].stderr,
                                         'unit': '%'}                                    #Contrast
-    result.result_str_dict = result_str_dict
-
-    return result
+    return result_str_dict
 
 
 
@@ -387,7 +407,7 @@ def estimate_gaussian_peak(self, x_axis, data, params):
     # Smooth the provided data, so that noise fluctuations will not disturb the
     # parameter estimation. This value performs the best in many scenarios:
     std_dev = 2
-    data_smoothed = filters.gaussian_filter1d(data, std_dev)
+    data_smoothed = ndimage.gaussian_filter1d(data, std_dev)
 
     # Define constraints:
     # maximal and minimal the length of the given array to the right and to the
@@ -489,17 +509,27 @@ def make_gaussianlinearoffset_fit(self, x_axis, data, estimator, units=None, add
                           with best fit with given axis,...
     """
 
-    mod_final, params = self.make_gaussianlinearoffset_model()
+    mod_final, params = self.get_model_template('gaussianlinearoffset')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = mod_final.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        self.log.warning('The 1D gaussian peak fit did not work. Error '
-                       'message: {0}\n'.format(result.message))
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    kwargs = self._add_analytic_jacobian(mod_final, params, kwargs)
+    result = self._fit_model(mod_final, data, params, 'gaussianlinearoffset', x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._gaussianlinearoffset_result_str_dict, units)
+
+
+def _gaussianlinearoffset_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_gaussianlinearoffset_fit.
+
+    @param lmfit.model.ModelResult result: result of the gaussianlinearoffset fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
     if units is None:
             units = ['arb. unit', 'arb. unit']
 
@@ -528,10 +558,7 @@ def make_gaussianlinearoffset_fit(self, x_axis, data, estimator, units=None, add
     #result_str_dict['Slope'] = {'value': result.params['slope'].value,
     #                                    'error': result.params['slope'].stderr,
     #                                    'unit': ''}                                    #Slope
-
-    result.result_str_dict = result_str_dict
-
-    return result
+    return result_str_dict
 
 def estimate_gaussianlinearoffset_peak(self, x_axis, data, params):
     """ Provides a gauss peak estimator with a linear changing offset.
@@ -555,7 +582,8 @@ def estimate_gaussianlinearoffset_peak(self, x_axis, data, params):
         x_axis=x_axis,
         data=data,
         units=None,
-        estimator=self.estimate_gaussian_peak
+        estimator=self.estimate_gaussian_peak,
+        lean=True
     )
 
     # subtract the result and perform again a linear fit:
@@ -564,7 +592,8 @@ def estimate_gaussianlinearoffset_peak(self, x_axis, data, params):
     res_linear = self.make_linear_fit(
         x_axis=x_axis,
         data=data_subtracted,
-        estimator=self.estimate_linear
+        estimator=self.estimate_linear,
+        lean=True
     )
 
     # this way works much better than performing at first a linear fit,
@@ -613,7 +642,7 @@ def make_gaussiandouble_fit(self, x_axis, data, estimator,
     if units is None:
         units = ['arb. unit', 'arb. unit']
 
-    model, params = self.make_multiplegaussianoffset_model(no_of_functions=2)
+    model, params = self.get_model_template('multiplegaussianoffset', no_of_functions=2)
 
     error, params = estimator(x_axis, data, params,
                               threshold_fraction,
@@ -623,12 +652,23 @@ def make_gaussiandouble_fit(self, x_axis, data, estimator,
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = model.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        result = model.fit(data, x=x_axis, params=params, **kwargs)
-        self.log.warning('The double gaussian dip fit did not work: {0}'.format(
-            result.message))
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    kwargs = self._add_analytic_jacobian(model, params, kwargs)
+    result = self._fit_model(model, data, params, 'gaussiandouble', x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._gaussiandouble_result_str_dict, units)
+
+
+def _gaussiandouble_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_gaussiandouble_fit.
+
+    @param lmfit.model.ModelResult result: result of the gaussiandouble fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
+    if units is None:
+        units = ['arb. unit', 'arb. unit']
 
     # Write the parameters to allow human-readable output to be generated
     result_str_dict = OrderedDict()
@@ -658,9 +698,7 @@ def make_gaussiandouble_fit(self, x_axis, data, estimator,
                                       'unit': units[0]}
 
     result_str_dict['chi_sqr'] = {'value': result.chisqr, 'unit': ''}
-
-    result.result_str_dict = result_str_dict
-    return result
+    return result_str_dict
 
 def estimate_gaussiandouble_peak(self, x_axis, data, params,
                                 threshold_fraction=0.4, minimal_threshold=0.1,
@@ -688,7 +726,7 @@ def estimate_gaussiandouble_peak(self, x_axis, data, params,
     error = self._check_1D_input(x_axis=x_axis, data=data, params=params)
 
 
-    mod_lor, params_lor = self.make_multiplelorentzian_model(no_of_functions=2)
+    mod_lor, params_lor = self.get_model_template('multiplelorentzian', no_of_functions=2)
 
     error, params_lor = self.estimate_lorentziandouble_dip(x_axis=x_axis,
                                                      data=-data,
@@ -732,7 +770,7 @@ def estimate_gaussiandouble_dip(self, x_axis, data, params,
 
     error = self._check_1D_input(x_axis=x_axis, data=data, params=params)
 
-    mod_lor, params_lor = self.make_multiplelorentzian_model(no_of_functions=2)
+    mod_lor, params_lor = self.get_model_template('multiplelorentzian', no_of_functions=2)
 
     error, params_lor = self.estimate_lorentziandouble_dip(x_axis=x_axis,
                                                      data=data,
@@ -779,21 +817,17 @@ def make_twoDgaussian_fit(self, xy_axes, data, estimator, units=None, add_params
 
     x_axis, y_axis = xy_axes
 
-    gaussian_2d_model, params = self.make_twoDgaussian_model()
+    gaussian_2d_model, params = self.get_model_template('twoDgaussian')
 
     error, params = estimator(x_axis=x_axis, y_axis=y_axis,
                               data=data, params=params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = gaussian_2d_model.fit(data, x=xy_axes, params=params, **kwargs)
-    except:
-        result = gaussian_2d_model.fit(data, x=xy_axes, params=params, **kwargs)
-        self.log.warning('The 2D gaussian fit did not work: {0}'.format(
-                       result.message))
-
-    return result
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    result = self._fit_model(gaussian_2d_model, data, params, 'twoDgaussian', x=xy_axes, **kwargs)
+
+    return self._finish_fit_result(result, lean)
 
 def estimate_twoDgaussian(self, x_axis, y_axis, data, params):
     """ Provide a simple two dimensional gaussian function.
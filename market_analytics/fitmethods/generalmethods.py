@@ -21,13 +21,61 @@ top-level directory of this distribution and at <https://github.com/Ulm-IQO/qudi
 """
 
 
+import functools
+import operator
+import weakref
+from collections.abc import Mapping
+
 import numpy as np
 import lmfit
-from scipy.signal import gaussian
-from scipy.ndimage import filters
 from lmfit import Parameters
+from lmfit.model import CompositeModel, ModelResult
 from collections import OrderedDict
 
+# Value and factors of the left and right partial derivatives for each operator
+# lmfit combines models with, e.g. d(l*r) = r*dl + l*dr
+_DERIVATIVE_RULES = {
+    operator.add: lambda left, right: (left + right, 1.0, 1.0),
+    operator.sub: lambda left, right: (left - right, 1.0, -1.0),
+    operator.mul: lambda left, right: (left * right, right, left),
+    operator.truediv: lambda left, right: (left / right, 1.0 / right, -left / right**2),
+}
+
+# Composed Jacobian (or None) of every model it was requested for
+_model_jacobians = weakref.WeakKeyDictionary()
+
+
+class LazyResultStrDict(Mapping):
+    """ result_str_dict which is only made when it is first read, see _finish_fit_result.
+
+    @param callable make: function without arguments returning the result_str_dict
+    """
+
+    def __init__(self, make):
+        self._make = make
+        self._result_str_dict = None
+
+    def _made(self):
+        if self._result_str_dict is None:
+            self._result_str_dict = self._make()
+            self._make = None
+        return self._result_str_dict
+
+    def __getitem__(self, key):
+        return self._made()[key]
+
+    def __iter__(self):
+        return iter(self._made())
+
+    def __len__(self):
+        return len(self._made())
+
+    def __repr__(self):
+        if self._result_str_dict is None:
+            return '{0}(<not made yet>)'.format(type(self).__name__)
+        return '{0}({1!r})'.format(type(self).__name__, self._result_str_dict)
+
+
 ############################################################################
 #                                                                          #
 #                             General methods                              #
@@ -130,6 +178,350 @@ def _substitute_params(self, initial_params, update_params=None):
 
     return initial_params
 
+def _compose_derivatives(self, model):
+    """ Combine the derivatives of the building blocks of a model.
+
+    @param lmfit.Model model: building block with a 'derivatives' function or
+                              a composite of such models
+
+    @return function: evaluate(values, x) returning the model value and a dict
+                      with the partial derivatives by parameter name, or None if
+                      a building block has no derivatives or an operator is not
+                      one of +, -, * and /.
+    """
+    if isinstance(model, CompositeModel):
+        rule = _DERIVATIVE_RULES.get(model.op)
+        left = self._compose_derivatives(model.left)
+        right = self._compose_derivatives(model.right)
+        if rule is None or left is None or right is None:
+            return None
+
+        def evaluate(values, x):
+            left_value, left_partials = left(values, x)
+            right_value, right_partials = right(values, x)
+            value, left_factor, right_factor = rule(left_value, right_value)
+            partials = {name: left_factor * partial for name, partial in left_partials.items()}
+            for name, partial in right_partials.items():
+                partials[name] = partials.get(name, 0.0) + right_factor * partial
+            return value, partials
+
+        return evaluate
+
+    derivatives = getattr(model, 'derivatives', None)
+    if derivatives is None or model.independent_vars != ['x']:
+        return None
+    prefix = model.prefix
+    names = [(name[len(prefix):], name) for name in model.param_names]
+    opts = dict(model.opts)
+
+    def evaluate(values, x):
+        kwargs = dict(opts)
+        for root, name in names:
+            kwargs[root] = values[name]
+        value, partials = derivatives(x, **kwargs)
+        return value, {prefix + root: partial for root, partial in partials.items()}
+
+    return evaluate
+
+
+def make_model_jacobian(self, model):
+    """ Compose the analytic Jacobian of a model from the derivatives of its
+    building blocks.
+
+    The building blocks (e.g. bare sine, exponential decays, Lorentzian,
+    Gaussian, amplitude, offset and slope) provide their value together with
+    the partial derivatives after their parameters. Composite models combine
+    them with the sum, product and quotient rules, so the optimizer does not
+    need an extra model evaluation per free parameter for the Jacobian.
+
+    @param lmfit.Model model: model of the fit, usually a composite one
+
+    @return function: jacobian(params, data, weights, **kwargs) of the residual,
+                      as expected by leastsq for Dfun with col_deriv=1, or None
+                      if the model cannot be differentiated analytically.
+    """
+    evaluate = self._compose_derivatives(model)
+    if evaluate is None:
+        return None
+
+    def jacobian(params, data, weights, x=None, **kwargs):
+        value, partials = evaluate(params.valuesdict(), x)
+        var_names = [name for name, par in params.items() if par.vary]
+        jac = np.zeros((len(var_names), np.size(data)))
+        # the residual of lmfit models is data - model
+        for row, name in zip(jac, var_names):
+            if name in partials:
+                row[:] = -partials[name]
+        if weights is not None:
+            jac *= np.ravel(weights)
+        return jac
+
+    return jacobian
+
+
+def _add_analytic_jacobian(self, model, params, kwargs):
+    """ Pass the analytic Jacobian of a model on to the optimizer of model.fit.
+
+    The Jacobian is only used with leastsq (the default method), if the caller
+    did not pass a Dfun and if no parameter of the model is constrained by an
+    expression. Otherwise, or if use_analytic_jacobian is switched off, the
+    keyword arguments are returned unchanged and leastsq falls back to finite
+    differences.
+
+    @param lmfit.Model model: model that will be fitted
+    @param lmfit.Parameters params: initial parameters of the fit
+    @param dict kwargs: keyword arguments for model.fit
+
+    @return dict: keyword arguments for model.fit
+    """
+    fit_kws = kwargs.get('fit_kws') or dict()
+    if (not self.use_analytic_jacobian
+            or kwargs.get('method', 'leastsq') != 'leastsq'
+            or kwargs.get('nan_policy', model.nan_policy) == 'omit'
+            or 'Dfun' in fit_kws
+            or any(params[name].expr for name in model.param_names if name in params)):
+        return kwargs
+
+    if model not in _model_jacobians:
+        _model_jacobians[model] = self.make_model_jacobian(model)
+    jacobian = _model_jacobians[model]
+    if jacobian is None:
+        return kwargs
+
+    kwargs = dict(kwargs)
+    kwargs['fit_kws'] = dict(fit_kws, Dfun=jacobian, col_deriv=1)
+    return kwargs
+
+
+def _fit_model(self, model, data, params, fit_name, **kwargs):
+    """ Run model.fit with the failure policy of the FitLogic.
+
+    A fit that raises is never run again as it is. With the
+    fit_failure_policy 'fallback' it is run once more with fallback_fit_kwargs
+    instead, by default the least_squares minimizer without the analytic
+    Jacobian and with NaN values omitted. If that raises as well, or with the
+    policy 'error', the error result of _fit_error_result is returned. Every
+    failure is counted once in fit_failures, under (fit_name, 'fallback') if
+    the fallback worked and (fit_name, 'error') otherwise.
+
+    @param lmfit.Model model: model that will be fitted
+    @param numpy.array data: data to fit
+    @param lmfit.Parameters params: initial parameters of the fit
+    @param str fit_name: name of the fit, for the log and the failure counts
+    @param kwargs: keyword arguments for model.fit, including the independent
+                   variables like x
+
+    @return lmfit.model.ModelResult: result of the fit, with the attributes
+                                     fallback (True if the fallback was used)
+                                     and fit_error (None or the error message)
+    """
+    if self.fit_failure_policy not in ('fallback', 'error'):
+        raise ValueError('Unknown fit_failure_policy {0!r}, use "fallback" or '
+                         '"error".'.format(self.fit_failure_policy))
+    try:
+        result = model.fit(data, params=params, **kwargs)
+        result.fallback, result.fit_error = False, None
+        return result
+    except Exception as e:
+        error = e
+
+    if self.fit_failure_policy == 'fallback':
+        fallback_kwargs = dict(kwargs, **self.fallback_fit_kwargs)
+        fallback_kwargs['fit_kws'] = {name: value
+                                      for name, value in (kwargs.get('fit_kws') or {}).items()
+                                      if name not in ('Dfun', 'col_deriv')}
+        self.log.warning('The {0} fit did not work, fitting again with {1}. Error '
+                         'message: {2!r}'.format(fit_name, self.fallback_fit_kwargs, error))
+        # model.fit keeps a nan_policy it is given on the model, which is shared by all fits
+        nan_policy = model.nan_policy
+        try:
+            result = model.fit(data, params=params, **fallback_kwargs)
+        except Exception as e:
+            error = e
+        else:
+            self.fit_failures[(fit_name, 'fallback')] += 1
+            result.fallback, result.fit_error = True, None
+            return result
+        finally:
+            model.nan_policy = nan_policy
+
+    self.fit_failures[(fit_name, 'error')] += 1
+    self.log.error('The {0} fit did not work. Error message: {1!r}'.format(fit_name, error))
+    return self._fit_error_result(model, data, params, error, kwargs)
+
+
+def _fit_error_result(self, model, data, params, error, kwargs):
+    """ Result of a fit that raised, see _fit_model.
+
+    The result holds the initial parameters without stderr, the model and
+    residual at them (NaN where the model cannot be evaluated) and the
+    statistics of that residual. success is False and message and fit_error
+    give the error.
+
+    @param lmfit.Model model: model that was fitted
+    @param numpy.array data: data of the fit
+    @param lmfit.Parameters params: initial parameters of the fit
+    @param Exception error: what the fit raised
+    @param dict kwargs: keyword arguments of model.fit
+
+    @return lmfit.model.ModelResult: the error result
+    """
+    userkws = {name: kwargs[name] for name in model.independent_vars if name in kwargs}
+    params = params.copy()
+    result = ModelResult(model, params, data=data, weights=kwargs.get('weights'),
+                         fcn_kws=userkws)
+    result.userkws = userkws
+    result.params = params
+    result.init_params = params.copy()
+    result.init_values = {name: param.value for name, param in params.items()}
+    result.var_names = [name for name, param in params.items()
+                        if param.vary and param.expr is None]
+    result.nvarys = len(result.var_names)
+    result.best_values = model._make_all_args(params)
+    try:
+        best_fit = np.asarray(model.eval(params=params, **userkws), dtype=float)
+    except Exception:
+        best_fit = np.full(np.shape(data), np.nan)
+    result.init_fit = result.best_fit = best_fit
+    result.residual = np.ravel(data - best_fit)
+    result.ndata = result.residual.size
+    result.nfree = result.ndata - result.nvarys
+    result.chisqr = float(np.sum(np.square(result.residual)))
+    result.redchi = result.chisqr / max(1, result.nfree)
+    result.nfev = 0
+    result.covar = None
+    result.success = result.errorbars = result.aborted = False
+    result.message = 'Fit failed: {0!r}'.format(error)
+    result.fallback, result.fit_error = False, repr(error)
+    return result
+
+
+def _lean_fit_kwargs(self, kwargs):
+    """ Split the lean flag off the keyword arguments of a make_*_fit method.
+
+    A lean fit (lean=True) defers the result_str_dict to its first access and
+    passes calc_covar=False to model.fit, with which the methods other than
+    leastsq and least_squares skip the covariance matrix and the stderr. This
+    is for screening many models where only the best-fit values and chisqr
+    matter. See _finish_fit_result.
+
+    @param dict kwargs: keyword arguments of the make_*_fit method
+
+    @return tuple: (bool lean, dict keyword arguments for model.fit)
+    """
+    kwargs = dict(kwargs)
+    lean = bool(kwargs.pop('lean', False))
+    if lean:
+        kwargs.setdefault('calc_covar', False)
+    return lean, kwargs
+
+
+def _finish_fit_result(self, result, lean, make_result_str_dict=None, units=None):
+    """ Attach the human-readable result_str_dict to a fit result.
+
+    For lean fits the result_str_dict is a LazyResultStrDict, which is only
+    made when it is read, after calculate_uncertainties filled in the
+    uncertainties if the fit method skipped them. So is the one of a fit that
+    did not finish, i.e. one stopped by its budget (aborted) or an error
+    result of _fit_model, since it has no uncertainties either. If the fit was
+    aborted at its first function evaluation, lmfit leaves the fit statistics
+    unset, they are taken from the residual of the starting values instead.
+
+    @param lmfit.model.ModelResult result: result of model.fit
+    @param bool lean: whether the fit was lean, see _lean_fit_kwargs
+    @param method make_result_str_dict: optional, function(result, units)
+                                        returning the result_str_dict of the
+                                        fit, None if the fit has none.
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return lmfit.model.ModelResult: the result with its result_str_dict
+    """
+    aborted = getattr(result, 'aborted', False)
+    if aborted and result.chisqr is None and result.residual is not None:
+        result.nfev = max(result.nfev, 0)
+        result.ndata = np.size(result.residual)
+        result.nfree = result.ndata - result.nvarys
+        result.chisqr = float(np.sum(np.square(result.residual)))
+        result.redchi = result.chisqr / max(1, result.nfree)
+    if make_result_str_dict is None:
+        return result
+    if lean or aborted or getattr(result, 'fit_error', None) is not None:
+        result.result_str_dict = LazyResultStrDict(functools.partial(
+            self._uncertain_result_str_dict, result, make_result_str_dict, units))
+    else:
+        result.result_str_dict = make_result_str_dict(result, units=units)
+    return result
+
+
+def _uncertain_result_str_dict(self, result, make_result_str_dict, units):
+    """ result_str_dict of a lean or unfinished fit, see _finish_fit_result.
+
+    @param lmfit.model.ModelResult result: result of the fit
+    @param method make_result_str_dict: function(result, units) returning the
+                                        result_str_dict of the fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: the result_str_dict, after the uncertainties were calculated
+                  if the fit has none
+    """
+    if result.covar is None:
+        self.calculate_uncertainties(result)
+    return make_result_str_dict(result, units=units)
+
+
+def calculate_uncertainties(self, result):
+    """ Calculate the covariance, stderr and correlations a fit skipped.
+
+    The Jacobian of the weighted model is taken by central differences at
+    the best fit (one-sided at a bound). As in lmfit the covariance is scaled
+    by the reduced chi-square if scale_covar is set. If it cannot be
+    inverted, errorbars is set to False and stderr stays None.
+
+    @param lmfit.model.ModelResult result: result of a fit without covariance
+    """
+    params = result.params.copy()
+    names = [name for name in result.var_names if name in params]
+    jacobian = np.zeros((len(names), np.size(result.data)))
+    for index, name in enumerate(names):
+        value = params[name].value
+        step = 6e-6 * abs(value) if value != 0 else 6e-6
+        evaluated = []
+        for trial in (value + step, value - step):
+            # the value setter clips to the bounds, use the value actually set
+            params[name].value = trial
+            evaluated.append((params[name].value,
+                              np.ravel(result.model.eval(params, **result.userkws))))
+        params[name].value = value
+        (upper, upper_values), (lower, lower_values) = evaluated
+        if upper != lower:
+            jacobian[index] = (upper_values - lower_values) / (upper - lower)
+    if result.weights is not None:
+        jacobian *= np.ravel(result.weights)
+
+    try:
+        covar = np.linalg.inv(jacobian @ jacobian.T)
+    except np.linalg.LinAlgError:
+        result.errorbars = False
+        return
+    if result.scale_covar:
+        covar *= result.redchi
+    stderr = np.sqrt(np.abs(np.diag(covar)))
+
+    result.covar = covar
+    result.errorbars = bool(np.all(stderr > 0)) and bool(np.all(np.isfinite(covar)))
+    for param in result.params.values():
+        param.stderr, param.correl = 0, None
+    for index, name in enumerate(names):
+        param = result.params[name]
+        param.stderr = float(stderr[index])
+        param.correl = {other: float(covar[index, other_index]
+                                     / (stderr[index] * stderr[other_index]))
+                        for other_index, other in enumerate(names)
+                        if other_index != index and stderr[index] * stderr[other_index] > 0}
+    if result.errorbars:
+        result.uvars = result.params.create_uvars(covar=covar)
+
+
 def create_fit_string(self, result, model, units=None, decimal_digits_value_given=None,
                       decimal_digits_err_given=None):
     """ This method can produces a well readable string from the results of a fitted model.
@@ -188,64 +580,73 @@ def create_fit_string(self, result, model, units=None, decimal_digits_value_give
 
 
 def _search_end_of_dip(self, direction, data, peak_arg, start_arg, end_arg, sigma_threshold, minimal_threshold, make_prints):
-    """
+    """ Search the end of a dip, going from its minimum towards start_arg or end_arg.
+
+    The end is the first point from the minimum on whose absolute value is
+    below the absolute sigma_threshold. If there is none, the threshold is
+    lowered by 10 % and the search repeated, until the threshold relative to
+    the minimum is below minimal_threshold, then the end is start_arg (left)
+    or end_arg (right). A minimum at that border is its own end.
+
+    A search finds a point exactly if the smallest absolute value on the way
+    is below the threshold, so the thresholds are lowered on that value alone
+    and the data is scanned only once, for the first threshold that matches.
+
     data has to be offset leveled such that offset is substracted
+
+    @param str direction: 'left' or 'right'
+    @param numpy.array data: offset leveled data
+    @param int peak_arg: index of the minimum of the dip
+    @param int start_arg: first index of the search area
+    @param int end_arg: last index of the search area
+    @param float sigma_threshold: initial threshold, same sign as the dip
+    @param float minimal_threshold: smallest threshold relative to the minimum
+    @param bool make_prints: print the progress of the search
+
+    @return tuple (sigma_threshold, sigma_arg): last threshold and index of
+                                                the end of the dip
     """
-    # Todo: Create doc string
-    absolute_min  = data[peak_arg]
+    absolute_min = data[peak_arg]
 
     if direction == 'left':
-        mult = -1
-        sigma_arg=start_arg
+        sigma_arg = start_arg
+        # absolute values from the minimum towards the start, in search order
+        values = np.abs(data[start_arg:peak_arg + 1][::-1])
     elif direction == 'right':
-        mult = +1
-        sigma_arg=end_arg
+        sigma_arg = end_arg
+        values = np.abs(data[peak_arg:end_arg + 1])
     else:
-        print('No valid direction in search end of peak')
-    ii=0
+        raise ValueError('No valid direction in search end of peak: {0}'.format(direction))
 
-    #if the minimum is at the end set this as boarder
-    if (peak_arg != start_arg and direction=='left' or
-        peak_arg != end_arg   and direction=='right'):
-        while True:
-            # if no minimum can be found decrease threshold
-            if ((peak_arg-ii<start_arg and direction == 'left') or
-                (peak_arg+ii>end_arg   and direction=='right')):
-                sigma_threshold*=0.9
-                ii=0
-                if make_prints:
-                    print('h1 sigma_threshold',sigma_threshold)
-
-            #if the dip is always over threshold the end is as
-            # set before
-            if abs(sigma_threshold/absolute_min)<abs(minimal_threshold):
-                if make_prints:
-                    print('h2')
-                break
-
-             #check if value was changed and search is finished
-            if ((sigma_arg == start_arg and direction == 'left') or
-                (sigma_arg == end_arg   and direction=='right')):
-                # check if if value is lower as threshold this is the
-                # searched value
-                if make_prints:
-                    print('h3')
-                if abs(data[peak_arg+(mult*ii)])<abs(sigma_threshold):
-                    # value lower than threshold found - left end found
-                    sigma_arg=peak_arg+(mult*ii)
-                    if make_prints:
-                        print('h4')
-                    break
-            ii+=1
-
-    # in this case the value is the last index and should be search set
-    # as right argument
-    else:
+    # in this case the minimum is the last index and is set as end
+    if peak_arg == sigma_arg:
         if make_prints:
             print('neu h10')
-        sigma_arg=peak_arg
+        return sigma_threshold, peak_arg
+
+    smallest_value = np.fmin.reduce(values)
+    while True:
+        # if the dip is always over threshold the end is as set before, a
+        # threshold of zero can not be lowered any further
+        if abs(sigma_threshold/absolute_min) < abs(minimal_threshold) or sigma_threshold == 0:
+            if make_prints:
+                print('h2')
+            break
+
+        if smallest_value < abs(sigma_threshold):
+            # value lower than threshold found - end found
+            steps = int(np.argmax(values < abs(sigma_threshold)))
+            sigma_arg = peak_arg - steps if direction == 'left' else peak_arg + steps
+            if make_prints:
+                print('h4')
+            break
+
+        # if no minimum can be found decrease threshold
+        sigma_threshold *= 0.9
+        if make_prints:
+            print('h1 sigma_threshold', sigma_threshold)
 
-    return sigma_threshold,sigma_arg
+    return sigma_threshold, sigma_arg
 
 
 def _search_double_dip(self, x_axis, data, threshold_fraction=0.3,
@@ -351,13 +752,14 @@ def _search_double_dip(self, x_axis, data, threshold_fraction=0.3,
 
     # search for peak left and right of the dip
     else:
-        while True:
-            #set search area excluding the first dip
-            left_min=data[left_index:mid_index_left].min()
-            left_argmin=data[left_index:mid_index_left].argmin()
-            right_min=data[mid_index_right:right_index].min()
-            right_argmin=data[mid_index_right:right_index].argmin()
+        #set search area excluding the first dip, it stays the same while the
+        # threshold is lowered
+        left_min=data[left_index:mid_index_left].min()
+        left_argmin=data[left_index:mid_index_left].argmin()
+        right_min=data[mid_index_right:right_index].min()
+        right_argmin=data[mid_index_right:right_index].argmin()
 
+        while True:
             if abs(left_min) > abs(threshold) and \
                abs(left_min) > abs(right_min):
                 if make_prints:
@@ -375,16 +777,12 @@ def _search_double_dip(self, x_axis, data, threshold_fraction=0.3,
                 break
             else:
                 # no minimum at all over threshold so lowering threshold
-                #  and resetting search area
                 threshold*=0.9
-                left_index=int(0)
-                right_index=len(x_axis)-1
-                mid_index_left=sigma0_argleft
-                mid_index_right=sigma0_argright
                 if make_prints:
                     print('h15')
-                #if no second dip can be found set both to same value
-                if abs(threshold/absolute_min)<abs(minimal_threshold):
+                #if no second dip can be found set both to same value, also
+                # if the threshold can not be lowered any further
+                if abs(threshold/absolute_min)<abs(minimal_threshold) or threshold == 0:
                     if make_prints:
                         print('h16')
                     self.log.warning('Threshold to minimum ratio was too '
@@ -459,8 +857,11 @@ def find_offset_parameter(self, x_values=None, data=None):
 
 
     """
+    # scipy is only imported here so that fits not using the filters can load this file cheaply
+    from scipy import ndimage
+
     # lorentzian filter
-    mod, params = self.make_lorentzian_model()
+    mod, params = self.get_model_template('lorentzian')
 
     # Todo: exclude filter in seperate method to be used in other methods
 
@@ -473,7 +874,7 @@ def find_offset_parameter(self, x_values=None, data=None):
 
     lorentz = mod.eval(x=np.linspace(0, len_x, len_x), amplitude=1, offset=0.,
                        sigma=len_x/4., center=len_x/2.)
-    data_smooth = filters.convolve1d(data, lorentz/lorentz.sum(),
+    data_smooth = ndimage.convolve1d(data, lorentz/lorentz.sum(),
                                      mode='constant', cval=data.max())
 
     # finding most frequent value which is supposed to be the offset
@@ -499,6 +900,9 @@ def gaussian_smoothing(self, data=None, filter_len=None, filter_sigma=None):
     @return array: smoothed data
 
     """
+    from scipy import ndimage
+    from scipy.signal.windows import gaussian
+
     #Todo: Check for wrong data type
     if filter_len is None:
         if len(data) < 20.:
@@ -511,7 +915,7 @@ def gaussian_smoothing(self, data=None, filter_len=None, filter_sigma=None):
         filter_sigma = filter_len
 
     gaus = gaussian(filter_len, filter_sigma)
-    return filters.convolve1d(data, gaus / gaus.sum(), mode='mirror')
+    return ndimage.convolve1d(data, gaus / gaus.sum(), mode='mirror')
 
 
 
@@ -97,7 +97,7 @@ def make_hyperbolicsaturation_fit(self, x_axis, data, estimator, units=None, add
                            with best fit with given axis,...
     """
 
-    mod_final, params = self.make_hyperbolicsaturation_model()
+    mod_final, params = self.get_model_template('hyperbolicsaturation')
 
     error, params = estimator(x_axis, data, params)
 
@@ -105,10 +105,11 @@ def make_hyperbolicsaturation_fit(self, x_axis, data, estimator, units=None, add
     params = self._substitute_params(
         initial_params=params,
         update_params=add_params)
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
 
-    result = mod_final.fit(data, x=x_axis, params=params, **kwargs)
+    result = self._fit_model(mod_final, data, params, 'hyperbolicsaturation', x=x_axis, **kwargs)
 
-    return result
+    return self._finish_fit_result(result, lean)
 
 
 def estimate_hyperbolicsaturation(self, x_axis, data, params):
@@ -132,7 +133,7 @@ def estimate_hyperbolicsaturation(self, x_axis, data, params):
     data_half = data[len(x_axis)//2:]
 
     results_lin = self.make_linear_fit(x_axis=x_axis_half, data=data_half,
-                                           estimator=self.estimate_linear)
+                                           estimator=self.estimate_linear, lean=True)
 
     est_slope = results_lin.params['slope'].value
     est_offset = data.min()
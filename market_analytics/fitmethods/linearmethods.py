@@ -21,6 +21,7 @@ Copyright (c) the Qudi Developers. See the COPYRIGHT.txt file at the
 top-level directory of this distribution and at <https://github.com/Ulm-IQO/qudi/>
 """
 
+from lmfit.model import ModelResult
 from lmfit.models import Model
 import numpy as np
 
@@ -65,6 +66,13 @@ def make_constant_model(self, prefix=None):
 
         return offset
 
+    def constant_derivatives(x, offset):
+        """ Value of the constant offset and its derivative after the offset.
+
+        @return tuple: (float value, dict with the partial derivative by parameter name)
+        """
+        return offset, {'offset': 1.0}
+
     if not isinstance(prefix, str) and prefix is not None:
         self.log.error('The passed prefix <{0}> of type {1} is not a string and cannot be used as '
                        'a prefix and will be ignored for now. Correct that!'.format(prefix,
@@ -72,6 +80,7 @@ def make_constant_model(self, prefix=None):
         model = Model(constant_function, independent_vars=['x'])
     else:
         model = Model(constant_function, independent_vars=['x'], prefix=prefix)
+    model.derivatives = constant_derivatives
 
     params = model.make_params()
 
@@ -101,6 +110,13 @@ def make_amplitude_model(self, prefix=None):
 
         return amplitude
 
+    def amplitude_derivatives(x, amplitude):
+        """ Value of the constant amplitude and its derivative after the amplitude.
+
+        @return tuple: (float value, dict with the partial derivative by parameter name)
+        """
+        return amplitude, {'amplitude': 1.0}
+
     if not isinstance(prefix, str) and prefix is not None:
         self.log.error('The passed prefix <{0}> of type {1} is not a string and cannot be used as '
                        'a prefix and will be ignored for now. Correct that!'.format(prefix,
@@ -108,6 +124,7 @@ def make_amplitude_model(self, prefix=None):
         model = Model(amplitude_function, independent_vars=['x'])
     else:
         model = Model(amplitude_function, independent_vars=['x'], prefix=prefix)
+    model.derivatives = amplitude_derivatives
 
     params = model.make_params()
 
@@ -137,6 +154,13 @@ def make_slope_model(self, prefix=None):
 
         return slope
 
+    def slope_derivatives(x, slope):
+        """ Value of the constant slope and its derivative after the slope.
+
+        @return tuple: (float value, dict with the partial derivative by parameter name)
+        """
+        return slope, {'slope': 1.0}
+
     if not isinstance(prefix, str) and prefix is not None:
         self.log.error('The passed prefix <{0}> of type {1} is not a string and cannot be used as '
                        'a prefix and will be ignored for now. Correct that!'.format(prefix,
@@ -144,6 +168,7 @@ def make_slope_model(self, prefix=None):
         model = Model(slope_function, independent_vars=['x'])
     else:
         model = Model(slope_function, independent_vars=['x'], prefix=prefix)
+    model.derivatives = slope_derivatives
 
     params = model.make_params()
 
@@ -172,6 +197,13 @@ def make_linear_model(self, prefix=None):
 
         return x
 
+    def linear_derivatives(x):
+        """ Value of the linear function, which has no parameters.
+
+        @return tuple: (numpy.array value, empty dict of partial derivatives)
+        """
+        return x, {}
+
     if not isinstance(prefix, str) and prefix is not None:
         self.log.error('The passed prefix <{0}> of type {1} is not a string and cannot be used as '
                        'a prefix and will be ignored for now. Correct that!'.format(prefix,
@@ -179,6 +211,7 @@ def make_linear_model(self, prefix=None):
         linear_mod = Model(linear_function, independent_vars=['x'])
     else:
         linear_mod = Model(linear_function, independent_vars=['x'], prefix=prefix)
+    linear_mod.derivatives = linear_derivatives
 
     slope, slope_param = self.make_slope_model(prefix=prefix)
     constant, constant_param = self.make_constant_model(prefix=prefix)
@@ -206,14 +239,45 @@ def make_linear_fit(self, x_axis, data, estimator, units=None, add_params=None,
                            with best fit with given axis,...
     """
     # Make mathematical fit model
-    linear, params = self.make_linear_model()
+    linear, params = self.get_model_template('linear')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params, update_params=add_params)
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+
+    # an unconstrained (optionally weighted) straight line is an ordinary
+    # least-squares problem, which does not need an iterative minimization.
+    # A budget (max_nfev, or an iter_cb stopping at a deadline) is left to
+    # lmfit, which honours and reports it.
+    result = None
+    if (self.use_closed_form_linear_fit
+            and set(kwargs) <= {'weights', 'max_nfev', 'calc_covar', 'iter_cb'}
+            and kwargs.get('max_nfev') is None and kwargs.get('iter_cb') is None
+            and set(params) == {'slope', 'offset'}
+            and all(param.vary and param.expr is None and param.min == -np.inf
+                    and param.max == np.inf for param in params.values())):
+        try:
+            result = self._make_linear_result(linear, params, x_axis, data,
+                                              weights=kwargs.get('weights'))
+        except ValueError:
+            # e.g. too few points or non-finite data, leave that to lmfit
+            result = None
+    if result is None:
+        kwargs = self._add_analytic_jacobian(linear, params, kwargs)
+        result = self._fit_model(linear, data, params, 'linear', x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._linear_result_str_dict, units)
+
+
+def _linear_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_linear_fit.
+
+    @param lmfit.model.ModelResult result: result of the linear fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
 
-    result = linear.fit(data, x=x_axis, params=params, **kwargs)
-
+    @return dict: values, errors and units by displayed parameter name
+    """
     if units is None:
         units = ['arb. unit', 'arb. unit']
 
@@ -225,9 +289,7 @@ def make_linear_fit(self, x_axis, data, estimator, units=None, add_params=None,
     result_str_dict['Offset'] = {'value': result.params['offset'].value,
                                  'error': result.params['offset'].stderr,
                                  'unit': units[1]}
-
-    result.result_str_dict = result_str_dict
-    return result
+    return result_str_dict
 
 
 def estimate_linear(self, x_axis, data, params):
@@ -250,16 +312,7 @@ def estimate_linear(self, x_axis, data, params):
     try:
         # calculate the parameters using Least-squares estimation of linear
         # regression
-        a_1 = 0
-        a_2 = 0
-        x_mean = x_axis.mean()
-        data_mean = data.mean()
-
-        for i in range(0, len(x_axis)):
-            a_1 += (x_axis[i]-x_mean)*(data[i]-data_mean)
-            a_2 += np.power(x_axis[i]-x_mean, 2)
-        slope = a_1/a_2
-        intercept = data_mean - slope * x_mean
+        slope, intercept, _ = self._linear_least_squares(x_axis, data)
         params['offset'].value = intercept
         params['slope'].value = slope
     except:
@@ -269,3 +322,117 @@ def estimate_linear(self, x_axis, data, params):
 
     return error, params
 
+
+def _linear_least_squares(self, x_axis, data, weights=None):
+    """ Closed-form (weighted) least-squares solution of a straight line.
+
+    @param numpy.array x_axis: 1D axis values
+    @param numpy.array data: 1D data, should have the same dimension as x_axis.
+    @param numpy.array weights: optional, weights multiplying the residual
+                                data - model, like the weights of lmfit
+
+    @return tuple (slope, offset, covar):
+        float slope: slope of the line
+        float offset: value of the line at x = 0
+        numpy.array covar: 2x2 covariance matrix of slope and offset, scaled
+                           by the reduced chi-square like lmfit does
+
+    @raise ValueError: if there are less than two points, non-finite values or
+                       no spread in x_axis
+    """
+    x_axis = np.asarray(x_axis, dtype=float)
+    data = np.asarray(data, dtype=float)
+    if weights is None:
+        weights = np.ones_like(data)
+    else:
+        weights = np.square(np.broadcast_to(np.asarray(weights, dtype=float), data.shape))
+    if (data.ndim != 1 or x_axis.shape != data.shape or data.size < 2
+            or not np.isfinite(x_axis).all() or not np.isfinite(data).all()
+            or not np.isfinite(weights).all()):
+        raise ValueError('A linear least-squares fit needs at least two finite points.')
+
+    weight_sum = weights.sum()
+    x_mean = np.dot(weights, x_axis) / weight_sum
+    data_mean = np.dot(weights, data) / weight_sum
+    x_centred = x_axis - x_mean
+    sum_xx = np.dot(weights * x_centred, x_centred)
+    if not sum_xx > 0:
+        raise ValueError('A linear least-squares fit needs different x values.')
+    slope = np.dot(weights * x_centred, data - data_mean) / sum_xx
+    offset = data_mean - slope * x_mean
+
+    residual = data - (slope * x_axis + offset)
+    chisqr = np.dot(weights * residual, residual)
+    redchi = chisqr / max(1, data.size - 2)
+    covar = redchi * np.array([[1 / sum_xx, -x_mean / sum_xx],
+                               [-x_mean / sum_xx, 1 / weight_sum + x_mean**2 / sum_xx]])
+    return slope, offset, covar
+
+
+def _make_linear_result(self, model, params, x_axis, data, weights=None):
+    """ Build the result of a linear fit from the closed-form least-squares
+    solution, with the same attributes as a result of model.fit.
+
+    @param lmfit.Model model: linear model, see make_linear_model
+    @param lmfit.Parameters params: initial parameters slope and offset
+    @param numpy.array x_axis: 1D axis values
+    @param numpy.array data: 1D data, should have the same dimension as x_axis.
+    @param numpy.array weights: optional, weights multiplying the residual
+
+    @return lmfit.model.ModelResult: result with best-fit values, standard
+                                     errors, correlation and fit statistics
+    """
+    slope, offset, covar = self._linear_least_squares(x_axis, data, weights=weights)
+    x_axis = np.asarray(x_axis, dtype=float)
+    data = np.asarray(data, dtype=float)
+
+    result = ModelResult(model, params, data=data, weights=weights, fcn_kws={'x': x_axis})
+    result.init_params = params
+    result.init_values = model._make_all_args(params)
+    result.init_fit = model.eval(params=params, x=x_axis)
+
+    best_params = params.copy()
+    var_names = list(best_params)
+    # _linear_least_squares gives slope before offset, the covariance of the
+    # result is ordered like var_names, i.e. the parameters
+    order = [('slope', 'offset').index(name) for name in var_names]
+    covar = covar[np.ix_(order, order)]
+    values = {'slope': slope, 'offset': offset}
+    stderr = dict(zip(var_names, np.sqrt(np.diag(covar))))
+    for name in var_names:
+        best_params[name].init_value = params[name].value
+        best_params[name].value = values[name]
+        best_params[name].stderr = stderr[name]
+    if stderr['slope'] and stderr['offset']:
+        correlation = covar[0, 1] / (stderr['slope'] * stderr['offset'])
+        best_params['slope'].correl = {'offset': correlation}
+        best_params['offset'].correl = {'slope': correlation}
+    best_params.create_uvars(covar=covar)
+    result.params = best_params
+
+    result.var_names = var_names
+    result.init_vals = [params[name].value for name in var_names]
+    result.covar = covar
+    result.best_values = model._make_all_args(best_params)
+    result.best_fit = model.eval(params=best_params, x=x_axis)
+    result.residual = data - result.best_fit
+    if weights is not None:
+        result.residual = result.residual * weights
+
+    result.method = 'linear least squares'
+    result.nfev = 1
+    result.success = True
+    result.errorbars = True
+    result.aborted = False
+    result.message = 'Closed-form least-squares solution.'
+    result.ndata = data.size
+    result.nvarys = len(var_names)
+    result.nfree = result.ndata - result.nvarys
+    result.chisqr = np.dot(result.residual, result.residual)
+    result.redchi = result.chisqr / max(1, result.nfree)
+    neg2_log_likel = result.ndata * np.log(max(result.chisqr, 1.e-250) / result.ndata)
+    result.aic = neg2_log_likel + 2 * result.nvarys
+    result.bic = neg2_log_likel + np.log(result.ndata) * result.nvarys
+    sstot = ((data - data.mean())**2).sum()
+    result.rsquared = 1.0 - ((data - result.best_fit)**2).sum() / max(1.e-250, sstot)
+    return result
@@ -28,7 +28,7 @@ from lmfit import Parameters
 from lmfit.models import Model
 from collections import OrderedDict
 
-from scipy.ndimage import filters
+from scipy import ndimage
 from scipy.interpolate import InterpolatedUnivariateSpline
 
 
@@ -142,6 +142,19 @@ def make_lorentzianwithoutoffset_model(self, prefix=None):
         """
         return np.power(sigma, 2) / (np.power((center - x), 2) + np.power(sigma, 2))
 
+    def physical_lorentzian_derivatives(x, center, sigma):
+        """ Lorentzian with unit height and its partial derivatives after center
+        and sigma.
+
+        @return tuple: (numpy.array value, dict with the partial derivatives by
+                       parameter name)
+        """
+        distance = center - x
+        denominator = np.power(distance, 2) + np.power(sigma, 2)
+        value = np.power(sigma, 2) / denominator
+        return value, {'center': -2 * distance * value / denominator,
+                       'sigma': 2 * sigma * np.power(distance, 2) / np.power(denominator, 2)}
+
     amplitude_model, params = self.make_amplitude_model(prefix=prefix)
 
     if not isinstance(prefix, str) and prefix is not None:
@@ -155,6 +168,7 @@ def make_lorentzianwithoutoffset_model(self, prefix=None):
             physical_lorentzian,
             independent_vars=['x'],
             prefix=prefix)
+    lorentz_model.derivatives = physical_lorentzian_derivatives
 
     full_lorentz_model = amplitude_model * lorentz_model
     params = full_lorentz_model.make_params()
@@ -299,19 +313,27 @@ def make_lorentzian_fit(self, x_axis, data, estimator, units=None,
                           with best fit with given axis,...
     """
 
-    model, params = self.make_lorentzian_model()
+    model, params = self.get_model_template('lorentzian')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = model.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        result = model.fit(data, x=x_axis, params=params, **kwargs)
-        self.log.warning('The 1D lorentzian fit did not work. Error '
-                         'message: {0}\n'.format(result.message))
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    kwargs = self._add_analytic_jacobian(model, params, kwargs)
+    result = self._fit_model(model, data, params, 'lorentzian', x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._lorentzian_result_str_dict, units)
+
+
+def _lorentzian_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_lorentzian_fit.
 
+    @param lmfit.model.ModelResult result: result of the lorentzian fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
     # Write the parameters to allow human-readable output to be generated
     result_str_dict = OrderedDict()
 
@@ -331,9 +353,7 @@ def make_lorentzian_fit(self, x_axis, data, estimator, units=None,
                                'unit': units[0]}
 
     result_str_dict['chi_sqr'] = {'value': result.chisqr, 'unit': ''}
-
-    result.result_str_dict = result_str_dict
-    return result
+    return result_str_dict
 
 def estimate_lorentzian_dip(self, x_axis, data, params):
     """ Provides an estimator to obtain initial values for lorentzian function.
@@ -452,20 +472,28 @@ def make_lorentziandouble_fit(self, x_axis, data, estimator, units=None, add_par
 
     """
 
-    model, params = self.make_lorentziandouble_model()
+    model, params = self.get_model_template('lorentziandouble')
 
     error, params = estimator(x_axis, data, params)
 
     # redefine values of additional parameters
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = model.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        result = model.fit(data, x=x_axis, params=params, **kwargs)
-        self.log.error('The double lorentzian fit did not '
-                     'work: {0}'.format(result.message))
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    kwargs = self._add_analytic_jacobian(model, params, kwargs)
+    result = self._fit_model(model, data, params, 'lorentziandouble', x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._lorentziandouble_result_str_dict, units)
+
 
+def _lorentziandouble_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_lorentziandouble_fit.
+
+    @param lmfit.model.ModelResult result: result of the lorentziandouble fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
     # Write the parameters to allow human-readable output to be generated
     result_str_dict = OrderedDict()
 
@@ -503,9 +531,7 @@ def make_lorentziandouble_fit(self, x_axis, data, estimator, units=None, add_par
                                  'unit': units[0]}
 
     result_str_dict['chi_sqr'] = {'value': result.chisqr, 'unit': ''}
-
-    result.result_str_dict = result_str_dict
-    return result
+    return result_str_dict
 
 def estimate_lorentziandouble_dip(self, x_axis, data, params,
                                   threshold_fraction=0.3,
@@ -706,7 +732,7 @@ def estimate_lorentziandouble_N15(self, x_axis, data, params):
 
     # if the filter is smaller than 3 points a convolution does not make sense
     if len(lorentz) >= 3:
-        data_convolved = filters.convolve1d(data_smooth_lorentz,
+        data_convolved = ndimage.convolve1d(data_smooth_lorentz,
                                             lorentz / lorentz.sum(),
                                             mode='constant',
                                             cval=data_smooth_lorentz.max())
@@ -774,19 +800,27 @@ def make_lorentziantriple_fit(self, x_axis, data, estimator, units=None,
                           with best fit with given axis,...
     """
 
-    model, params = self.make_lorentziantriple_model()
+    model, params = self.get_model_template('lorentziantriple')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = model.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        result = model.fit(data, x=x_axis, params=params, **kwargs)
-        self.log.error('The triple lorentzian fit did not '
-                       'work: {0}'.format(result.message))
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    kwargs = self._add_analytic_jacobian(model, params, kwargs)
+    result = self._fit_model(model, data, params, 'lorentziantriple', x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._lorentziantriple_result_str_dict, units)
 
+
+def _lorentziantriple_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_lorentziantriple_fit.
+
+    @param lmfit.model.ModelResult result: result of the lorentziantriple fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
     # Write the parameters to allow human-readable output to be generated
     result_str_dict = OrderedDict()
 
@@ -830,9 +864,7 @@ def make_lorentziantriple_fit(self, x_axis, data, estimator, units=None,
                                  'unit': units[0]}
 
     result_str_dict['chi_sqr'] = {'value': result.chisqr, 'unit': ''}
-
-    result.result_str_dict = result_str_dict
-    return result
+    return result_str_dict
 
 def estimate_lorentziantriple_N14(self, x_axis, data, params):
     """ Estimation of a the hyperfine interaction of a N14 nuclear spin.
@@ -888,7 +920,7 @@ def estimate_lorentziantriple_N14(self, x_axis, data, params):
     points_within_1MHz = len(x_axis)/(x_axis.max()-x_axis.min()) * 1e6
 
     # filter should have a width of 5MHz
-    x_filter = np.linspace(0, 5*points_within_1MHz, 5*points_within_1MHz)
+    x_filter = np.linspace(0, 5*points_within_1MHz, int(5*points_within_1MHz))
     lorentz = np.piecewise(x_filter, [(x_filter >= 0)                   * (x_filter < len(x_filter)*1/5),
                                       (x_filter >= len(x_filter)*1/5)   * (x_filter < len(x_filter)*2/5),
                                       (x_filter >= len(x_filter)*2/5)   * (x_filter < len(x_filter)*3/5),
@@ -898,7 +930,7 @@ def estimate_lorentziantriple_N14(self, x_axis, data, params):
 
     # if the filter is smaller than 5 points a convolution does not make sense
     if len(lorentz) >= 5:
-        data_convolved = filters.convolve1d(data_smooth_lorentz,
+        data_convolved = ndimage.convolve1d(data_smooth_lorentz,
                                             lorentz/lorentz.sum(),
                                             mode='constant',
                                             cval=data_smooth_lorentz.max())
@@ -24,8 +24,8 @@ top-level directory of this distribution and at <https://github.com/Ulm-IQO/qudi
 import numpy as np
 from lmfit.models import Model
 from lmfit import Parameters
-from scipy.signal import gaussian
-from scipy.ndimage import filters
+from scipy.signal.windows import gaussian
+from scipy import ndimage
 from scipy.interpolate import InterpolatedUnivariateSpline
 from collections import OrderedDict
 
@@ -173,23 +173,27 @@ def make_poissonian_fit(self, x_axis, data, estimator, units=None, add_params=No
                            with best fit with given axis,...
     """
 
-    poissonian_model, params = self.make_poissonian_model()
+    poissonian_model, params = self.get_model_template('poissonian')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
 
-    try:
-        result = poissonian_model.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        self.log.warning('The poissonian fit did not work. Check if a poisson '
-                         'distribution is needed or a normal approximation can be'
-                         'used. For values above 10 a normal/ gaussian distribution '
-                         'is a good approximation.')
-        result = poissonian_model.fit(data, x=x_axis, params=params, **kwargs)
-        print(result.message)
+    result = self._fit_model(poissonian_model, data, params, 'poissonian', x=x_axis, **kwargs)
 
+    return self._finish_fit_result(result, lean, self._poissonian_result_str_dict, units)
+
+
+def _poissonian_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_poissonian_fit.
+
+    @param lmfit.model.ModelResult result: result of the poissonian fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
     if units is None:
         units = ['arb. unit', 'arb. unit']
 
@@ -202,10 +206,7 @@ def make_poissonian_fit(self, x_axis, data, estimator, units=None, add_params=No
     result_str_dict['Event rate'] = {'value': result.params['mu'].value,
                                     'error': result.params['mu'].stderr,
                                     'unit': units[0]}      # event rate
-
-    result.result_str_dict = result_str_dict
-
-    return result
+    return result_str_dict
 
 
 def estimate_poissonian(self, x_axis, data, params):
@@ -228,7 +229,7 @@ def estimate_poissonian(self, x_axis, data, params):
     # a gaussian filter is appropriate due to the well approximation of poisson
     # distribution
     # gaus = gaussian(10,10)
-    # data_smooth = filters.convolve1d(data, gaus/gaus.sum(), mode='mirror')
+    # data_smooth = ndimage.convolve1d(data, gaus/gaus.sum(), mode='mirror')
     data_smooth = self.gaussian_smoothing(data=data, filter_len=10,
                                           filter_sigma=10)
 
@@ -257,23 +258,28 @@ def make_poissoniandouble_fit(self, x_axis, data, estimator, units=None, add_par
                            with best fit with given axis,...
     """
 
-    double_poissonian_model, params = self.make_poissoniandouble_model()
+    double_poissonian_model, params = self.get_model_template('poissoniandouble')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
 
-    try:
-        result = double_poissonian_model.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        self.log.warning('The double poissonian fit did not work. Check if a '
-                         'poisson distribution is needed or a normal '
-                         'approximation can be used. For values above 10 a '
-                         'normal/ gaussian distribution is a good '
-                         'approximation.')
-        result = double_poissonian_model.fit(data, x=x_axis, params=params, **kwargs)
+    result = self._fit_model(double_poissonian_model, data, params, 'poissoniandouble',
+                             x=x_axis, **kwargs)
 
+    return self._finish_fit_result(result, lean, self._poissoniandouble_result_str_dict, units)
+
+
+def _poissoniandouble_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_poissoniandouble_fit.
+
+    @param lmfit.model.ModelResult result: result of the poissoniandouble fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
     # Write the parameters to allow human-readable output to be generated
     result_str_dict = OrderedDict()
     if units is None:
@@ -294,10 +300,7 @@ def make_poissoniandouble_fit(self, x_axis, data, estimator, units=None, add_par
     result_str_dict['Event rate 2'] = {'value': result.params['p1_mu'].value,
                                        'error': result.params['p1_mu'].stderr,
                                        'unit':  units[1]}
-
-    result.result_str_dict = result_str_dict
-
-    return result
+    return result_str_dict
 
 
 def estimate_poissoniandouble(self, x_axis, data, params, threshold_fraction=0.4,
@@ -361,7 +364,7 @@ def estimate_poissoniandouble(self, x_axis, data, params, threshold_fraction=0.4
     # Use a gaussian function to convolve with the data, to smooth the datatrace.
     # Then the peak search algorithm performs much better.
     gaus = gaussian(len_x, len_x)
-    data_smooth = filters.convolve1d(interpol_data, gaus / gaus.sum(), mode='mirror')
+    data_smooth = ndimage.convolve1d(interpol_data, gaus / gaus.sum(), mode='mirror')
 
     # search for double gaussian
     search_results = self._search_double_dip(x_axis_interpol,
@@ -21,11 +21,15 @@ top-level directory of this distribution and at <https://github.com/Ulm-IQO/qudi
 """
 
 
+import collections
+import inspect
+
 import numpy as np
 from lmfit.models import Model
 
 import numpy as np
-from scipy import signal
+import scipy.fft
+from scipy.signal import windows
 
 
 def get_ft_windows():
@@ -45,21 +49,68 @@ def get_ft_windows():
     """
 
     win = {'none': {'func': np.ones, 'ampl_norm': 1.0},
-           'hamming': {'func': signal.hamming, 'ampl_norm': 1.0/0.54},
-           'hann': {'func': signal.hann, 'ampl_norm': 1.0/0.5},
-           'blackman': {'func': signal.blackman, 'ampl_norm': 1.0/0.42},
-           'triang': {'func': signal.triang, 'ampl_norm': 1.0/0.5},
-           'flattop': {'func': signal.flattop, 'ampl_norm': 1.0/0.2156},
-           'bartlett': {'func': signal.bartlett, 'ampl_norm': 1.0/0.5},
-           'parzen': {'func': signal.parzen, 'ampl_norm': 1.0/0.375},
-           'bohman': {'func': signal.bohman, 'ampl_norm': 1.0/0.4052847},
-           'blackmanharris': {'func': signal.blackmanharris, 'ampl_norm': 1.0/0.35875},
-           'nuttall': {'func': signal.nuttall, 'ampl_norm': 1.0/0.3635819},
-           'barthann': {'func': signal.barthann, 'ampl_norm': 1.0/0.5}}
+           'hamming': {'func': windows.hamming, 'ampl_norm': 1.0/0.54},
+           'hann': {'func': windows.hann, 'ampl_norm': 1.0/0.5},
+           'blackman': {'func': windows.blackman, 'ampl_norm': 1.0/0.42},
+           'triang': {'func': windows.triang, 'ampl_norm': 1.0/0.5},
+           'flattop': {'func': windows.flattop, 'ampl_norm': 1.0/0.2156},
+           'bartlett': {'func': windows.bartlett, 'ampl_norm': 1.0/0.5},
+           'parzen': {'func': windows.parzen, 'ampl_norm': 1.0/0.375},
+           'bohman': {'func': windows.bohman, 'ampl_norm': 1.0/0.4052847},
+           'blackmanharris': {'func': windows.blackmanharris, 'ampl_norm': 1.0/0.35875},
+           'nuttall': {'func': windows.nuttall, 'ampl_norm': 1.0/0.3635819},
+           'barthann': {'func': windows.barthann, 'ampl_norm': 1.0/0.5}}
     return win
 
 
-def compute_ft(x_val, y_val, zeropad_num=0, window='none', base_corr=True, psd=False):
+_FT_WINDOWS = get_ft_windows()
+
+
+def _make_ft_window(window, length):
+    """ Window array of the given name and length, see get_ft_windows.
+
+    @param str window: name of the window
+    @param int length: number of points
+
+    @return numpy.array: read only window values
+    """
+    window_val = _FT_WINDOWS[window]['func'](length)
+    window_val.setflags(write=False)
+    return window_val
+
+
+# windows by (name, length) in the order of their last use, successive calls of compute_ft mostly
+# use the same ones. They take at most _FT_WINDOW_CACHE_BYTES, the least recently used go first.
+_FT_WINDOW_CACHE_BYTES = 32 * 2**20
+_ft_window_cache = collections.OrderedDict()
+
+
+def _ft_window(window, length):
+    """ Window array of the given name and length from the cache, see _make_ft_window.
+
+    Windows longer than fit in the cache are made on every call. The 'none'
+    window is never needed, compute_ft skips it.
+
+    @param str window: name of the window
+    @param int length: number of points
+
+    @return numpy.array: read only window values
+    """
+    key = (window, length)
+    if key in _ft_window_cache:
+        _ft_window_cache.move_to_end(key)
+        return _ft_window_cache[key]
+    window_val = _make_ft_window(window, length)
+    if window_val.nbytes <= _FT_WINDOW_CACHE_BYTES:
+        _ft_window_cache[key] = window_val
+        cached_bytes = sum(value.nbytes for value in _ft_window_cache.values())
+        while cached_bytes > _FT_WINDOW_CACHE_BYTES:
+            cached_bytes -= _ft_window_cache.popitem(last=False)[1].nbytes
+    return window_val
+
+
+def compute_ft(x_val, y_val, zeropad_num=0, window='none', base_corr=True, psd=False,
+               fast_length=False, workers=None):
     """ Compute the Discrete fourier Transform of the power spectral density
 
     @param numpy.array x_val: 1D array
@@ -85,6 +136,15 @@ def compute_ft(x_val, y_val, zeropad_num=0, window='none', base_corr=True, psd=F
                      the Power Spectral Density (PSD, which is just the FT of
                      the absolute square of the y-values) should be computed.
                      Default is psd=False.
+    @param bool fast_length: optional, zeropad further up to the next length
+                             the FFT handles fastest (a product of small
+                             primes). That interpolates the spectrum on a
+                             slightly finer frequency grid, so the returned
+                             arrays are longer than stated above.
+                             Default is fast_length=False.
+    @param int workers: optional, number of threads of the FFT, see
+                        scipy.fft.rfft. A single series is transformed by
+                        one thread, more only help for batches.
 
     @return: tuple(dft_x, dft_y):
                 be aware that the return arrays' length depend on the zeropad
@@ -113,10 +173,8 @@ def compute_ft(x_val, y_val, zeropad_num=0, window='none', base_corr=True, psd=F
     your signal, i.e. the amplitude and phase of harmonics in your signal.
     """
 
-    avail_windows = get_ft_windows()
-
-    x_val = np.array(x_val)
-    y_val = np.array(y_val)
+    x_val = np.asarray(x_val)
+    y_val = np.asarray(y_val)
 
     # Make a baseline correction to avoid a constant offset near zero
     # frequencies. Offset of the y_val from mean corresponds to half the value
@@ -126,35 +184,38 @@ def compute_ft(x_val, y_val, zeropad_num=0, window='none', base_corr=True, psd=F
         corrected_y = y_val - y_val.mean()
 
     ampl_norm_fact = 1.0
-    # apply window to data to account for spectral leakage:
-    if window in avail_windows:
-        window_val = avail_windows[window]['func'](len(y_val))
+    # apply window to data to account for spectral leakage, 'none' leaves it as it is:
+    if window in _FT_WINDOWS and window != 'none':
+        window_val = _ft_window(window, len(y_val))
         corrected_y = corrected_y * window_val
         # to get the correct amplitude in the amplitude spectrum
-        ampl_norm_fact = avail_windows[window]['ampl_norm']
+        ampl_norm_fact = _FT_WINDOWS[window]['ampl_norm']
 
-    # zeropad for sinc interpolation:
-    zeropad_arr = np.zeros(len(corrected_y)*(zeropad_num+1))
-    zeropad_arr[:len(corrected_y)] = corrected_y
+    # zeropad for sinc interpolation, the FFT pads with zeros up to n:
+    n_fft = len(corrected_y)*(zeropad_num+1)
+    if fast_length:
+        n_fft = scipy.fft.next_fast_len(n_fft, real=True)
 
-    # Get the amplitude values from the fourier transformed y values.
-    fft_y = np.abs(np.fft.fft(zeropad_arr))
+    # Get the amplitude values from the fourier transformed y values. The
+    # input is real, so the negative frequencies are the complex conjugate of
+    # the positive ones and only those are computed.
+    fft_y = np.abs(scipy.fft.rfft(corrected_y, n=n_fft, workers=workers))
 
     # Power spectral density (PSD) or just amplitude spectrum of fourier signal:
     power_value = 1.0
     if psd:
         power_value = 2.0
 
-    # The factor 2 accounts for the fact that just the half of the spectrum was
-    # taken. The ampl_norm_fact is the normalization factor due to the applied
-    # window function (the offset value in the window function):
-    fft_y = ((2/len(y_val)) * fft_y * ampl_norm_fact)**power_value
-
     # Due to the sampling theorem you can only identify frequencies at half
     # of the sample rate, therefore the FT contains an almost symmetric
     # spectrum (the asymmetry results from aliasing effects). Therefore take
     # the half of the values for the display.
-    middle = int((len(zeropad_arr)+1)//2)
+    middle = int((n_fft+1)//2)
+
+    # The factor 2 accounts for the fact that just the half of the spectrum was
+    # taken. The ampl_norm_fact is the normalization factor due to the applied
+    # window function (the offset value in the window function):
+    fft_y = ((2/len(y_val)) * fft_y[:middle] * ampl_norm_fact)**power_value
 
     # sample spacing of x_axis, if x is a time axis than it corresponds to a
     # timestep:
@@ -162,9 +223,172 @@ def compute_ft(x_val, y_val, zeropad_num=0, window='none', base_corr=True, psd=F
 
     # use the helper function of numpy to calculate the x_values for the
     # fourier space. That function will handle an occuring devision by 0:
-    fft_x = np.fft.fftfreq(len(zeropad_arr), d=x_spacing)
+    fft_x = np.fft.rfftfreq(n_fft, d=x_spacing)
+
+    return abs(fft_x[:middle]), fft_y
+
+
+def compute_ft_batch(self, x_val, y_vals, zeropad_num=0, window='none', base_corr=True,
+                     psd=False, fast_length=False, workers=None, max_block_size=2**22):
+    """ Compute the spectra of many series on a shared x axis at once.
+
+    Every row of y_vals is transformed as by compute_ft, with the same
+    keyword arguments, but the baseline correction, windowing, FFT and
+    normalization run on whole blocks of rows. A block holds at most
+    max_block_size padded values (at least one row), so neither a padded copy
+    of all series nor all their complex spectra are in memory at once.
+
+    @param numpy.array x_val: 1D array, shared by all series
+    @param numpy.array y_vals: 2D array of shape (number of series, len(x_val))
+    @param int zeropad_num: optional, see compute_ft
+    @param str window: optional, see compute_ft
+    @param bool base_corr: optional, see compute_ft
+    @param bool psd: optional, see compute_ft
+    @param bool fast_length: optional, see compute_ft
+    @param int workers: optional, number of threads of the FFT, which splits
+                        the rows of a block between them
+    @param int max_block_size: optional, number of padded values transformed
+                               at once
+
+    @return: tuple(dft_x, dft_y, peak_x):
+                dft_x as of compute_ft, dft_y as 2D array with the spectrum of
+                every series in its row, and peak_x with the frequency of the
+                largest spectral value of every series, not counting the zero
+                frequency. peak_x is NaN for series with non-finite values.
+    """
+    x_val = np.asarray(x_val)
+    y_vals = np.asarray(y_vals)
+    if y_vals.ndim != 2 or y_vals.shape[1] != len(x_val):
+        raise ValueError('Expected y_vals of shape (number of series, {0}), got {1}.'.format(
+            len(x_val), y_vals.shape))
+
+    n_series, n_points = y_vals.shape
+    n_fft = n_points*(zeropad_num+1)
+    if fast_length:
+        n_fft = scipy.fft.next_fast_len(n_fft, real=True)
+    middle = int((n_fft+1)//2)
+
+    window_val = None
+    ampl_norm_fact = 1.0
+    if window in _FT_WINDOWS and window != 'none':
+        window_val = _ft_window(window, n_points)
+        ampl_norm_fact = _FT_WINDOWS[window]['ampl_norm']
+
+    power_value = 1.0
+    if psd:
+        power_value = 2.0
 
-    return abs(fft_x[:middle]), fft_y[:middle]
+    x_spacing = np.round(x_val[-1] - x_val[-2], 12)
+    dft_x = abs(np.fft.rfftfreq(n_fft, d=x_spacing)[:middle])
+
+    dft_y = np.empty((n_series, middle))
+    peak_x = np.full(n_series, np.nan)
+    rows = max(1, max_block_size // n_fft)
+    for start in range(0, n_series, rows):
+        block = y_vals[start:start + rows]
+        if base_corr:
+            block = block - block.mean(axis=1, keepdims=True)
+            if window_val is not None:
+                block *= window_val
+        elif window_val is not None:
+            block = block * window_val
+        fft_y = scipy.fft.rfft(block, n=n_fft, axis=1, workers=workers)
+        del block
+
+        # normalized in place as ((2/n_points) * fft_y * ampl_norm_fact)**power_value
+        spectra = dft_y[start:start + rows]
+        np.abs(fft_y[:, :middle], out=spectra)
+        del fft_y
+        spectra *= 2/n_points
+        spectra *= ampl_norm_fact
+        if psd:
+            spectra **= power_value
+
+        if middle > 1:
+            finite = np.isfinite(spectra).all(axis=1)
+            peaks = dft_x[1 + spectra[:, 1:].argmax(axis=1)]
+            peak_x[start:start + rows] = np.where(finite, peaks, np.nan)
+
+    return dft_x, dft_y, peak_x
+
+
+def compute_lomb_scargle(x_val, y_val, oversampling=2, order=6, grid_factor=4):
+    """ Amplitude spectrum of irregularly sampled data by a Lomb-Scargle periodogram.
+
+    At every frequency of the grid, a sine and a cosine are fitted to the
+    data by least squares, which is the Lomb-Scargle periodogram and does not
+    need equidistant x values. The amplitude of the fitted sine is returned,
+    so a sine in the data shows up with about its amplitude as in compute_ft.
+
+    The frequency grid starts at zero, its step is 1/(oversampling * span of
+    x_val) and it ends at half the inverse median spacing of the x values, the
+    counterpart of the Nyquist frequency. With oversampling=2 it resembles the
+    grid of compute_ft with zeropad_num=1.
+
+    The sums over the points are taken with the method of Press and Rybicki
+    (ApJ 338, 277, 1989): every point is spread (extirpolated) onto the
+    neighbouring order points of an equidistant grid by Lagrange weights, and
+    the sums at all frequencies come from FFTs of that grid. The effort grows
+    with the number of points times log of it, the amplitudes agree with the
+    direct sums to about 1e-4 of the highest one.
+
+    @param numpy.array x_val: 1D array, in any order, repeated values allowed
+    @param numpy.array y_val: 1D array of same size as x_val
+    @param float oversampling: optional, frequency steps per inverse span of
+                               the x values
+    @param int order: optional, number of grid points every point is spread on
+    @param int grid_factor: optional, points of the grid per frequency needed
+                            for the sums, more are more accurate
+
+    @return: tuple(ls_x, ls_y): frequencies and amplitudes
+    """
+    x_val = np.asarray(x_val, dtype=float)
+    y_val = np.asarray(y_val, dtype=float)
+    corrected_y = y_val - y_val.mean()
+    n_points = len(x_val)
+
+    span = x_val.max() - x_val.min()
+    spacing = np.median(np.diff(np.sort(x_val)))
+    if not spacing > 0:
+        spacing = span / (n_points - 1)
+    frequency_step = 1 / (oversampling * span)
+    ls_x = frequency_step * np.arange(max(int(0.5 / spacing / frequency_step), 1))
+    n_freq = len(ls_x)
+
+    # the grid spans oversampling times the x values, so its k-th FFT frequency
+    # is the k-th of ls_x, the sums of cos(2 omega t) and sin(2 omega t) need
+    # the frequencies up to twice the highest one
+    n_grid = max(scipy.fft.next_fast_len(2 * grid_factor * n_freq, real=True), 2 * order)
+    position = (x_val - x_val.min()) * n_grid / (oversampling * span)
+    first = np.clip(np.floor(position).astype(int) - (order - 1)//2, 0, n_grid - order)
+    grid_y = np.zeros(n_grid)
+    grid_ones = np.zeros(n_grid)
+    for node in range(order):
+        weight = np.ones(n_points)
+        for other in range(order):
+            if other != node:
+                weight *= (position - first - other) / (node - other)
+        grid_y += np.bincount(first + node, weights=weight*corrected_y, minlength=n_grid)
+        grid_ones += np.bincount(first + node, weights=weight, minlength=n_grid)
+
+    # sum of y*exp(i omega t) and of exp(2i omega t), the FFT has exp(-i omega t)
+    y_sums = np.conj(scipy.fft.rfft(grid_y)[:n_freq])
+    double_sums = np.conj(scipy.fft.rfft(grid_ones)[:2*n_freq:2])
+    cos_cos = (n_points + double_sums.real) / 2
+    sin_sin = (n_points - double_sums.real) / 2
+    sin_cos = double_sums.imag / 2
+    det = cos_cos*sin_sin - sin_cos**2
+
+    # least squares amplitudes of cos and sin, where the two can not be told
+    # apart (the zero frequency or a grid like sampling), the plain Fourier
+    # amplitude is taken instead
+    regular = det > 1e-9 * n_points**2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos_ampl = (sin_sin*y_sums.real - sin_cos*y_sums.imag) / det
+        sin_ampl = (cos_cos*y_sums.imag - sin_cos*y_sums.real) / det
+    ls_y = np.where(regular, np.hypot(cos_ampl, sin_ampl), 2/n_points * np.abs(y_sums))
+
+    return ls_x, ls_y
 
 
 ################################################################################
@@ -215,6 +439,16 @@ def make_baresine_model(self, prefix=None):
 
         return np.sin(2*np.pi*frequency*x+phase)
 
+    def bare_sine_derivatives(x, frequency, phase):
+        """ Bare sine and its partial derivatives after frequency and phase.
+
+        @return tuple: (numpy.array value, dict with the partial derivatives by
+                       parameter name)
+        """
+        argument = 2*np.pi*frequency*x+phase
+        cosine = np.cos(argument)
+        return np.sin(argument), {'frequency': 2*np.pi*x*cosine, 'phase': cosine}
+
     if not isinstance(prefix, str) and prefix is not None:
         self.log.error('The passed prefix <{0}> of type {1} is not a string and'
                        'cannot be used as a prefix and will be ignored for now.'
@@ -222,6 +456,7 @@ def make_baresine_model(self, prefix=None):
         model = Model(bare_sine_function, independent_vars=['x'])
     else:
         model = Model(bare_sine_function, independent_vars=['x'], prefix=prefix)
+    model.derivatives = bare_sine_derivatives
 
     params = model.make_params()
 
@@ -345,6 +580,141 @@ def make_sinestretchedexponentialdecay_model(self, prefix=None):
 
     return model, params
 
+##########################################################
+# Fused sum of sines with optional exponential decay(s)  #
+##########################################################
+
+def _make_fused_sine_model(self, no_of_sines, decay=None, prefix=None):
+    """ Create a model of summed sines with an offset and an optional
+    exponential decay, evaluated in one vectorized pass.
+
+    The parameters are named and ordered exactly like those of the composite
+    model made from make_sinewithoutoffset_model,
+    make_bareexponentialdecay_model and make_constant_model, e.g.
+    s1_amplitude, s1_frequency, s1_phase, ..., beta, lifetime, offset. All
+    sines are evaluated at once into one (no_of_sines, len(x)) array instead
+    of walking the composite tree with its intermediate arrays.
+
+    @param int no_of_sines: number of summed sines
+    @param str decay: optional, None for no decay, 'common' for a single
+                      exponential decay of the sum of sines (parameters beta and
+                      lifetime) or 'individual' for an exponential decay of
+                      every sine (parameters e1_beta, e1_lifetime, ...)
+    @param str prefix: optional, if multiple models should be used in a
+                       composite way and the parameters of each model should be
+                       distinguished from each other to prevent name collisions.
+
+    @return tuple: (object model, object params), for more description see in
+                   the method make_baresine_model.
+    """
+    if prefix is None:
+        add_text = ''
+    else:
+        add_text = prefix
+
+    sine_prefixes = ['{0}{1}_{2}'.format('e' if decay == 'individual' else 's', index + 1,
+                                         add_text) for index in range(no_of_sines)]
+    amplitude_names = [sine_prefix + 'amplitude' for sine_prefix in sine_prefixes]
+    frequency_names = [sine_prefix + 'frequency' for sine_prefix in sine_prefixes]
+    phase_names = [sine_prefix + 'phase' for sine_prefix in sine_prefixes]
+    if decay == 'individual':
+        beta_names = [sine_prefix + 'beta' for sine_prefix in sine_prefixes]
+        lifetime_names = [sine_prefix + 'lifetime' for sine_prefix in sine_prefixes]
+        param_names = [name for names in zip(amplitude_names, frequency_names, phase_names,
+                                             beta_names, lifetime_names) for name in names]
+    else:
+        param_names = [name for names in zip(amplitude_names, frequency_names, phase_names)
+                       for name in names]
+        if decay == 'common':
+            beta_names = [add_text + 'beta']
+            lifetime_names = [add_text + 'lifetime']
+            param_names += beta_names + lifetime_names
+        else:
+            beta_names = lifetime_names = []
+    offset_name = add_text + 'offset'
+    param_names.append(offset_name)
+
+    def evaluate(x, params, derivatives):
+        """ Value of the model and, if requested, its partial derivatives. """
+        amplitudes = np.array([params[name] for name in amplitude_names])
+        frequencies = np.array([params[name] for name in frequency_names])
+        phases = np.array([params[name] for name in phase_names])
+
+        # one row per sine
+        argument = np.multiply.outer(2*np.pi*frequencies, x)
+        argument += phases.reshape(phases.shape + (1,)*np.ndim(x))
+        sines = np.sin(argument)
+        if decay is not None:
+            betas = np.array([params[name] for name in beta_names])
+            lifetimes = np.array([params[name] for name in lifetime_names])
+            scaled = np.multiply.outer(1/lifetimes, x)
+            stretched = np.power(scaled, betas.reshape(betas.shape + (1,)*np.ndim(x)))
+            decays = np.exp(-stretched)
+        if decay == 'individual':
+            sines *= decays
+        value = np.tensordot(amplitudes, sines, axes=1)
+        if decay == 'common':
+            decayed = value * decays[0]
+        else:
+            decayed = value
+        result = decayed + params[offset_name]
+        if not derivatives:
+            return result
+
+        partials = {offset_name: 1.0}
+        cosines = np.cos(argument, out=argument)
+        if decay is not None:
+            cosines *= decays
+            # (x/lifetime)**beta * log(x/lifetime) goes to zero for x -> 0
+            log_scaled = np.log(np.where(scaled > 0, scaled, 1.0))
+            if decay == 'common':
+                decayed_sums = [decayed]
+            else:
+                decayed_sums = sines * amplitudes.reshape(amplitudes.shape + (1,)*np.ndim(x))
+            for index, decayed_sum in enumerate(decayed_sums):
+                partials[beta_names[index]] = -decayed_sum * stretched[index] * log_scaled[index]
+                partials[lifetime_names[index]] = (decayed_sum * stretched[index] * betas[index]
+                                                   / lifetimes[index])
+        for index, amplitude in enumerate(amplitudes):
+            if decay == 'common':
+                partials[amplitude_names[index]] = sines[index] * decays[0]
+            else:
+                partials[amplitude_names[index]] = sines[index]
+            partials[phase_names[index]] = amplitude * cosines[index]
+            partials[frequency_names[index]] = 2*np.pi*x * partials[phase_names[index]]
+        return result, partials
+
+    def fused_sine_function(x, **params):
+        """ Function of the summed sines with offset and optional decay.
+
+        @param numpy.array x: independent variable - e.g. time
+        @param float params: parameters of the model by their names
+
+        @return: numpy.array with the values of the summed sines
+        """
+        return evaluate(x, params, derivatives=False)
+
+    def fused_sine_derivatives(x, **params):
+        """ Summed sines and their partial derivatives.
+
+        @return tuple: (numpy.array value, dict with the partial derivatives by
+                       parameter name)
+        """
+        return evaluate(x, params, derivatives=True)
+
+    # lmfit takes the parameter names from the signature of the model function
+    fused_sine_function.__signature__ = inspect.Signature(
+        [inspect.Parameter('x', inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+        + [inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY) for name in param_names])
+
+    model = Model(fused_sine_function, independent_vars=['x'])
+    model.derivatives = fused_sine_derivatives
+    for name in beta_names:
+        model.set_param_hint(name, value=1, vary=False)
+    params = model.make_params()
+
+    return model, params
+
 ###########################################
 # Sum of two individual Sinus with offset #
 ###########################################
@@ -361,20 +731,7 @@ def make_sinedouble_model(self, prefix=None):
                    the method make_baresine_model.
     """
 
-    if prefix is None:
-        add_text = ''
-    else:
-        add_text = prefix
-
-    sine_model1, params = self.make_sinewithoutoffset_model(prefix='s1_'+add_text)
-    sine_model2, params = self.make_sinewithoutoffset_model(prefix='s2_'+add_text)
-
-    constant_model, params = self.make_constant_model(prefix=prefix)
-
-    two_sine_offset = sine_model1 + sine_model2 + constant_model
-    params = two_sine_offset.make_params()
-
-    return two_sine_offset, params
+    return self._make_fused_sine_model(no_of_sines=2, prefix=prefix)
 
 ################################################################################
 #    Sum of two individual Sinus with offset and single exponential decay      #
@@ -392,21 +749,7 @@ def make_sinedoublewithexpdecay_model(self, prefix=None):
                    the method make_baresine_model.
     """
 
-    if prefix is None:
-        add_text = ''
-    else:
-        add_text = prefix
-
-    sine_model1, params = self.make_sinewithoutoffset_model(prefix='s1_'+add_text)
-    sine_model2, params = self.make_sinewithoutoffset_model(prefix='s2_'+add_text)
-    bare_exp_decay_model, params = self.make_bareexponentialdecay_model(prefix=prefix)
-
-    constant_model, params = self.make_constant_model(prefix=prefix)
-
-    two_sine_exp_decay_offset = (sine_model1 + sine_model2)*bare_exp_decay_model + constant_model
-    params = two_sine_exp_decay_offset.make_params()
-
-    return two_sine_exp_decay_offset, params
+    return self._make_fused_sine_model(no_of_sines=2, decay='common', prefix=prefix)
 
 ###############################################################
 # Sum of two individual Sinus exponential decays (and offset) #
@@ -423,20 +766,8 @@ def make_sinedoublewithtwoexpdecay_model(self, prefix=None):
     @return tuple: (object model, object params), for more description see in
                    the method make_baresine_model.
     """
-    if prefix is None:
-        add_text = ''
-    else:
-        add_text = prefix
-
-    sine_exp_decay_model1, params = self.make_sineexpdecaywithoutoffset_model(prefix='e1_'+add_text)
-    sine_exp_decay_model2, params = self.make_sineexpdecaywithoutoffset_model(prefix='e2_'+add_text)
-
-    constant_model, params = self.make_constant_model(prefix=prefix)
 
-    sinedoublewithtwoexpdecay = sine_exp_decay_model1 + sine_exp_decay_model2 + constant_model
-    params = sinedoublewithtwoexpdecay.make_params()
-
-    return sinedoublewithtwoexpdecay, params
+    return self._make_fused_sine_model(no_of_sines=2, decay='individual', prefix=prefix)
 
 #############################################
 # Sum of three individual Sinus with offset #
@@ -454,21 +785,7 @@ def make_sinetriple_model(self, prefix=None):
                    the method make_baresine_model.
     """
 
-    if prefix is None:
-        add_text = ''
-    else:
-        add_text = prefix
-
-    sine_model1, params = self.make_sinewithoutoffset_model(prefix='s1_'+add_text)
-    sine_model2, params = self.make_sinewithoutoffset_model(prefix='s2_'+add_text)
-    sine_model3, params = self.make_sinewithoutoffset_model(prefix='s3_'+add_text)
-
-    constant_model, params = self.make_constant_model(prefix=prefix)
-
-    three_sine_offset = sine_model1 + sine_model2 + sine_model3 + constant_model
-    params = three_sine_offset.make_params()
-
-    return three_sine_offset, params
+    return self._make_fused_sine_model(no_of_sines=3, prefix=prefix)
 
 ##########################################################################
 # Sum of three individual Sinus with offset and single exponential decay #
@@ -486,23 +803,7 @@ def make_sinetriplewithexpdecay_model(self, prefix=None):
                    the method make_baresine_model.
     """
 
-    if prefix is None:
-        add_text = ''
-    else:
-        add_text = prefix
-
-    sine_model1, params = self.make_sinewithoutoffset_model(prefix='s1_'+add_text)
-    sine_model2, params = self.make_sinewithoutoffset_model(prefix='s2_'+add_text)
-    sine_model3, params = self.make_sinewithoutoffset_model(prefix='s3_'+add_text)
-    bare_exp_decay_model, params = self.make_bareexponentialdecay_model(prefix=prefix)
-
-    constant_model, params = self.make_constant_model(prefix=prefix)
-
-    three_sine_exp_decay_offset = (
-        sine_model1 + sine_model2 + sine_model3) * bare_exp_decay_model + constant_model
-    params = three_sine_exp_decay_offset.make_params()
-
-    return three_sine_exp_decay_offset, params
+    return self._make_fused_sine_model(no_of_sines=3, decay='common', prefix=prefix)
 
 #########################################################################
 # Sum of three individual Sinus with offset and three exponential decay #
@@ -520,21 +821,197 @@ def make_sinetriplewiththreeexpdecay_model(self, prefix=None):
                    the method make_baresine_model.
     """
 
-    if prefix is None:
-        add_text = ''
-    else:
-        add_text = prefix
+    return self._make_fused_sine_model(no_of_sines=3, decay='individual', prefix=prefix)
 
-    sine_exp_decay_model1, params = self.make_sineexpdecaywithoutoffset_model(prefix='e1_'+add_text)
-    sine_exp_decay_model2, params = self.make_sineexpdecaywithoutoffset_model(prefix='e2_'+add_text)
-    sine_exp_decay_model3, params = self.make_sineexpdecaywithoutoffset_model(prefix='e3_'+add_text)
+################################################################################
+#                                                                              #
+#              Variable projection solver for sums of sines                    #
+#                                                                              #
+################################################################################
 
-    constant_model, params = self.make_constant_model(prefix=prefix)
 
-    three_sine_exp_decay_offset = sine_exp_decay_model1 + sine_exp_decay_model2 + sine_exp_decay_model3 + constant_model
-    params = three_sine_exp_decay_offset.make_params()
+def _sine_model_layout(self, params):
+    """ Find the sines, decays and offset of a sine model by its parameter names.
 
-    return three_sine_exp_decay_offset, params
+    Works for all sine models with offset in this file, with or without
+    prefix and with a common or an individual decay per sine.
+
+    @param lmfit.Parameters params: parameters of the model
+
+    @return tuple: (list sines, list decays, str offset), with one
+                   (amplitude, frequency, phase, decay index or None) tuple of
+                   parameter names per sine and one (lifetime, beta) tuple per
+                   decay.
+    """
+    offset_names = [name for name in params if name.endswith('offset')]
+    if len(offset_names) != 1:
+        raise ValueError('Expected exactly one offset parameter, got {0}.'.format(offset_names))
+    offset_name = offset_names[0]
+    add_text = offset_name[:-len('offset')]
+
+    decays = []
+    common_decay = None
+    if add_text + 'lifetime' in params:
+        decays.append((add_text + 'lifetime', add_text + 'beta'))
+        common_decay = 0
+
+    sines = []
+    for name in params:
+        if not name.endswith('amplitude'):
+            continue
+        stem = name[:-len('amplitude')]
+        decay = common_decay
+        if stem != add_text and stem + 'lifetime' in params:
+            decays.append((stem + 'lifetime', stem + 'beta'))
+            decay = len(decays) - 1
+        sines.append((name, stem + 'frequency', stem + 'phase', decay))
+
+    known = {offset_name}
+    known.update(name for sine in sines for name in sine[:3])
+    known.update(name for decay in decays for name in decay)
+    if not sines or set(params) != known:
+        raise ValueError('Parameters {0} do not describe a sum of sines with '
+                         'offset.'.format(list(params)))
+    return sines, decays, offset_name
+
+
+def _fit_sine_variable_projection(self, x_axis, data, params, weights=None):
+    """ Solve a sum of sines with offset as separable least-squares problem.
+
+    Written as a*sin(2*pi*f*x + phi) = b*sin(2*pi*f*x) + c*cos(2*pi*f*x), the
+    amplitudes, phases and the offset enter the model linearly. They are solved
+    exactly with linear least squares for every trial value of the nonlinear
+    parameters (frequencies, lifetimes and varying betas), and only those are
+    optimized with scipy.optimize.least_squares within their bounds. This needs
+    a handful of iterations over a few parameters and hardly depends on the
+    estimated amplitudes and phases.
+
+    @param numpy.array x_axis: 1D axis values
+    @param numpy.array data: 1D data, should have the same dimension as x_axis.
+    @param lmfit.Parameters params: initial parameters, e.g. from the estimator
+    @param numpy.array weights: optional, weights of the residual like in
+                                model.fit
+
+    @return lmfit.Parameters: copy of params with the values of the solution,
+                              mapped back onto the amplitude and phase
+                              parameters of the model.
+    """
+    from scipy.optimize import least_squares
+
+    sines, decays, offset_name = self._sine_model_layout(params)
+    for name in [name for sine in sines for name in sine[:3:2]] + [offset_name]:
+        if not params[name].vary or params[name].expr is not None:
+            raise ValueError('The linear parameter {0} has to vary freely.'.format(name))
+
+    nonlinear_names = [sine[1] for sine in sines]
+    nonlinear_names += [name for decay in decays for name in decay]
+    for name in nonlinear_names:
+        if params[name].expr is not None:
+            raise ValueError('The parameter {0} is constrained by an expression.'.format(name))
+    varying = [name for name in nonlinear_names
+               if params[name].vary and params[name].min < params[name].max]
+    fixed = {name: params[name].value for name in nonlinear_names}
+
+    x_axis = np.asarray(x_axis, dtype=float)
+    target = np.asarray(data, dtype=float)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+        target = target * weights
+    if not (np.all(np.isfinite(x_axis)) and np.all(np.isfinite(target))):
+        raise ValueError('The data contains non-finite values.')
+
+    def basis(values):
+        """ Weighted design matrix of the linear parameters. """
+        current = dict(fixed, **dict(zip(varying, values)))
+        envelopes = [np.exp(-np.power(x_axis / current[lifetime], current[beta]))
+                     for lifetime, beta in decays]
+        columns = []
+        for _, frequency, _, decay in sines:
+            argument = 2*np.pi*current[frequency]*x_axis
+            if decay is None:
+                columns += [np.sin(argument), np.cos(argument)]
+            else:
+                columns += [np.sin(argument)*envelopes[decay], np.cos(argument)*envelopes[decay]]
+        columns.append(np.ones_like(x_axis))
+        design = np.column_stack(columns)
+        if weights is not None:
+            design *= weights[:, np.newaxis]
+        return design
+
+    def linear_solution(values):
+        design = basis(values)
+        coefficients = np.linalg.lstsq(design, target, rcond=None)[0]
+        return design, coefficients
+
+    def projected_residual(values):
+        design = basis(values)
+        if not np.all(np.isfinite(design)):
+            # e.g. a decay with a negative lifetime, rejected as a step without any fit
+            return -target
+        coefficients = np.linalg.lstsq(design, target, rcond=None)[0]
+        return design @ coefficients - target
+
+    start = np.array([np.clip(params[name].value, params[name].min, params[name].max)
+                      for name in varying])
+    if varying:
+        lower = np.array([params[name].min for name in varying])
+        upper = np.array([params[name].max for name in varying])
+        solution = least_squares(projected_residual, start, bounds=(lower, upper),
+                                 x_scale='jac')
+        values = solution.x
+        self.log.debug('Variable projection converged after {0} evaluations: '
+                       '{1}'.format(solution.nfev, solution.message))
+    else:
+        values = start
+    coefficients = linear_solution(values)[1]
+
+    params = params.copy()
+    for name, value in zip(varying, values):
+        params[name].set(value=value)
+    for index, (amplitude_name, _, phase_name, _) in enumerate(sines):
+        sine_coefficient, cosine_coefficient = coefficients[2*index:2*index + 2]
+        amplitude = np.hypot(sine_coefficient, cosine_coefficient)
+        phase = np.arctan2(cosine_coefficient, sine_coefficient)
+        if amplitude > params[amplitude_name].max:
+            amplitude, phase = -amplitude, phase + np.pi
+        # move the phase by full periods into its bounds
+        phase_min, phase_max = params[phase_name].min, params[phase_name].max
+        if phase < phase_min:
+            phase += 2*np.pi*np.ceil((phase_min - phase) / (2*np.pi))
+        elif phase > phase_max:
+            phase -= 2*np.pi*np.ceil((phase - phase_max) / (2*np.pi))
+        params[amplitude_name].set(value=amplitude)
+        params[phase_name].set(value=phase)
+    params[offset_name].set(value=coefficients[-1])
+    return params
+
+
+def _apply_variable_projection(self, x_axis, data, params, kwargs):
+    """ Start a sine fit from the variable projection solution if enabled.
+
+    With use_variable_projection switched on, the parameters are replaced by
+    the solution of _fit_sine_variable_projection. The following model.fit
+    then only polishes it and provides the covariance, the stderr and thereby
+    the result_str_dict of the usual fit. If the problem is not separable,
+    e.g. because an amplitude is fixed or constrained by an expression, the
+    fit starts from the given parameters as before.
+
+    @param numpy.array x_axis: 1D axis values
+    @param numpy.array data: 1D data, should have the same dimension as x_axis.
+    @param lmfit.Parameters params: initial parameters of the fit
+    @param dict kwargs: keyword arguments for model.fit
+
+    @return lmfit.Parameters: initial parameters for model.fit
+    """
+    if not self.use_variable_projection:
+        return params
+    try:
+        return self._fit_sine_variable_projection(x_axis, data, params,
+                                                  weights=kwargs.get('weights'))
+    except (ValueError, np.linalg.LinAlgError) as e:
+        self.log.warning('Variable projection not possible, fitting from the '
+                         'estimated parameters instead: {0}'.format(e))
+        return params
 
 ################################################################################
 #                                                                              #
@@ -543,6 +1020,113 @@ def make_sinetriplewiththreeexpdecay_model(self, prefix=None):
 ################################################################################
 
 
+def _sine_spectrum(self, x_axis, data):
+    """ Amplitude spectrum for the frequency estimate of the sine estimators.
+
+    Equidistant x values (in any order) get the DFT of compute_ft with
+    zeropad_num=1. For irregular sampling the DFT would assume a wrong
+    spacing. If the x values still lie on the grid of their median spacing
+    and miss at most a tenth of it, e.g. after dropping a few missing values,
+    the data is linearly interpolated onto that grid for the DFT. Otherwise
+    the Lomb-Scargle periodogram of compute_lomb_scargle is taken.
+
+    @param numpy.array x_axis: 1D axis values
+    @param numpy.array data: 1D data, same size as x_axis
+
+    @return tuple(dft_x, dft_y, stepsize): frequencies, amplitudes and the
+                                           spacing of the x values, the
+                                           median one for irregular sampling
+    """
+    diffs = np.diff(np.sort(x_axis))
+    spacing = np.median(diffs)
+    if spacing > 0 and np.all(np.abs(diffs - spacing) <= 1e-6 * spacing):
+        dft_x, dft_y = compute_ft(x_axis, data, zeropad_num=1)
+        return dft_x, dft_y, x_axis[1] - x_axis[0]
+    spacing = np.median(diffs[diffs > 0])
+    steps = (x_axis - x_axis.min()) / spacing
+    grid_steps = np.rint(steps)
+    if (np.all(diffs > 0) and np.all(np.abs(steps - grid_steps) <= 1e-6)
+            and len(x_axis) >= 0.9 * (grid_steps.max() + 1)):
+        order = np.argsort(x_axis)
+        grid = x_axis.min() + spacing * np.arange(grid_steps.max() + 1)
+        dft_x, dft_y = compute_ft(grid, np.interp(grid, x_axis[order], data[order]),
+                                  zeropad_num=1)
+        return dft_x, dft_y, spacing
+    dft_x, dft_y = compute_lomb_scargle(x_axis, data)
+    return dft_x, dft_y, spacing
+
+
+def _phase_residual_sums(self, x_axis, data, frequency, amplitude, iter_steps, candidates,
+                         chunk_size=2**20):
+    """ Summed absolute deviation of the data from sines of the candidate phases.
+
+    The sines are evaluated for several phases at once, in chunks of about
+    chunk_size values to bound the memory.
+
+    @param numpy.array x_axis: 1D axis values
+    @param numpy.array data: 1D data, same size as x_axis
+    @param float frequency: frequency of the sines
+    @param float amplitude: amplitude of the sines
+    @param int iter_steps: number of phase steps in one period
+    @param numpy.array candidates: int indices of the phase steps to evaluate
+
+    @return numpy.array: summed absolute residual per candidate
+    """
+    argument = 2*np.pi*frequency*x_axis
+    # sin(argument + phase) = sin(argument)*cos(phase) + cos(argument)*sin(phase)
+    sin_arg = amplitude * np.sin(argument)
+    cos_arg = amplitude * np.cos(argument)
+    phases = candidates/iter_steps*2*np.pi
+    rows = max(1, chunk_size // max(len(x_axis), 1))
+    sum_res = np.empty(len(candidates))
+    for start in range(0, len(candidates), rows):
+        phase = phases[start:start + rows, None]
+        func_val = sin_arg*np.cos(phase) + cos_arg*np.sin(phase)
+        sum_res[start:start + rows] = np.abs(data - func_val).sum(axis=1)
+    return sum_res
+
+
+def _search_phase_step(self, x_axis, data, frequency, amplitude, iter_steps,
+                       max_candidates=64):
+    """ Phase step of the sine that deviates most from the data.
+
+    Create sin waves with different phases and sum up their absolute deviation
+    from the data. The phase where the sine fits worst is half a period away
+    from the best fitting one.
+
+    Up to max_candidates phase steps, all of them are evaluated and the result
+    is the first maximum, as of a loop over the steps. Finer phase grids (low
+    frequencies on densely sampled axes, where iter_steps grows with the number
+    of points) are searched coarse to fine, which relies on the deviation being
+    a smooth function of the phase: every step-th phase is evaluated, then the
+    neighbourhood of the maximum with a finer step, until the step is one.
+    That takes a few times max_candidates evaluations instead of iter_steps.
+
+    @param numpy.array x_axis: 1D axis values
+    @param numpy.array data: 1D data, same size as x_axis
+    @param float frequency: frequency of the sines
+    @param float amplitude: amplitude of the sines
+    @param int iter_steps: number of phase steps in one period
+    @param int max_candidates: optional, phase steps evaluated per round
+
+    @return int: index of the phase step, between 0 and iter_steps - 1
+    """
+    step = -(-iter_steps // max_candidates)
+    candidates = np.arange(0, iter_steps, step)
+    while True:
+        sum_res = self._phase_residual_sums(x_axis, data, frequency, amplitude, iter_steps,
+                                            candidates)
+        best = candidates[sum_res.argmax()]
+        if step == 1:
+            return int(best)
+        # the maximum lies less than one coarse step away from the best candidate
+        reach = step - 1
+        step = -(-(2*reach + 1) // max_candidates)
+        steps_out = -(-reach // step)
+        offsets = step * np.arange(-steps_out, steps_out + 1)
+        candidates = (best + offsets) % iter_steps
+
+
 def estimate_baresine(self, x_axis, data, params):
     """ Bare sine estimator with a frequency and phase.
 
@@ -567,9 +1151,8 @@ def estimate_baresine(self, x_axis, data, params):
 
     # calculate dft with zeropadding to obtain nicer interpolation between the
     # appearing peaks.
-    dft_x, dft_y = compute_ft(x_axis, data, zeropad_num=1)
+    dft_x, dft_y, stepsize = self._sine_spectrum(x_axis, data)
 
-    stepsize = x_axis[1]-x_axis[0]  # for frequency axis
     frequency_max = np.abs(dft_x[np.log(dft_y).argmax()])
 
     # find minimal distance to the next meas point in the corresponding time value>
@@ -580,21 +1163,16 @@ def estimate_baresine(self, x_axis, data, params):
     if iter_steps < 1:
         iter_steps = 1
 
-    sum_res = np.zeros(iter_steps)
-
     # Procedure: Create sin waves with different phases and perform a summation.
     #            The sum shows how well the sine was fitting to the actual data.
     #            The best fitting sine should be a maximum of the summed time
     #            trace.
-
-    for iter_s in range(iter_steps):
-        func_val = np.sin(2*np.pi*frequency_max*x_axis + iter_s/iter_steps *2*np.pi)
-        sum_res[iter_s] = np.abs(data - func_val).sum()
+    phase_step = self._search_phase_step(x_axis, data, frequency_max, 1.0, iter_steps)
 
     # The minimum indicates where the sine function was fittng the worst,
     # therefore subtract pi. This will also ensure that the estimated phase will
     # be in the interval [-pi,pi].
-    phase = sum_res.argmax()/iter_steps *2*np.pi - np.pi
+    phase = phase_step/iter_steps *2*np.pi - np.pi
 
     params['frequency'].set(value=frequency_max, min=0.0, max=1/stepsize*3)
     params['phase'].set(value=phase, min=-np.pi, max=np.pi)
@@ -634,9 +1212,7 @@ def estimate_sinewithoutoffset(self, x_axis, data, params):
 
     # calculate dft with zeropadding to obtain nicer interpolation between the
     # appearing peaks.
-    dft_x, dft_y = compute_ft(x_axis, data, zeropad_num=1)
-
-    stepsize = x_axis[1] - x_axis[0]  # for frequency axis
+    dft_x, dft_y, stepsize = self._sine_spectrum(x_axis, data)
 
     # remove the zero values so that it is still possible to take
     # the logarithm. The logarithm acts as a non linear filter
@@ -677,21 +1253,16 @@ def estimate_sinewithoutoffset(self, x_axis, data, params):
     if iter_steps < 1:
         iter_steps = 1
 
-    sum_res = np.zeros(iter_steps)
-
     # Procedure: Create sin waves with different phases and perform a summation.
     #            The sum shows how well the sine was fitting to the actual data.
     #            The best fitting sine should be a maximum of the summed time
     #            trace.
-
-    for iter_s in range(iter_steps):
-        func_val = ampl_val * np.sin(2*np.pi*frequency_max*x_axis + iter_s/iter_steps*2*np.pi)
-        sum_res[iter_s] = np.abs(data - func_val).sum()
+    phase_step = self._search_phase_step(x_axis, data, frequency_max, ampl_val, iter_steps)
 
     # The minimum indicates where the sine function was fitting the worst,
     # therefore subtract pi. This will also ensure that the estimated phase will
     # be in the interval [-pi,pi].
-    phase = sum_res.argmax()/iter_steps *2*np.pi - np.pi
+    phase = phase_step/iter_steps *2*np.pi - np.pi
 
     # values and bounds of initial parameters
     params['amplitude'].set(value=ampl_val)
@@ -728,19 +1299,28 @@ def make_sine_fit(self, x_axis, data, estimator, units=None, add_params=None, **
                            with best fit with given axis,...
     """
 
-    sine, params = self.make_sine_model()
+    sine, params = self.get_model_template('sine')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = sine.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        result = sine.fit(data, x=x_axis, params=params, **kwargs)
-        self.log.error('The sine fit did not work.\n'
-                       'Error message: {0}\n'.format(result.message))
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    params = self._apply_variable_projection(x_axis, data, params, kwargs)
+    kwargs = self._add_analytic_jacobian(sine, params, kwargs)
+    result = self._fit_model(sine, data, params, 'sine', x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._sine_result_str_dict, units)
+
 
+def _sine_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_sine_fit.
+
+    @param lmfit.model.ModelResult result: result of the sine fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
     if units is None:
         units = ['arb. unit', 'arb. unit']
 
@@ -782,9 +1362,7 @@ def make_sine_fit(self, x_axis, data, estimator, units=None, add_params=None, **
                                              (result.params['offset'].value + result.params['amplitude'].value)**2) *
                                              result.params['amplitude'].stderr))*100,
                                    'unit': '%'}
-
-    result.result_str_dict = result_str_dict
-    return result
+    return result_str_dict
 
 
 def estimate_sine(self, x_axis, data, params):
@@ -837,20 +1415,29 @@ def make_sineexponentialdecay_fit(self, x_axis, data, estimator, units=None, add
                            initial fitting values, best fitting values, data
                            with best fit with given axis,...
     """
-    sine_exp_decay_offset, params = self.make_sineexponentialdecay_model()
+    sine_exp_decay_offset, params = self.get_model_template('sineexponentialdecay')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = sine_exp_decay_offset.fit(data, x=x_axis, params=params, **kwargs)
-    except:
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    params = self._apply_variable_projection(x_axis, data, params, kwargs)
+    kwargs = self._add_analytic_jacobian(sine_exp_decay_offset, params, kwargs)
+    result = self._fit_model(sine_exp_decay_offset, data, params, 'sineexponentialdecay',
+                             x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._sineexponentialdecay_result_str_dict, units)
 
-        result = sine_exp_decay_offset.fit(data, x=x_axis, params=params, **kwargs)
-        self.log.error('The sineexponentialdecayoffset fit did not work.\n'
-                       'Error message: {0}'.format(result.message))
 
+def _sineexponentialdecay_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_sineexponentialdecay_fit.
+
+    @param lmfit.model.ModelResult result: result of the sineexponentialdecay fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
     if units is None:
         units = ['arb. unit', 'arb. unit']
 
@@ -900,9 +1487,7 @@ def make_sineexponentialdecay_fit(self, x_axis, data, estimator, units=None, add
     result_str_dict['Beta'] = {'value': result.params['beta'].value,
                                'error': result.params['beta'].stderr,
                                'unit': ''}
-
-    result.result_str_dict = result_str_dict
-    return result
+    return result_str_dict
 
 
 def estimate_sineexponentialdecay(self, x_axis, data, params=None):
@@ -936,22 +1521,16 @@ def estimate_sineexponentialdecay(self, x_axis, data, params=None):
     # estimate amplitude
     ampl_val = max(np.abs(data_level.min()), np.abs(data_level.max()))
 
-    dft_x, dft_y = compute_ft(x_axis, data_level, zeropad_num=1)
-
-    stepsize = x_axis[1] - x_axis[0]  # for frequency axis
+    dft_x, dft_y, stepsize = self._sine_spectrum(x_axis, data_level)
 
     frequency_max = np.abs(dft_x[dft_y.argmax()])
 
     # remove noise
     a = np.std(dft_y)
-    for i in range(0, len(dft_x)):
-        if dft_y[i] <= a:
-            dft_y[i] = 0
+    dft_y[dft_y <= a] = 0
 
     # calculating the width of the FT peak for the estimation of lifetime
-    s = 0
-    for i in range(0, len(dft_x)):
-        s += dft_y[i]*abs(dft_x[1]-dft_x[0])/max(dft_y)
+    s = np.sum(dft_y*abs(dft_x[1]-dft_x[0])/dft_y.max())
     lifetime_val = 0.5/s
 
     # find minimal distance to the next meas point in the corresponding x value
@@ -962,21 +1541,17 @@ def estimate_sineexponentialdecay(self, x_axis, data, params=None):
     if iter_steps < 1:
         iter_steps = 1
 
-    sum_res = np.zeros(iter_steps)
-
     # Procedure: Create sin waves with different phases and perform a summation.
     #            The sum shows how well the sine was fitting to the actual data.
     #            The best fitting sine should be a maximum of the summed time
     #            trace.
-
-    for iter_s in range(iter_steps):
-        func_val = ampl_val * np.sin(2*np.pi*frequency_max*x_axis + iter_s/iter_steps *2*np.pi)
-        sum_res[iter_s] = np.abs(data_level - func_val).sum()
+    phase_step = self._search_phase_step(x_axis, data_level, frequency_max, ampl_val,
+                                         iter_steps)
 
     # The minimum indicates where the sine function was fittng the worst,
     # therefore subtract pi. This will also ensure that the estimated phase will
     # be in the interval [-pi,pi].
-    phase = (sum_res.argmax()/iter_steps *2*np.pi - np.pi)%(2*np.pi)
+    phase = (phase_step/iter_steps *2*np.pi - np.pi)%(2*np.pi)
 
     # values and bounds of initial parameters
     params['frequency'].set(value=frequency_max,
@@ -987,7 +1562,7 @@ def estimate_sineexponentialdecay(self, x_axis, data, params=None):
     params['offset'].set(value=offset)
 
     params['lifetime'].set(value=lifetime_val,
-                           min=2*(x_axis[1]-x_axis[0]),
+                           min=2*stepsize,
                            max=1/(abs(dft_x[1]-dft_x[0])*0.5))
 
     return error, params
@@ -1013,19 +1588,30 @@ def make_sinestretchedexponentialdecay_fit(self, x_axis, data, estimator, units=
                            initial fitting values, best fitting values, data
                            with best fit with given axis,...
     """
-    sine_stretched_exp_decay, params = self.make_sinestretchedexponentialdecay_model()
+    sine_stretched_exp_decay, params = self.get_model_template('sinestretchedexponentialdecay')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = sine_stretched_exp_decay.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        result = sine_stretched_exp_decay.fit(data, x=x_axis, params=params, **kwargs)
-        self.log.error('The sineexponentialdecay fit did not work.\n'
-                       'Error message: {0}'.format(result.message))
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    params = self._apply_variable_projection(x_axis, data, params, kwargs)
+    kwargs = self._add_analytic_jacobian(sine_stretched_exp_decay, params, kwargs)
+    result = self._fit_model(sine_stretched_exp_decay, data, params,
+                             'sinestretchedexponentialdecay', x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._sinestretchedexponentialdecay_result_str_dict,
+                                   units)
+
 
+def _sinestretchedexponentialdecay_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_sinestretchedexponentialdecay_fit.
+
+    @param lmfit.model.ModelResult result: result of the sinestretchedexponentialdecay fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
     if units is None:
         units = ['arb. unit', 'arb. unit']
 
@@ -1075,9 +1661,7 @@ def make_sinestretchedexponentialdecay_fit(self, x_axis, data, estimator, units=
     result_str_dict['Beta'] = {'value': result.params['beta'].value,
                                'error': result.params['beta'].stderr,
                                'unit': ''}
-
-    result.result_str_dict = result_str_dict
-    return result
+    return result_str_dict
 
 
 def estimate_sinestretchedexponentialdecay(self, x_axis, data, params):
@@ -1122,19 +1706,28 @@ def make_sinedouble_fit(self, x_axis, data, estimator, units=None, add_params=No
                            initial fitting values, best fitting values, data
                            with best fit with given axis,...
     """
-    two_sine_offset, params = self.make_sinedouble_model()
+    two_sine_offset, params = self.get_model_template('sinedouble')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = two_sine_offset.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        self.log.warning('The twosineexpdecayoffset fit did not work. '
-                         'Error message: {}'.format(str(result.message)))
-        result = two_sine_offset.fit(data, x=x_axis, params=params, **kwargs)
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    params = self._apply_variable_projection(x_axis, data, params, kwargs)
+    kwargs = self._add_analytic_jacobian(two_sine_offset, params, kwargs)
+    result = self._fit_model(two_sine_offset, data, params, 'sinedouble', x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._sinedouble_result_str_dict, units)
+
+
+def _sinedouble_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_sinedouble_fit.
+
+    @param lmfit.model.ModelResult result: result of the sinedouble fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
 
+    @return dict: values, errors and units by displayed parameter name
+    """
     if units is None:
         units = ['arb. unit', 'arb. unit']
 
@@ -1211,9 +1804,7 @@ def make_sinedouble_fit(self, x_axis, data, estimator, units=None, add_params=No
     result_str_dict['Offset'] = {'value': result.params['offset'].value,
                                  'error': result.params['offset'].stderr,
                                  'unit': units[1]}
-
-    result.result_str_dict = result_str_dict
-    return result
+    return result_str_dict
 
 
 def estimate_sinedouble(self, x_axis, data, params):
@@ -1237,10 +1828,12 @@ def estimate_sinedouble(self, x_axis, data, params):
     # sine offset fits where for the second the first fit is subtracted to
     # delete the first sine in the data.
 
-    result1 = self.make_sine_fit(x_axis=x_axis, data=data, estimator=self.estimate_sine)
+    result1 = self.make_sine_fit(x_axis=x_axis, data=data, estimator=self.estimate_sine,
+                                 lean=True)
     data_sub = data - result1.best_fit
 
-    result2 = self.make_sine_fit(x_axis=x_axis, data=data_sub, estimator=self.estimate_sine)
+    result2 = self.make_sine_fit(x_axis=x_axis, data=data_sub, estimator=self.estimate_sine,
+                                 lean=True)
 
     # Fill the parameter dict:
     params['s1_amplitude'].set(value=result1.params['amplitude'].value)
@@ -1277,19 +1870,30 @@ def make_sinedoublewithexpdecay_fit(self, x_axis, data, estimator, units=None, a
                            initial fitting values, best fitting values, data
                            with best fit with given axis,...
     """
-    two_sine_exp_decay_offset, params = self.make_sinedoublewithexpdecay_model()
+    two_sine_exp_decay_offset, params = self.get_model_template('sinedoublewithexpdecay')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = two_sine_exp_decay_offset.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        self.log.warning('The sinedoublewithexpdecay fit did not work. '
-                         'Error message: {}'.format(str(result.message)))
-        result = two_sine_exp_decay_offset.fit(data, x=x_axis, params=params, **kwargs)
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    params = self._apply_variable_projection(x_axis, data, params, kwargs)
+    kwargs = self._add_analytic_jacobian(two_sine_exp_decay_offset, params, kwargs)
+    result = self._fit_model(two_sine_exp_decay_offset, data, params, 'sinedoublewithexpdecay',
+                             x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._sinedoublewithexpdecay_result_str_dict,
+                                   units)
+
+
+def _sinedoublewithexpdecay_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_sinedoublewithexpdecay_fit.
+
+    @param lmfit.model.ModelResult result: result of the sinedoublewithexpdecay fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
 
+    @return dict: values, errors and units by displayed parameter name
+    """
     if units is None:
         units = ['arb. unit', 'arb. unit']
 
@@ -1370,9 +1974,7 @@ def make_sinedoublewithexpdecay_fit(self, x_axis, data, estimator, units=None, a
     result_str_dict['Lifetime'] = {'value': result.params['lifetime'].value,
                                    'error': result.params['lifetime'].stderr,
                                    'unit': units[0]}
-
-    result.result_str_dict = result_str_dict
-    return result
+    return result_str_dict
 
 
 def estimate_sinedoublewithexpdecay(self, x_axis, data, params):
@@ -1400,13 +2002,15 @@ def estimate_sinedoublewithexpdecay(self, x_axis, data, params):
     result1 = self.make_sineexponentialdecay_fit(
         x_axis=x_axis,
         data=data,
-        estimator=self.estimate_sineexponentialdecay)
+        estimator=self.estimate_sineexponentialdecay,
+        lean=True)
     data_sub = data - result1.best_fit
 
     result2 = self.make_sineexponentialdecay_fit(
         x_axis=x_axis,
         data=data_sub,
-        estimator=self.estimate_sineexponentialdecay)
+        estimator=self.estimate_sineexponentialdecay,
+        lean=True)
 
     # Fill the parameter dict:
     params['s1_amplitude'].set(value=result1.params['amplitude'].value)
@@ -1447,19 +2051,30 @@ def make_sinedoublewithtwoexpdecay_fit(self, x_axis, data, estimator, units=None
                            initial fitting values, best fitting values, data
                            with best fit with given axis,...
     """
-    two_sine_two_exp_decay_offset, params = self.make_sinedoublewithtwoexpdecay_model()
+    two_sine_two_exp_decay_offset, params = self.get_model_template('sinedoublewithtwoexpdecay')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = two_sine_two_exp_decay_offset.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        self.log.warning('The sinedoublewithtwoexpdecay fit did not work. '
-                         'Error message: {}'.format(str(result.message)))
-        result = two_sine_two_exp_decay_offset.fit(data, x=x_axis, params=params, **kwargs)
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    params = self._apply_variable_projection(x_axis, data, params, kwargs)
+    kwargs = self._add_analytic_jacobian(two_sine_two_exp_decay_offset, params, kwargs)
+    result = self._fit_model(two_sine_two_exp_decay_offset, data, params,
+                             'sinedoublewithtwoexpdecay', x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._sinedoublewithtwoexpdecay_result_str_dict,
+                                   units)
+
+
+def _sinedoublewithtwoexpdecay_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_sinedoublewithtwoexpdecay_fit.
 
+    @param lmfit.model.ModelResult result: result of the sinedoublewithtwoexpdecay fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
     if units is None:
         units = ['arb. unit', 'arb. unit']
 
@@ -1544,9 +2159,7 @@ def make_sinedoublewithtwoexpdecay_fit(self, x_axis, data, estimator, units=None
     result_str_dict['Offset'] = {'value': result.params['offset'].value,
                                  'error': result.params['offset'].stderr,
                                  'unit': units[1]}
-
-    result.result_str_dict = result_str_dict
-    return result
+    return result_str_dict
 
 
 def estimate_sinedoublewithtwoexpdecay(self, x_axis, data, params):
@@ -1574,13 +2187,15 @@ def estimate_sinedoublewithtwoexpdecay(self, x_axis, data, params):
     result1 = self.make_sineexponentialdecay_fit(
         x_axis=x_axis,
         data=data,
-        estimator=self.estimate_sineexponentialdecay)
+        estimator=self.estimate_sineexponentialdecay,
+        lean=True)
     data_sub = data - result1.best_fit
 
     result2 = self.make_sineexponentialdecay_fit(
         x_axis=x_axis,
         data=data_sub,
-        estimator=self.estimate_sineexponentialdecay)
+        estimator=self.estimate_sineexponentialdecay,
+        lean=True)
 
     # Fill the parameter dict:
     params['e1_amplitude'].set(value=result1.params['amplitude'].value)
@@ -1620,19 +2235,28 @@ def make_sinetriple_fit(self, x_axis, data, estimator, units=None, add_params=No
                            initial fitting values, best fitting values, data
                            with best fit with given axis,...
     """
-    two_sine_offset, params = self.make_sinetriple_model()
+    two_sine_offset, params = self.get_model_template('sinetriple')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = two_sine_offset.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        self.log.warning('The threesineexpdecayoffset fit did not work. '
-                         'Error message: {}'.format(str(result.message)))
-        result = two_sine_offset.fit(data, x=x_axis, params=params, **kwargs)
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    params = self._apply_variable_projection(x_axis, data, params, kwargs)
+    kwargs = self._add_analytic_jacobian(two_sine_offset, params, kwargs)
+    result = self._fit_model(two_sine_offset, data, params, 'sinetriple', x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._sinetriple_result_str_dict, units)
+
 
+def _sinetriple_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_sinetriple_fit.
+
+    @param lmfit.model.ModelResult result: result of the sinetriple fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
     if units is None:
         units = ['arb. unit', 'arb. unit']
 
@@ -1743,9 +2367,7 @@ def make_sinetriple_fit(self, x_axis, data, estimator, units=None, add_params=No
     result_str_dict['Offset'] = {'value': result.params['offset'].value,
                                  'error': result.params['offset'].stderr,
                                  'unit': units[1]}
-
-    result.result_str_dict = result_str_dict
-    return result
+    return result_str_dict
 
 
 def estimate_sinetriple(self, x_axis, data, params):
@@ -1769,13 +2391,16 @@ def estimate_sinetriple(self, x_axis, data, params):
     # sine offset fits where for the next fit the previous is subtracted to
     # delete its contribution in the data.
 
-    res1 = self.make_sine_fit(x_axis=x_axis, data=data, estimator=self.estimate_sine)
+    res1 = self.make_sine_fit(x_axis=x_axis, data=data, estimator=self.estimate_sine,
+                              lean=True)
     data_sub1 = data - res1.best_fit
 
-    res2 = self.make_sine_fit(x_axis=x_axis, data=data_sub1, estimator=self.estimate_sine)
+    res2 = self.make_sine_fit(x_axis=x_axis, data=data_sub1, estimator=self.estimate_sine,
+                              lean=True)
     data_sub2 = data_sub1 - res2.best_fit
 
-    res3 = self.make_sine_fit(x_axis=x_axis, data=data_sub2, estimator=self.estimate_sine)
+    res3 = self.make_sine_fit(x_axis=x_axis, data=data_sub2, estimator=self.estimate_sine,
+                              lean=True)
 
     # Fill the parameter dict:
     params['s1_amplitude'].set(value=res1.params['amplitude'].value)
@@ -1816,18 +2441,29 @@ def make_sinetriplewithexpdecay_fit(self, x_axis, data, estimator, units=None, a
                            initial fitting values, best fitting values, data
                            with best fit with given axis,...
     """
-    three_sine_exp_decay_offset, params = self.make_sinetriplewithexpdecay_model()
+    three_sine_exp_decay_offset, params = self.get_model_template('sinetriplewithexpdecay')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params, update_params=add_params)
-    try:
-        result = three_sine_exp_decay_offset.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        self.log.warning('The sinetriplewithexpdecay fit did not work. '
-                         'Error message: {}'.format(str(result.message)))
-        result = three_sine_exp_decay_offset.fit(data, x=x_axis, params=params, **kwargs)
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    params = self._apply_variable_projection(x_axis, data, params, kwargs)
+    kwargs = self._add_analytic_jacobian(three_sine_exp_decay_offset, params, kwargs)
+    result = self._fit_model(three_sine_exp_decay_offset, data, params, 'sinetriplewithexpdecay',
+                             x=x_axis, **kwargs)
+
+    return self._finish_fit_result(result, lean, self._sinetriplewithexpdecay_result_str_dict,
+                                   units)
 
+
+def _sinetriplewithexpdecay_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_sinetriplewithexpdecay_fit.
+
+    @param lmfit.model.ModelResult result: result of the sinetriplewithexpdecay fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
     if units is None:
         units = ['arb. unit', 'arb. unit']
 
@@ -1942,9 +2578,7 @@ def make_sinetriplewithexpdecay_fit(self, x_axis, data, estimator, units=None, a
     result_str_dict['Offset'] = {'value': result.params['offset'].value,
                                  'error': result.params['offset'].stderr,
                                  'unit': units[1]}
-
-    result.result_str_dict = result_str_dict
-    return result
+    return result_str_dict
 
 
 def estimate_sinetriplewithexpdecay(self, x_axis, data, params):
@@ -1972,21 +2606,24 @@ def estimate_sinetriplewithexpdecay(self, x_axis, data, params):
     res1 = self.make_sineexponentialdecay_fit(
         x_axis=x_axis,
         data=data,
-        estimator=self.estimate_sineexponentialdecay)
+        estimator=self.estimate_sineexponentialdecay,
+        lean=True)
 
     data_sub1 = data - res1.best_fit
 
     res2 = self.make_sineexponentialdecay_fit(
         x_axis=x_axis,
         data=data_sub1,
-        estimator=self.estimate_sineexponentialdecay)
+        estimator=self.estimate_sineexponentialdecay,
+        lean=True)
 
     data_sub2 = data_sub1 - res2.best_fit
 
     res3 = self.make_sineexponentialdecay_fit(
         x_axis=x_axis,
         data=data_sub2,
-        estimator=self.estimate_sineexponentialdecay)
+        estimator=self.estimate_sineexponentialdecay,
+        lean=True)
 
     # Fill the parameter dict:
     params['s1_amplitude'].set(value=res1.params['amplitude'].value)
@@ -2030,19 +2667,30 @@ def make_sinetriplewiththreeexpdecay_fit(self, x_axis, data, estimator, units=No
                            initial fitting values, best fitting values, data
                            with best fit with given axis,...
     """
-    three_sine_three_exp_decay_offset, params = self.make_sinetriplewiththreeexpdecay_model()
+    three_sine_three_exp_decay_offset, params = self.get_model_template('sinetriplewiththreeexpdecay')
 
     error, params = estimator(x_axis, data, params)
 
     params = self._substitute_params(initial_params=params,
                                      update_params=add_params)
-    try:
-        result = three_sine_three_exp_decay_offset.fit(data, x=x_axis, params=params, **kwargs)
-    except:
-        self.log.warning('The twosinetwoexpdecayoffset fit did not work. '
-                         'Error message: {}'.format(str(result.message)))
-        result = three_sine_three_exp_decay_offset.fit(data, x=x_axis, params=params, **kwargs)
+    lean, kwargs = self._lean_fit_kwargs(kwargs)
+    params = self._apply_variable_projection(x_axis, data, params, kwargs)
+    kwargs = self._add_analytic_jacobian(three_sine_three_exp_decay_offset, params, kwargs)
+    result = self._fit_model(three_sine_three_exp_decay_offset, data, params,
+                             'sinetriplewiththreeexpdecay', x=x_axis, **kwargs)
 
+    return self._finish_fit_result(result, lean, self._sinetriplewiththreeexpdecay_result_str_dict,
+                                   units)
+
+
+def _sinetriplewiththreeexpdecay_result_str_dict(self, result, units=None):
+    """ Human-readable parameters of a result of make_sinetriplewiththreeexpdecay_fit.
+
+    @param lmfit.model.ModelResult result: result of the sinetriplewiththreeexpdecay fit
+    @param list units: List containing the ['horizontal', 'vertical'] units as strings
+
+    @return dict: values, errors and units by displayed parameter name
+    """
     if units is None:
         units = ['arb. unit', 'arb. unit']
 
@@ -2165,9 +2813,7 @@ def make_sinetriplewiththreeexpdecay_fit(self, x_axis, data, estimator, units=No
     result_str_dict['Offset'] = {'value': result.params['offset'].value,
                                  'error': result.params['offset'].stderr,
                                  'unit': units[1]}
-
-    result.result_str_dict = result_str_dict
-    return result
+    return result_str_dict
 
 
 def estimate_sinetriplewiththreeexpdecay(self, x_axis, data, params):
@@ -2195,19 +2841,22 @@ def estimate_sinetriplewiththreeexpdecay(self, x_axis, data, params):
     res1 = self.make_sineexponentialdecay_fit(
         x_axis=x_axis,
         data=data,
-        estimator=self.estimate_sineexponentialdecay)
+        estimator=self.estimate_sineexponentialdecay,
+        lean=True)
     data_sub1 = data - res1.best_fit
 
     res2 = self.make_sineexponentialdecay_fit(
         x_axis=x_axis,
         data=data_sub1,
-        estimator=self.estimate_sineexponentialdecay)
+        estimator=self.estimate_sineexponentialdecay,
+        lean=True)
     data_sub2 = data_sub1 - res2.best_fit
 
     res3 = self.make_sineexponentialdecay_fit(
         x_axis=x_axis,
         data=data_sub2,
-        estimator=self.estimate_sineexponentialdecay)
+        estimator=self.estimate_sineexponentialdecay,
+        lean=True)
 
     # Fill the parameter dict:
     params['e1_amplitude'].set(value=res1.params['amplitude'].value)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from lmfit import Parameters
+
+# State of one starting point, the (value, min, max, vary, expr) of every parameter
+StartState = Dict[str, Tuple[float, float, float, bool, str | None]]
+
+
+def _state(params: Parameters, values: Dict[str, float] | None = None) -> StartState:
+    """ The state of all parameters, optionally with other values for those without expression. """
+    values = values or {}
+    state = {}
+    for name, param in params.items():
+        value = param.value
+        if param.expr is None:
+            value = float(np.clip(values.get(name, value), param.min, param.max))
+        state[name] = (value, param.min, param.max, param.vary, param.expr)
+    return state
+
+
+def state_params(state: StartState) -> Parameters:
+    """ Parameters holding a start state, e.g. to warm start a fit from it. """
+    params = Parameters()
+    for name, (value, min_, max_, vary, expr) in state.items():
+        if expr is None:
+            params.add(name, value=value, min=min_, max=max_, vary=vary)
+    for name, (value, min_, max_, vary, expr) in state.items():
+        if expr is not None:
+            params.add(name, min=min_, max=max_, expr=expr)
+    return params
+
+
+def perturb_values(params: Parameters, rng: np.random.Generator, spread: float,
+                   x_range: float) -> Dict[str, float]:
+    """
+    Random values around the given ones for the varying parameters, chosen by the parameter name:
+    phases anywhere within (-pi, pi), centers shifted by up to spread times the x range, offsets
+    kept and every other parameter scaled by a log-normal factor of width spread.
+    """
+    values = {}
+    for name, param in params.items():
+        if not param.vary or param.expr is not None:
+            continue
+        if name.endswith("phase"):
+            values[name] = rng.uniform(-np.pi, np.pi)
+        elif name.endswith("center"):
+            values[name] = param.value + rng.normal(0, spread * x_range)
+        elif name.endswith("offset"):
+            values[name] = param.value
+        else:
+            values[name] = param.value * np.exp(rng.normal(0, spread))
+    return values
+
+
+def _component_names(params: Parameters, suffix: str) -> List[str]:
+    return [name for name in params if name.endswith(suffix) and params[name].vary
+            and params[name].expr is None]
+
+
+def spectral_values(params: Parameters, x: np.ndarray, y: np.ndarray, rng: np.random.Generator,
+                    candidates: int) -> Dict[str, float]:
+    """
+    Values for the frequencies (or centers) of a multi-component model taken from the strongest
+    peaks of the spectrum (or of the data itself), one random combination of distinct peaks per
+    call. Returns an empty dict if the model has neither or too few peaks are found.
+    """
+    from scipy import signal
+
+    frequency_names = _component_names(params, "frequency")
+    center_names = _component_names(params, "center")
+    if frequency_names:
+        names = frequency_names
+        step = np.median(np.diff(x))
+        spectrum = np.abs(np.fft.rfft(y - np.mean(y)))
+        frequencies = np.fft.rfftfreq(len(y), d=step)
+        peaks = signal.find_peaks(spectrum)[0]
+        peaks = peaks[np.argsort(spectrum[peaks])[::-1]]
+        positions = frequencies[peaks]
+    elif center_names:
+        names = center_names
+        deviation = np.abs(y - np.median(y))
+        peaks, properties = signal.find_peaks(deviation, prominence=0)
+        peaks = peaks[np.argsort(properties["prominences"])[::-1]]
+        positions = x[peaks]
+    else:
+        return {}
+
+    positions = positions[:max(candidates, len(names))]
+    if len(positions) < len(names):
+        return {}
+    chosen = np.sort(rng.choice(positions, size=len(names), replace=False))
+    return dict(zip(names, chosen))
+
+
+def start_states(params: Parameters, x: np.ndarray, y: np.ndarray, starts: int,
+                 rng: np.random.Generator, spread: float = 0.1) -> List[StartState]:
+    """
+    Starting points for a multi-start fit: the estimated parameters first, then alternately
+    peak-based ones (see spectral_values, with the other parameters perturbed) and perturbed
+    ones (see perturb_values) around the estimate.
+    """
+    x_range = float(np.ptp(x)) if len(x) else 1.0
+    states = [_state(params)]
+    candidates = 2 * max(len(_component_names(params, "frequency")),
+                         len(_component_names(params, "center")), 1)
+    for index in range(1, starts):
+        values = perturb_values(params, rng, spread, x_range)
+        if index % 2:
+            values.update(spectral_values(params, x, y, rng, candidates))
+        states.append(_state(params, values))
+    return states
+
+
+def unique_solutions(order: Sequence[int], best_fits: Sequence[np.ndarray],
+                     tolerance: float) -> List[int]:
+    """
+    Indices of the distinct solutions, in the given order (e.g. by chisqr). Two solutions are the
+    same if their fitted curves differ by at most tolerance anywhere, which also catches the
+    permuted components and shifted phases that describe the same curve.
+    """
+    unique = []
+    for index in order:
+        if all(np.max(np.abs(best_fits[index] - best_fits[other])) > tolerance
+               for other in unique):
+            unique.append(index)
+    return unique
@@ -19,12 +19,18 @@ Copyright (c) the Qudi Developers. See the COPYRIGHT.txt file at the
 top-level directory of this distribution and at <https://github.com/Ulm-IQO/qudi/>
 """
 
+import copy
+import hashlib
 import importlib
 import inspect
+import json
 import logging
 import os
+import re
 import sys
-from collections import OrderedDict
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import Mapping
 from distutils.version import LooseVersion
 
 import lmfit
@@ -33,6 +39,375 @@ import numpy as np
 logging.basicConfig(format='%(name)s :: %(levelname)s :: %(message)s', level=logging.INFO)
 
 
+_FITMETHODS_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'fitmethods')
+
+# Generated manifest of the fit, model and estimator functions, see _load_fit_manifest. It must
+# not live in a fitmethods directory, writing it would change the stamps of that directory.
+_FIT_MANIFEST_FILE = os.path.join(os.path.dirname(_FITMETHODS_PATH), 'fit_manifest.json')
+_FIT_MANIFEST_VERSION = 1
+
+# The fit registry is built once per process and shared by all FitLogic instances. It is keyed
+# by the list of import paths and rebuilt if the fitmethods files in them change.
+_fit_registries = dict()
+_fit_registry_lock = threading.RLock()
+
+# Models built by the make_*_model methods, see FitLogic.get_model_template
+_model_templates = dict()
+
+# Size and modification time of every fitmethods module when it was imported, and the names of
+# the methods attached to FitLogic from them, see _load_fit_module
+_fit_module_stamps = dict()
+_attached_fit_methods = set()
+
+# top level function definitions in a fitmethods file
+_FIT_METHOD_DEF = re.compile(r'^def\s+(\w+)\s*\(', re.MULTILINE)
+
+
+def _fit_methods_files(path_list):
+    """ List the fitmethods files found in the given directories.
+
+    @param list path_list: directories containing fitmethods files
+
+    @return list: [path, sorted file names] for every path
+    """
+    files = []
+    for path in path_list:
+        with os.scandir(path) as entries:
+            filenames = sorted(entry.name for entry in entries
+                               if entry.name.endswith('.py') and entry.is_file())
+        files.append([path, filenames])
+    return files
+
+
+def _fit_methods_stamps(files):
+    """ Collect modification times and sizes of the fitmethods files and their directories.
+
+    Adding or removing a file changes the modification time of its directory, so the directories
+    themselves never need to be listed to find out whether anything changed.
+
+    @param list files: [path, file names] as returned by _fit_methods_files
+
+    @return list: [path, directory mtime, [[file name, size, mtime], ...]] for every path or
+                  None if one of the files does not exist any more
+    """
+    stamps = []
+    try:
+        for path, filenames in files:
+            file_stamps = []
+            for f in filenames:
+                stat = os.stat(os.path.join(path, f))
+                file_stamps.append([f, stat.st_size, stat.st_mtime_ns])
+            stamps.append([path, os.stat(path).st_mtime_ns, file_stamps])
+    except OSError:
+        return None
+    return stamps
+
+
+def _fit_methods_unchanged(stamps):
+    """ Check whether the fitmethods files still match the given stamps.
+
+    @param list stamps: stamps as returned by _fit_methods_stamps
+
+    @return bool: True if no file was edited, added or removed since
+    """
+    files = [[path, [f[0] for f in file_stamps]] for path, _, file_stamps in stamps]
+    return _fit_methods_stamps(files) == stamps
+
+
+def _fit_methods_hash(files):
+    """ Hash the sources of the fitmethods files.
+
+    @param list files: [path, file names] as returned by _fit_methods_files
+
+    @return str: hex digest over the file names and contents
+    """
+    digest = hashlib.sha256()
+    for path, filenames in files:
+        for f in filenames:
+            digest.update(f.encode('utf-8') + b'\0')
+            with open(os.path.join(path, f), 'rb') as source_file:
+                digest.update(source_file.read())
+            digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _generate_fit_manifest(files, log):
+    """ Find all functions in the fitmethods files and sort them into fits, models and estimators.
+
+    The files are only scanned for top level function definitions, not imported. A fitmethods
+    module is imported the first time one of its functions is requested, see _load_fit_module.
+
+    @param list files: [path, file names] as returned by _fit_methods_files
+    @param logging.Logger log: logger for problems with the fit methods
+
+    @return dict: manifest entry with the keys
+                    'methods': dict method name -> name of the module providing it
+                    'fit_list': OrderedDict dimension -> fit name -> OrderedDict with
+                                'make_fit', 'make_model' and the estimator names pointing to
+                                'module:method' strings
+    """
+    fit_list = OrderedDict()
+    fit_list['1d'] = OrderedDict()
+    fit_list['2d'] = OrderedDict()
+    fit_list['3d'] = OrderedDict()
+
+    # Go through the fitmethods files and collect all methods.
+    # Also determine which methods need to be added to the fit_list dictionary
+    methods = OrderedDict()
+    estimators_for_dict = list()
+    models_for_dict = list()
+    fits_for_dict = list()
+
+    for path, filenames in files:
+        for f in filenames:
+            try:
+                with open(os.path.join(path, f), encoding='utf-8') as source_file:
+                    source = source_file.read()
+            except (OSError, UnicodeDecodeError):
+                log.error('Fit methods file "{0}" could not be read.'.format(f))
+                continue
+            for method_str in _FIT_METHOD_DEF.findall(source):
+                # like setattr on import, a later definition of the same name wins
+                methods[method_str] = f[:-3]
+
+    for method_str in methods:
+        # append method to a list of methods to include in the fit_list dictionary
+        if method_str.startswith('make_') and method_str.endswith('_fit'):
+            fits_for_dict.append(method_str.split('_', 1)[1].rsplit('_', 1)[0])
+        elif method_str.startswith('make_') and method_str.endswith('_model'):
+            models_for_dict.append(method_str.split('_', 1)[1].rsplit('_', 1)[0])
+        elif method_str.startswith('estimate_'):
+            estimators_for_dict.append(method_str.split('_', 1)[1])
+
+    def reference(method_str):
+        return '{0}:{1}'.format(methods[method_str], method_str)
+
+    fits_for_dict.sort()
+    models_for_dict.sort()
+    estimators_for_dict.sort()
+    # Now attach the fit, model and estimator methods to the proper dictionary fields
+    for fit_name in fits_for_dict:
+        # Determine fit dimension
+        if 'twoD' in fit_name:
+            dimension = '2d'
+        elif 'threeD' in fit_name:
+            dimension = '3d'
+        else:
+            dimension = '1d'
+
+        # Attach make_*_fit method to fit_list
+        if fit_name not in fit_list[dimension]:
+            fit_list[dimension][fit_name] = OrderedDict()
+        fit_list[dimension][fit_name]['make_fit'] = reference('make_' + fit_name + '_fit')
+
+        # Attach make_*_model method to fit_list
+        if fit_name in models_for_dict:
+            fit_list[dimension][fit_name]['make_model'] = reference('make_' + fit_name + '_model')
+        else:
+            log.error('No make_*_model method for fit "{0}" found in FitLogic.'
+                      ''.format(fit_name))
+
+        # Attach all estimate_* methods to corresponding fit method in fit_list
+        found_estimator = False
+        for estimator_name in estimators_for_dict:
+            estimator_method = 'estimate_' + estimator_name
+            if fit_name == estimator_name:
+                fit_list[dimension][fit_name]['generic'] = reference(estimator_method)
+                found_estimator = True
+            elif estimator_name.startswith(fit_name + '_'):
+                custom_name = estimator_name.split('_', 1)[1]
+                fit_list[dimension][fit_name][custom_name] = reference(estimator_method)
+                found_estimator = True
+        if not found_estimator:
+            log.error('No estimator method for fit "{0}" found in FitLogic.'
+                      ''.format(fit_name))
+
+    return {'methods': methods, 'fit_list': fit_list}
+
+
+def _read_fit_manifest():
+    """ Read the manifest file.
+
+    @return dict: import path list key -> manifest entry, empty if there is no usable file
+    """
+    try:
+        with open(_FIT_MANIFEST_FILE, encoding='utf-8') as manifest_file:
+            manifest = json.load(manifest_file, object_pairs_hook=OrderedDict)
+    except (OSError, ValueError):
+        return dict()
+    if not isinstance(manifest, dict) or manifest.get('version') != _FIT_MANIFEST_VERSION:
+        return dict()
+    return manifest.get('entries', dict())
+
+
+def _write_fit_manifest(entries, log):
+    """ Write the manifest file. A read only installation just keeps the manifest in memory.
+
+    @param dict entries: import path list key -> manifest entry
+    @param logging.Logger log: logger for problems writing the file
+    """
+    manifest = {'version': _FIT_MANIFEST_VERSION, 'entries': entries}
+    tmp_file = '{0}.{1}.tmp'.format(_FIT_MANIFEST_FILE, os.getpid())
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, indent=1)
+        os.replace(tmp_file, _FIT_MANIFEST_FILE)
+    except OSError as err:
+        log.debug('Fit manifest "{0}" could not be written: {1}'.format(_FIT_MANIFEST_FILE, err))
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+
+
+def _load_fit_manifest(path_list, log):
+    """ Return the manifest entry for the given import paths, regenerating it if needed.
+
+    The entry is keyed by a hash of the fitmethods sources. If the stored modification times and
+    sizes still match, the sources are not even read. Otherwise the hash is compared and only if
+    the sources really changed they are scanned again and the manifest file is rewritten.
+
+    @param list path_list: directories containing fitmethods files
+    @param logging.Logger log: logger for problems with the fit methods
+
+    @return dict: manifest entry with the keys 'source_hash', 'stamps', 'methods' and
+                  'fit_list', see _generate_fit_manifest
+    """
+    key = os.pathsep.join(path_list)
+    entries = _read_fit_manifest()
+    entry = entries.get(key)
+    if entry is not None and _fit_methods_unchanged(entry['stamps']):
+        return entry
+
+    files = _fit_methods_files(path_list)
+    source_hash = _fit_methods_hash(files)
+    if entry is None or entry['source_hash'] != source_hash:
+        entry = _generate_fit_manifest(files, log)
+    entry['source_hash'] = source_hash
+    entry['stamps'] = _fit_methods_stamps(files)
+    entries[key] = entry
+    _write_fit_manifest(entries, log)
+    return entry
+
+
+def _load_fit_module(registry, module_name, log):
+    """ Import a fitmethods module and attach its functions to FitLogic.
+
+    @param dict registry: registry as returned by _get_fit_registry
+    @param str module_name: name of the fitmethods module to import
+    @param logging.Logger log: logger for import problems
+    """
+    if module_name in registry['loaded']:
+        return
+    with _fit_registry_lock:
+        if module_name in registry['loaded']:
+            return
+        stamp = _fit_module_stamp(registry, module_name)
+        mod = sys.modules.get(module_name)
+        if mod is None:
+            mod = importlib.import_module(module_name)
+        elif _fit_module_stamps.get(module_name) != stamp:
+            # edited since it was imported, or imported elsewhere without a known stamp
+            mod = importlib.reload(mod)
+        _fit_module_stamps[module_name] = stamp
+        for method, owner in registry['methods'].items():
+            if owner != module_name:
+                continue
+            ref = getattr(mod, method, None)
+            if callable(ref) and (inspect.ismethod(ref) or inspect.isfunction(ref)):
+                # import methods in Fitlogic
+                setattr(FitLogic, method, ref)
+                _attached_fit_methods.add(method)
+            else:
+                log.error('Method "{0}" could not be imported to FitLogic.'.format(method))
+        registry['loaded'].add(module_name)
+
+
+def _fit_module_stamp(registry, module_name):
+    """ Size and modification time of the file of a fitmethods module in the registry stamps.
+
+    @param dict registry: registry as returned by _get_fit_registry
+    @param str module_name: name of the fitmethods module
+
+    @return list: [path, size, mtime] of the module file, None if it is not in the stamps
+    """
+    for path, _, file_stamps in registry['stamps'] or []:
+        for f, size, mtime in file_stamps:
+            if f == module_name + '.py':
+                return [path, size, mtime]
+    return None
+
+
+def _detach_fit_methods():
+    """ Remove the methods attached by _load_fit_module from FitLogic.
+
+    Every registry loads its modules again on first use, those whose files changed are reloaded.
+    Must be called with _fit_registry_lock held.
+    """
+    for method in _attached_fit_methods:
+        if method in FitLogic.__dict__:
+            delattr(FitLogic, method)
+    _attached_fit_methods.clear()
+    for registry in _fit_registries.values():
+        registry['loaded'].clear()
+
+
+class _FitMethodTable(Mapping):
+    """ Read only view of the make_fit/make_model/estimator entries of one fit.
+
+    The entries are stored as 'module:method' strings and bound on access, so that the
+    fitmethods module providing them is only imported once the fit is actually used.
+    """
+
+    __slots__ = ('_owner', '_references')
+
+    def __init__(self, owner, references):
+        self._owner = owner
+        self._references = references
+
+    def __getitem__(self, key):
+        return getattr(self._owner, self._references[key].rpartition(':')[2])
+
+    def __iter__(self):
+        return iter(self._references)
+
+    def __len__(self):
+        return len(self._references)
+
+    def __repr__(self):
+        return '{0}({1})'.format(type(self).__name__, dict(self._references))
+
+
+def _get_fit_registry(path_list, log):
+    """ Return the process wide fit registry for the given import paths, loading it if needed.
+
+    @param list path_list: directories containing fitmethods files
+    @param logging.Logger log: logger for problems with the fit methods
+
+    @return dict: registry with the keys of the manifest entry, see _load_fit_manifest, and
+                  'loaded': set of the module names already imported into FitLogic
+    """
+    key = tuple(path_list)
+    registry = _fit_registries.get(key)
+    if registry is not None and _fit_methods_unchanged(registry['stamps']):
+        return registry
+
+    with _fit_registry_lock:
+        # another thread might have loaded it while we were waiting for the lock
+        registry = _fit_registries.get(key)
+        if registry is not None and _fit_methods_unchanged(registry['stamps']):
+            return registry
+        registry = dict(_load_fit_manifest(path_list, log))
+        for path in path_list:
+            if path not in sys.path:
+                sys.path.append(path)
+        # the methods attached from the old registry may be gone or come from edited files
+        _detach_fit_methods()
+        registry['loaded'] = set()
+        _fit_registries[key] = registry
+    return registry
+
+
 class FitLogic:
     """
     Documentation to add a new fit model/estimator/function can be found in
@@ -49,16 +424,70 @@ class FitLogic:
     # Optional additional paths to import from
     _additional_methods_import_path = False
 
+    # Pass the analytic Jacobian of models built from differentiable building blocks to leastsq,
+    # see make_model_jacobian in generalmethods
+    use_analytic_jacobian = True
+
+    # Solve unconstrained linear fits in closed form instead of with leastsq, see make_linear_fit
+    use_closed_form_linear_fit = True
+
+    # Start the sum-of-sines fits from the separable least-squares solution, in which amplitudes,
+    # phases and offset are solved exactly, see _fit_sine_variable_projection in sinemethods
+    use_variable_projection = False
+
+    # What a make_*_fit method does when model.fit raises, see _fit_model in generalmethods:
+    # 'fallback' fits once more with fallback_fit_kwargs, 'error' returns an error result at once
+    fit_failure_policy = 'fallback'
+    fallback_fit_kwargs = {'method': 'least_squares', 'nan_policy': 'omit'}
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        # locking for thread safety
-
-        filenames = []
-        # for path in directories:
-        path_list = [os.path.join(os.path.dirname(os.path.realpath(__file__)), 'fitmethods')]
-        # adding additional path, to be defined in the config
         self.log = logging.getLogger(__name__)
 
+        # Number of fits that raised, by (fit name, 'fallback' or 'error'), see _fit_model
+        self.fit_failures = Counter()
+
+        # The fit methods are collected once per process, see _get_fit_registry. The fitmethods
+        # modules themselves are only imported when one of their methods is first used.
+        self._fit_registry = _get_fit_registry(self._fit_method_paths(), self.log)
+
+        # A dictionary containing all fit methods and their estimators.
+        self.fit_list = OrderedDict()
+        for dimension, dim_fits in self._fit_registry['fit_list'].items():
+            self.fit_list[dimension] = OrderedDict()
+            for fit_name, method_names in dim_fits.items():
+                self.fit_list[dimension][fit_name] = _FitMethodTable(self, method_names)
+
+        # self.log.info('Methods were included to FitLogic, but only if naming is right: check the'
+        #               ' doxygen documentation if you added a new method and it does not show.')
+
+    def __getattr__(self, name):
+        """ Import the fitmethods module providing a method that is not loaded yet.
+
+            @param str name: attribute name
+
+            @return: the requested method, bound to this instance
+        """
+        registry = self.__dict__.get('_fit_registry')
+        if registry is None or name.startswith('__'):
+            raise AttributeError('{0!r} object has no attribute {1!r}'.format(
+                type(self).__name__, name))
+        module_name = registry['methods'].get(name)
+        if module_name is None or module_name in registry['loaded']:
+            raise AttributeError('{0!r} object has no attribute {1!r}'.format(
+                type(self).__name__, name))
+        _load_fit_module(registry, module_name, self.log)
+        return object.__getattribute__(self, name)
+
+    def _fit_method_paths(self):
+        """ Collect the directories from which fit methods are imported.
+
+            @return list(str): fitmethods directory of this package plus the valid entries of
+                               _additional_methods_import_path
+        """
+        path_list = [_FITMETHODS_PATH]
+
+        # adding additional path, to be defined in the config
         if self._additional_methods_import_path:
             if isinstance(self._additional_methods_import_path, str):
                 self._additional_methods_import_path = [self._additional_methods_import_path]
@@ -75,91 +504,49 @@ class FitLogic:
             else:
                 self.log.error('ConfigOption additional_predefined_methods_path needs to either be a string or '
                                'a list of strings.')
+        return path_list
 
-        for path in path_list:
-            for f in os.listdir(path):
-                if os.path.isfile(os.path.join(path, f)) and f.endswith('.py'):
-                    filenames.append(f[:-3])
-                    if path not in sys.path:
-                        sys.path.append(path)
+    @classmethod
+    def reload_fit_methods(cls):
+        """ Drop the process wide fit registry.
 
-        # A dictionary containing all fit methods and their estimators.
-        self.fit_list = OrderedDict()
-        self.fit_list['1d'] = OrderedDict()
-        self.fit_list['2d'] = OrderedDict()
-        self.fit_list['3d'] = OrderedDict()
-
-        # Go through the fitmethods files and import all methods.
-        # Also determine which methods need to be added to the fit_list dictionary
-        estimators_for_dict = list()
-        models_for_dict = list()
-        fits_for_dict = list()
-
-        for files in filenames:
-            mod = importlib.import_module('{0}'.format(files))
-            for method in dir(mod):
-                ref = getattr(mod, method)
-                if callable(ref) and (inspect.ismethod(ref) or inspect.isfunction(ref)):
-                    method_str = str(method)
-                    try:
-                        # import methods in Fitlogic
-                        setattr(FitLogic, method, ref)
-                        # append method to a list of methods to include in the fit_list dictionary
-                        if method_str.startswith('make_') and method_str.endswith('_fit'):
-                            fits_for_dict.append(method_str.split('_', 1)[1].rsplit('_', 1)[0])
-                        elif method_str.startswith('make_') and method_str.endswith('_model'):
-                            models_for_dict.append(method_str.split('_', 1)[1].rsplit('_', 1)[0])
-                        elif method_str.startswith('estimate_'):
-                            estimators_for_dict.append(method_str.split('_', 1)[1])
-                    except:
-                        self.log.error('Method "{0}" could not be imported to FitLogic.'
-                                       ''.format(str(method)))
-
-        fits_for_dict.sort()
-        models_for_dict.sort()
-        estimators_for_dict.sort()
-        # Now attach the fit, model and estimator methods to the proper dictionary fields
-        for fit_name in fits_for_dict:
-            fit_method = 'make_' + fit_name + '_fit'
-            model_method = 'make_' + fit_name + '_model'
-
-            # Determine fit dimension
-            if 'twoD' in fit_name:
-                dimension = '2d'
-            elif 'threeD' in fit_name:
-                dimension = '3d'
-            else:
-                dimension = '1d'
+        The next FitLogic instance will load the fit manifest again and the fitmethods modules
+        are imported again on first use, reloaded if their files changed. Edited, added or
+        removed fitmethods files are detected automatically when a FitLogic is created, so this
+        is rarely needed.
+        """
+        with _fit_registry_lock:
+            _detach_fit_methods()
+            _fit_registries.clear()
+            _model_templates.clear()
 
-            # Attach make_*_fit method to fit_list
-            if fit_name not in self.fit_list[dimension]:
-                self.fit_list[dimension][fit_name] = OrderedDict()
-            self.fit_list[dimension][fit_name]['make_fit'] = getattr(self, fit_method)
+    def get_model_template(self, fit_name, prefix=None, no_of_functions=None):
+        """ Return the cached model of a fit together with a fresh copy of its parameters.
 
-            # Attach make_*_model method to fit_list
-            if fit_name in models_for_dict:
-                self.fit_list[dimension][fit_name]['make_model'] = getattr(self, model_method)
-            else:
-                self.log.error('No make_*_model method for fit "{0}" found in FitLogic.'
-                               ''.format(fit_name))
-
-            # Attach all estimate_* methods to corresponding fit method in fit_list
-            found_estimator = False
-            for estimator_name in estimators_for_dict:
-                estimator_method = 'estimate_' + estimator_name
-                if fit_name == estimator_name:
-                    self.fit_list[dimension][fit_name]['generic'] = getattr(self, estimator_method)
-                    found_estimator = True
-                elif estimator_name.startswith(fit_name + '_'):
-                    custom_name = estimator_name.split('_', 1)[1]
-                    self.fit_list[dimension][fit_name][custom_name] = getattr(self, estimator_method)
-                    found_estimator = True
-            if not found_estimator:
-                self.log.error('No estimator method for fit "{0}" found in FitLogic.'
-                               ''.format(fit_name))
+        Every model is only built once per process for each combination of fit name, prefix and
+        number of functions. The returned model is shared and must not be changed, e.g. with
+        set_param_hint, while the parameters belong to the caller.
 
-        # self.log.info('Methods were included to FitLogic, but only if naming is right: check the'
-        #               ' doxygen documentation if you added a new method and it does not show.')
+        @param str fit_name: name of the model, i.e. the part between make_ and _model
+        @param str prefix: optional, prefix passed to the make_*_model method
+        @param int no_of_functions: optional, number of functions passed to the
+                                    make_*_model method
+
+        @return tuple (lmfit.Model, lmfit.Parameters): model and a copy of its parameters
+        """
+        make_model = getattr(self, 'make_{0}_model'.format(fit_name))
+        key = (fit_name, prefix, no_of_functions, make_model.__func__)
+        template = _model_templates.get(key)
+        if template is None:
+            kwargs = dict()
+            if prefix is not None:
+                kwargs['prefix'] = prefix
+            if no_of_functions is not None:
+                kwargs['no_of_functions'] = no_of_functions
+            template = make_model(**kwargs)
+            _model_templates[key] = template
+        model, params = template
+        return model, copy.deepcopy(params)
 
     def on_activate(self):
         """ Initialisation performed during activation of the module.
@@ -213,7 +600,7 @@ class FitLogic:
                         par = lmfit.parameter.Parameters()
                         par.loads(fit['parameters'])
                     except KeyError:
-                        model, par = self.fit_list[dim][fname]['make_model']()
+                        model, par = self.get_model_template(fname)
                     new_fit['parameters'] = par
                     user_fits[dim][name] = new_fit
                 except KeyError:
@@ -288,6 +675,10 @@ class FitContainer():
         self.current_fit = 'No Fit'
         self.current_fit_param = lmfit.parameter.Parameters()
         self.current_fit_result = None
+        # x data of the current fit and its fit curve, which is evaluated on first access, see
+        # get_fit_curve
+        self._current_x_data = None
+        self._current_fit_curve = None
         self.use_settings = None
         self.units = ['independent variable {0}'.format(i + 1) for i in range(self.dim)]
         self.units.append('dependent variable')
@@ -324,6 +715,8 @@ class FitContainer():
         """
         self.current_fit_param = lmfit.parameter.Parameters()
         self.current_fit_result = None
+        self._current_x_data = None
+        self._current_fit_curve = None
 
     def set_fit_functions(self, fit_functions):
         """ Set the configured fit functions for this container.
@@ -356,7 +749,7 @@ class FitContainer():
         self.clear_result()
         return self.current_fit, self.use_settings
 
-    def do_fit(self, x_data, y_data):
+    def do_fit(self, x_data, y_data, curve=True, fit_x=None):
         """Performs the chosen fit on the measured data.
         @param array x_data: optional, 1D np.array or 1D list with the x values.
                              If None is passed then the module x values are
@@ -365,6 +758,13 @@ class FitContainer():
                              If None is passed then the module y values are
                              taken. If passed, then it should have the same size
                              as x_data.
+        @param bool curve: optional, if False the fit curve is not evaluated and
+                           None is returned for fit_x and fit_y. It can still be
+                           evaluated later with get_fit_curve.
+        @param array fit_x: optional, x values to evaluate the fit curve on
+                            instead of fit_granularity_fact times as many points
+                            as x_data spanning them, e.g. np.arange(0, 200) to
+                            extrapolate.
 
         @return: tuple (fit_x, fit_y, str_dict, fit_result)
             np.array fit_x: 1D array containing the x values of the fit
@@ -384,11 +784,6 @@ class FitContainer():
         """
         self.clear_result()
 
-        fit_x = np.linspace(
-            start=x_data[0],
-            stop=x_data[-1],
-            num=int(len(x_data) * self.fit_granularity_fact))
-
         # set the keyword arguments, which will be passed to the fit.
         kwargs = {
             'x_axis': x_data,
@@ -403,10 +798,7 @@ class FitContainer():
                 estimator=self.fit_list[self.current_fit]['estimator'],
                 **kwargs)
 
-        elif self.current_fit == 'No Fit':
-            fit_y = np.zeros(fit_x.shape)
-
-        else:
+        elif self.current_fit != 'No Fit':
             self.fit_logic.log.warning(
                 'The Fit Function "{0}" is not implemented to be used in the ODMR Logic. '
                 'Correct that! Fit Call will be skipped and Fit Function will be set to '
@@ -414,14 +806,53 @@ class FitContainer():
 
             self.current_fit = 'No Fit'
 
-        if self.current_fit != 'No Fit':
-            # after the fit was performed, retrieve the fitting function and
-            # evaluate the fitted parameters according to the function:
-            model, params = self.fit_list[self.current_fit]['make_model']()
-            fit_y = model.eval(x=fit_x, params=result.params)
-
         if result is not None:
             self.current_fit_param = result.params
             self.current_fit_result = result
+        self._current_x_data = x_data
 
+        if not curve:
+            return None, None, result
+        fit_x, fit_y = self.get_fit_curve(fit_x)
         return fit_x, fit_y, result
+
+    def get_fit_curve(self, fit_x=None):
+        """ Evaluate the fitted model of the last do_fit call on a grid.
+
+        The curve on the default grid, fit_granularity_fact times as many points
+        as the x data spanning them, is evaluated on first access and kept until
+        the next fit.
+
+        @param array fit_x: optional, x values to evaluate the fit curve on
+                            instead of the default grid
+
+        @return: tuple (fit_x, fit_y)
+            np.array fit_x: 1D array containing the x values of the fit
+            np.array fit_y: 1D array containing the y values of the fit, zeros
+                            for 'No Fit'
+        """
+        if self._current_x_data is None:
+            raise ValueError('No fit was performed in {0}.'.format(self.name))
+
+        default_grid = fit_x is None
+        if default_grid:
+            if self._current_fit_curve is not None:
+                return self._current_fit_curve
+            x_data = self._current_x_data
+            fit_x = np.linspace(
+                start=x_data[0],
+                stop=x_data[-1],
+                num=int(len(x_data) * self.fit_granularity_fact))
+        else:
+            fit_x = np.asarray(fit_x)
+
+        if self.current_fit_result is None:
+            fit_y = np.zeros(fit_x.shape)
+        else:
+            # evaluate the fitted parameters with the model the fit was done with
+            fit_y = self.current_fit_result.model.eval(x=fit_x,
+                                                       params=self.current_fit_result.params)
+
+        if default_grid:
+            self._current_fit_curve = (fit_x, fit_y)
+        return fit_x, fit_y
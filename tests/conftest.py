@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from market_analytics.analysis_logic import AnalysisLogic  # noqa: E402
+
+
+@pytest.fixture
+def analysis():
+    return AnalysisLogic()
@@ -0,0 +1,119 @@
+"""
+The double dip search as it was before, with loops which walk the data point by point and restart
+for every lowered threshold, and random series to compare the searches on. Used by
+tests/test_double_dip.py and benchmarks/bench_double_dip.py.
+"""
+
+import numpy as np
+
+
+def loop_search_end_of_dip(direction, data, peak_arg, start_arg, end_arg, sigma_threshold,
+                           minimal_threshold):
+    """ End of a dip as searched before, point by point and from the start for every threshold. """
+    absolute_min = data[peak_arg]
+    mult = -1 if direction == 'left' else 1
+    sigma_arg = start_arg if direction == 'left' else end_arg
+    if peak_arg == sigma_arg:
+        return sigma_threshold, peak_arg
+    ii = 0
+    while True:
+        if ((peak_arg - ii < start_arg and direction == 'left') or
+                (peak_arg + ii > end_arg and direction == 'right')):
+            sigma_threshold *= 0.9
+            ii = 0
+        if abs(sigma_threshold/absolute_min) < abs(minimal_threshold):
+            break
+        if abs(data[peak_arg + mult*ii]) < abs(sigma_threshold):
+            sigma_arg = peak_arg + mult*ii
+            break
+        ii += 1
+    return sigma_threshold, sigma_arg
+
+
+def loop_search_double_dip(data, threshold_fraction=0.3, minimal_threshold=0.01,
+                           sigma_threshold_fraction=0.3):
+    """ Error code and the seven indices of the double dip search as it was before. """
+    error = 0
+    absolute_min = data.min()
+    dip0_arg = data.argmin()
+    threshold = threshold_fraction*absolute_min
+    last = len(data) - 1
+
+    def end_of_dip(direction, peak_arg):
+        return loop_search_end_of_dip(direction, data, peak_arg, 0, last,
+                                      sigma_threshold_fraction*absolute_min,
+                                      minimal_threshold)[1]
+
+    sigma0_argleft = end_of_dip('left', dip0_arg)
+    sigma0_argright = end_of_dip('right', dip0_arg)
+    if sigma0_argleft == 0:
+        if sigma0_argright == last:
+            dip1_arg = dip0_arg
+        else:
+            dip1_arg = data[sigma0_argright:last].argmin() + sigma0_argright
+    elif sigma0_argright == last:
+        dip1_arg = data[0:sigma0_argleft].argmin()
+    else:
+        while True:
+            # the search areas are sliced and reduced again for every threshold
+            left_min = data[0:sigma0_argleft].min()
+            left_argmin = data[0:sigma0_argleft].argmin()
+            right_min = data[sigma0_argright:last].min()
+            right_argmin = data[sigma0_argright:last].argmin()
+            if abs(left_min) > abs(threshold) and abs(left_min) > abs(right_min):
+                dip1_arg = left_argmin
+                break
+            elif abs(right_min) > abs(threshold):
+                dip1_arg = right_argmin + sigma0_argright
+                break
+            threshold *= 0.9
+            if abs(threshold/absolute_min) < abs(minimal_threshold):
+                error = -1
+                dip1_arg = dip0_arg
+                break
+
+    if dip1_arg in (sigma0_argleft, sigma0_argright):
+        distance_left = abs(dip0_arg - sigma0_argleft)
+        distance_right = abs(dip0_arg - sigma0_argright)
+        sigma1_argleft = sigma0_argleft
+        sigma1_argright = sigma0_argright
+        if distance_left > distance_right:
+            dip1_arg = dip0_arg - abs(distance_left - distance_right)
+        elif distance_left < distance_right:
+            dip1_arg = dip0_arg + abs(distance_left - distance_right)
+        else:
+            dip1_arg = dip0_arg
+    else:
+        sigma1_argleft = end_of_dip('left', dip1_arg)
+        sigma1_argright = end_of_dip('right', dip1_arg)
+    return error, sigma0_argleft, dip0_arg, sigma0_argright, sigma1_argleft, dip1_arg, \
+        sigma1_argright
+
+
+def lorentzian(x, center, width):
+    return 1 / (1 + ((x - center) / width)**2)
+
+
+def random_series(rng):
+    """ Offset leveled data of a random mix of dips, ramp, noise and rounding, with a minimum below
+    zero, else the original search never ends. """
+    y = np.zeros(1)
+    while y.min() >= 0:
+        x, y = random_mix(rng)
+    return x, y
+
+
+def random_mix(rng):
+    """ Random mix of dips, ramp, noise and rounding. """
+    points = int(rng.integers(3, 600))
+    x = np.linspace(0, 1, points)
+    y = np.zeros(points)
+    for _ in range(rng.integers(0, 4)):
+        center = rng.choice([0, 1, rng.uniform(0, 1)])
+        y -= rng.uniform(0.1, 2) * lorentzian(x, center, rng.uniform(0.002, 0.3))
+    if rng.random() < 0.4:
+        y -= rng.uniform(-1, 1) * (x if rng.random() < 0.5 else 1 - x)
+    y += rng.normal(0, rng.choice([0, 0.01, 0.1, 0.5]), points)
+    if rng.random() < 0.3:
+        y = np.round(y * rng.integers(1, 5)) / 4
+    return x, y
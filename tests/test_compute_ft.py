@@ -0,0 +1,37 @@
+import sys
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def sinemethods(analysis):
+    # loads sinemethods, compute_ft and its window cache are module level
+    analysis.make_sine_model()
+    module = sys.modules['sinemethods']
+    module._ft_window_cache.clear()
+    yield module
+    module._ft_window_cache.clear()
+
+
+def test_window_cache_is_bounded_by_bytes(sinemethods, monkeypatch):
+    monkeypatch.setattr(sinemethods, '_FT_WINDOW_CACHE_BYTES', 8 * 4000)
+    x = np.arange(2000.)
+    for length in (1000, 1500, 2000):
+        sinemethods.compute_ft(x[:length], np.sin(x[:length]), window='hann')
+        cached = sinemethods._ft_window_cache
+        assert sum(window.nbytes for window in cached.values()) <= 8 * 4000
+    # the 1000 points window made room for the 2000 points one, the 1500 points one was kept
+    assert list(sinemethods._ft_window_cache) == [('hann', 1500), ('hann', 2000)]
+
+    sinemethods.compute_ft(np.arange(5000.), np.ones(5000), window='hann')
+    assert ('hann', 5000) not in sinemethods._ft_window_cache
+
+
+def test_none_window_is_not_cached(sinemethods):
+    x = np.linspace(0, 10, 500)
+    y = np.sin(2 * np.pi * x)
+    dft_x, dft_y = sinemethods.compute_ft(x, y, window='none')
+    assert not sinemethods._ft_window_cache
+    # the 'none' window leaves the data as it is, like an unknown window name
+    assert np.array_equal(dft_y, sinemethods.compute_ft(x, y, window=None)[1])
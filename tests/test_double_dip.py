@@ -0,0 +1,42 @@
+"""
+The double dip search against the loops it replaced, see double_dip_loops. Both must give the same
+indices and thresholds.
+"""
+
+import numpy as np
+import pytest
+
+from tests.double_dip_loops import (loop_search_double_dip, loop_search_end_of_dip, lorentzian,
+                                    random_series)
+
+
+@pytest.fixture
+def quiet_analysis(analysis):
+    # the searches which find no second dip log a warning
+    analysis.log.setLevel('CRITICAL')
+    return analysis
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_search_double_dip_matches_loops(quiet_analysis, seed):
+    rng = np.random.default_rng(seed)
+    # a random peak_arg may have a value of zero, both searches divide by it
+    with np.errstate(divide='ignore'):
+        for _ in range(100):
+            x, y = random_series(rng)
+            assert tuple(quiet_analysis._search_double_dip(x, y)) == \
+                tuple(loop_search_double_dip(y))
+            peak_arg = int(rng.integers(0, y.size))
+            for direction in ('left', 'right'):
+                arguments = (direction, y, peak_arg, 0, y.size - 1, 0.3 * y.min(), 0.01)
+                assert quiet_analysis._search_end_of_dip(*arguments, False) == \
+                    loop_search_end_of_dip(*arguments)
+
+
+@pytest.mark.parametrize('ramp', [0, 0.6])
+def test_search_double_dip_matches_loops_on_two_dips(quiet_analysis, ramp):
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 1, 20000)
+    y = (-lorentzian(x, 0.35, 0.01) - 0.6 * lorentzian(x, 0.6, 0.02) - ramp * x
+         + rng.normal(0, 0.01, x.size))
+    assert tuple(quiet_analysis._search_double_dip(x, y)) == tuple(loop_search_double_dip(y))
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from market_analytics.fit_cache import FitResultCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = FitResultCache(str(tmp_path / "fits.sqlite"))
+    yield cache
+    cache.close()
+
+
+def test_key_changes_with_every_part_of_the_fit_description(cache):
+    x = np.linspace(0, 1, 10)
+    y = x ** 2
+    base = dict(dims="1d", fit_kwargs={"max_nfev": 100}, source_hash="abc",
+                settings={"use_analytic_jacobian": True, "fit_failure_policy": "fallback"})
+    key = cache.key(x, y, "sine", "generic", **base)
+    assert cache.key(x, y, "sine", "generic", **base) == key
+
+    changed = [
+        dict(base, dims="2d"),
+        dict(base, fit_kwargs={"max_nfev": 200}),
+        dict(base, fit_kwargs={"max_nfev": 100, "method": "least_squares"}),
+        dict(base, fit_kwargs={"max_nfev": 100, "weights": np.ones(10)}),
+        dict(base, source_hash="abd"),
+        dict(base, settings={"use_analytic_jacobian": False, "fit_failure_policy": "fallback"}),
+        dict(base, settings={"use_analytic_jacobian": True, "fit_failure_policy": "error"}),
+    ]
+    keys = {cache.key(x, y, "sine", "generic", **kwargs) for kwargs in changed}
+    assert key not in keys
+    assert len(keys) == len(changed)
+    weights = dict(base, fit_kwargs={"max_nfev": 100, "weights": 2 * np.ones(10)})
+    assert cache.key(x, y, "sine", "generic", **weights) not in keys
+
+
+def test_changed_setting_misses_the_cache(analysis, tmp_path):
+    x = np.linspace(0, 10, 200)
+    y = 2 * np.exp(-x / 3) + np.random.default_rng(0).normal(0, 0.01, x.size)
+    cache = analysis.enable_fit_cache(str(tmp_path / "fits.sqlite"))
+    try:
+        analysis.perform_fit(x, y, "decayexponential", curve=False)
+        analysis.perform_fit(x, y, "decayexponential", curve=False)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        analysis.use_analytic_jacobian = False
+        _, _, result = analysis.perform_fit(x, y, "decayexponential", curve=False)
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert not getattr(result, "from_cache", False)
+    finally:
+        analysis.disable_fit_cache()
+
+
+def test_hit_keeps_warm_start_and_fallback(analysis, tmp_path):
+    x = np.linspace(0, 10, 200)
+    y = 2 * np.exp(-x / 3) + np.random.default_rng(0).normal(0, 0.01, x.size)
+    # a NaN value makes model.fit raise, the fallback omits it
+    y[50] = np.nan
+    cache = analysis.enable_fit_cache(str(tmp_path / "fits.sqlite"))
+    try:
+        _, _, fitted = analysis.perform_fit(x, y, "decayexponential", curve=False)
+        _, _, cached = analysis.perform_fit(x, y, "decayexponential", curve=False)
+        assert cache.hits == 1 and cached.from_cache
+        assert fitted.fallback and cached.fallback
+        assert cached.warm_start is False
+    finally:
+        analysis.disable_fit_cache()
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def container(analysis):
+    container = analysis.make_fit_container('test', '1d')
+    fits = analysis.validate_load_fits(
+        {'1d': {'Line': {'fit_function': 'linear', 'estimator': 'generic'}}})['1d']
+    # no parameters set by the user
+    fits['Line']['use_settings'] = {}
+    container.set_fit_functions(fits)
+    container.set_current_fit('Line')
+    return container
+
+
+def test_do_fit_without_curve_evaluates_it_on_first_access(container, monkeypatch):
+    x = np.linspace(0, 10, 50)
+    fit_x, fit_y, result = container.do_fit(x, 2 * x + 1, curve=False)
+    assert fit_x is None and fit_y is None
+    assert result.params['slope'].value == pytest.approx(2)
+
+    evaluations = []
+    eval_model = result.model.eval
+
+    def counting_eval(*args, **kwargs):
+        evaluations.append(1)
+        return eval_model(*args, **kwargs)
+
+    monkeypatch.setattr(result.model, 'eval', counting_eval)
+    fit_x, fit_y = container.get_fit_curve()
+    assert len(fit_x) == 500
+    np.testing.assert_allclose(fit_y, 2 * fit_x + 1)
+    assert container.get_fit_curve()[1] is fit_y
+    assert len(evaluations) == 1
+
+
+def test_do_fit_evaluates_the_curve_on_a_given_grid(container):
+    x = np.linspace(0, 10, 50)
+    fit_x, fit_y, _ = container.do_fit(x, 2 * x + 1, fit_x=np.arange(0, 200))
+    np.testing.assert_array_equal(fit_x, np.arange(0, 200))
+    np.testing.assert_allclose(fit_y, 2 * fit_x + 1)
@@ -0,0 +1,42 @@
+import os
+import sys
+
+from market_analytics import qudi_fit_logic
+from market_analytics.qudi_fit_logic import FitLogic
+
+METHODS = '''
+def reloadcheck_answer(self):
+    return {answer}
+'''
+NEW_METHOD = '''
+def reloadcheck_added(self):
+    return "added"
+'''
+
+
+def test_edited_fit_methods_file_is_reloaded(tmp_path, monkeypatch):
+    methods_path = tmp_path / "methods"
+    methods_path.mkdir()
+    module_file = methods_path / "reloadcheckmethods.py"
+    module_file.write_text(METHODS.format(answer=1))
+    monkeypatch.setattr(qudi_fit_logic, "_FIT_MANIFEST_FILE", str(tmp_path / "manifest.json"))
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    monkeypatch.delitem(sys.modules, "reloadcheckmethods", raising=False)
+
+    class ReloadCheckLogic(FitLogic):
+        _additional_methods_import_path = str(methods_path)
+
+    try:
+        assert ReloadCheckLogic().reloadcheck_answer() == 1
+
+        module_file.write_text(METHODS.format(answer=2) + NEW_METHOD)
+        # make sure the stamps differ even on file systems with a coarse mtime
+        stat = os.stat(module_file)
+        os.utime(module_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        logic = ReloadCheckLogic()
+        assert logic.reloadcheck_answer() == 2
+        assert logic.reloadcheck_added() == "added"
+    finally:
+        FitLogic.reload_fit_methods()
+        sys.modules.pop("reloadcheckmethods", None)
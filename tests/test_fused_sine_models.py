@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+FUSED_MODELS = ['sinedouble', 'sinetriple', 'sinedoublewithexpdecay', 'sinetriplewithexpdecay',
+                'sinedoublewithtwoexpdecay', 'sinetriplewiththreeexpdecay']
+
+
+def composite_model(analysis, name):
+    """ The model as composed from its building blocks before the fused implementation. """
+    no_of_sines = 2 if name.startswith('sinedouble') else 3
+    if name.endswith(('twoexpdecay', 'threeexpdecay')):
+        model = analysis.make_sineexpdecaywithoutoffset_model(prefix='e1_')[0]
+        for index in range(2, no_of_sines + 1):
+            model = model + analysis.make_sineexpdecaywithoutoffset_model(
+                prefix='e{0}_'.format(index))[0]
+    else:
+        model = analysis.make_sinewithoutoffset_model(prefix='s1_')[0]
+        for index in range(2, no_of_sines + 1):
+            model = model + analysis.make_sinewithoutoffset_model(
+                prefix='s{0}_'.format(index))[0]
+        if name.endswith('withexpdecay'):
+            model = model * analysis.make_bareexponentialdecay_model()[0]
+    return model + analysis.make_constant_model()[0]
+
+
+def random_params(params, rng):
+    """ Random values for all parameters, including the otherwise fixed beta. """
+    params = params.copy()
+    for name, param in params.items():
+        if name.endswith('frequency'):
+            param.set(value=rng.uniform(0.1, 2))
+        elif name.endswith('phase'):
+            param.set(value=rng.uniform(-np.pi, np.pi))
+        elif name.endswith('lifetime'):
+            param.set(value=rng.uniform(2, 20))
+        elif name.endswith('beta'):
+            param.set(value=rng.uniform(0.8, 1.5), vary=True)
+        else:
+            param.set(value=rng.uniform(0.5, 2))
+    return params
+
+
+@pytest.mark.parametrize('name', FUSED_MODELS)
+def test_fused_model_has_the_parameters_of_the_composite_one(analysis, name):
+    fused_params = analysis.get_model_template(name)[1]
+    composite_params = composite_model(analysis, name).make_params()
+    assert list(fused_params) == list(composite_params)
+    for param_name, param in composite_params.items():
+        for attribute in ('value', 'min', 'max', 'vary', 'expr'):
+            assert getattr(fused_params[param_name], attribute) == getattr(param, attribute), \
+                '{0}.{1}'.format(param_name, attribute)
+
+
+@pytest.mark.parametrize('name', FUSED_MODELS)
+def test_fused_model_values_and_jacobian_equal_the_composite_ones(analysis, name):
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 20, 1000)
+    fused = analysis.get_model_template(name)[0]
+    composite = composite_model(analysis, name)
+    for _ in range(5):
+        params = random_params(composite.make_params(), rng)
+        values = composite.eval(params=params, x=x)
+        np.testing.assert_allclose(fused.eval(params=params, x=x), values, rtol=1e-12,
+                                   atol=1e-12)
+        expected = analysis.make_model_jacobian(composite)(params, values, None, x=x)
+        jacobian = analysis.make_model_jacobian(fused)(params, values, None, x=x)
+        np.testing.assert_allclose(jacobian, expected, rtol=1e-10, atol=1e-10)
+
+
+@pytest.mark.parametrize('name', FUSED_MODELS)
+def test_fused_model_fits_like_the_composite_one(analysis, name):
+    rng = np.random.default_rng(1)
+    x = np.linspace(0, 20, 1000)
+    fused = analysis.get_model_template(name)[0]
+    composite = composite_model(analysis, name)
+    truth = random_params(composite.make_params(), rng)
+    for param in truth.values():
+        if param.name.endswith('beta'):
+            param.set(value=1, vary=False)
+    data = composite.eval(params=truth, x=x) + rng.normal(0, 0.05, x.size)
+    start = truth.copy()
+    for param in start.values():
+        if param.vary:
+            param.value *= rng.uniform(0.98, 1.02)
+
+    results = [model.fit(data, x=x, params=start.copy()) for model in (composite, fused)]
+    for param_name in truth:
+        assert results[1].params[param_name].value == pytest.approx(
+            results[0].params[param_name].value, rel=1e-6, abs=1e-9), param_name
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from lmfit.model import ModelResult
+
+
+@pytest.fixture
+def gaussian_dip():
+    rng = np.random.default_rng(0)
+    x = np.linspace(-5, 5, 200)
+    y = 0.1 - 3 * np.exp(-x**2 / 2) + rng.normal(0, 0.02, x.size)
+    return x, y
+
+
+def test_lean_fit_matches_full_fit(analysis, gaussian_dip):
+    x, y = gaussian_dip
+    full = analysis.perform_fit(x, y, "gaussian", estimator="dip", curve=False)[-1]
+    lean = analysis.perform_fit(x, y, "gaussian", estimator="dip", curve=False, lean=True)[-1]
+
+    assert lean.nfev == full.nfev
+    for name, param in full.params.items():
+        assert lean.params[name].value == param.value
+    assert np.array_equal(lean.best_fit, full.best_fit)
+    assert lean.result_str_dict == full.result_str_dict
+    for name, param in full.params.items():
+        assert lean.params[name].stderr == pytest.approx(param.stderr)
+
+
+def test_lean_fit_defers_the_result_str_dict(analysis, gaussian_dip):
+    x, y = gaussian_dip
+    lean = analysis.perform_fit(x, y, "gaussian", estimator="dip", curve=False, lean=True)[-1]
+
+    assert type(lean) is ModelResult
+    assert "not made yet" in repr(lean.result_str_dict)
+    assert "Contrast" in lean.result_str_dict
+    assert "not made yet" not in repr(lean.result_str_dict)
+
+
+def test_lean_fit_calculates_skipped_uncertainties_when_read(analysis):
+    x = np.linspace(0, 10, 200)
+    y = 2 * np.exp(-x / 3) + 0.5 + np.random.default_rng(0).normal(0, 0.02, x.size)
+    fitter = analysis.prepare("decayexponential")
+    full = fitter._fit_result(x, y, method="nelder")
+    lean = fitter._fit_result(x, y, lean=True, method="nelder")
+
+    # a full fit without covariance keeps its type and has its result_str_dict right away
+    assert type(full) is ModelResult
+    assert full.covar is None and isinstance(full.result_str_dict, dict)
+    assert type(lean) is ModelResult
+    assert lean.covar is None
+    assert lean.result_str_dict["Lifetime"]["error"] > 0
+    assert lean.covar is not None
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from lmfit import Parameters
+
+
+@pytest.fixture
+def line():
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, 100)
+    return x, 2 * x + 1 + rng.normal(0, 0.1, x.size)
+
+
+def test_budget_is_left_to_lmfit(analysis, line):
+    x, y = line
+    plain = analysis.perform_fit(x, y, "linear", curve=False)[-1]
+    budgeted = analysis.perform_fit(x, y, "linear", curve=False, max_nfev=1)[-1]
+
+    assert plain.method == "linear least squares"
+    assert budgeted.method != "linear least squares"
+    assert budgeted.fit_status == "max_nfev"
+
+
+def test_closed_form_result_follows_the_parameter_names(analysis, line):
+    x, y = line
+    model, _ = analysis.get_model_template("linear")
+    params = Parameters()
+    params.add("offset", value=0)
+    params.add("slope", value=1)
+    closed = analysis._make_linear_result(model, params, x, y)
+    fitted = model.fit(y, params=params, x=x)
+
+    assert closed.var_names == fitted.var_names == ["offset", "slope"]
+    for name in ("slope", "offset"):
+        assert closed.params[name].value == pytest.approx(fitted.params[name].value)
+        assert closed.params[name].stderr == pytest.approx(fitted.params[name].stderr, rel=1e-4)
+    np.testing.assert_allclose(closed.covar, fitted.covar, rtol=1e-4)
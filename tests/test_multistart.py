@@ -0,0 +1,34 @@
+import time
+
+import numpy as np
+
+from market_analytics import analysis_logic
+
+
+def noisy_sine(points=200, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 10, points)
+    return x, np.sin(2 * np.pi * 0.4 * x + 0.5) + rng.normal(0, 0.05, points)
+
+
+def test_budget_covers_the_final_fit(analysis):
+    x, y = noisy_sine()
+    result = analysis.perform_multistart_fit(x, y, "sine", starts=2, seed=0, curve=False,
+                                             budget=60)[-1]
+    assert result.fit_status == "success"
+
+
+def test_final_fit_stops_once_the_budget_is_used_up(analysis, monkeypatch):
+    fit_start = analysis_logic._fit_start
+
+    def slow_fit_start(*args, **kwargs):
+        row = fit_start(*args, **kwargs)
+        time.sleep(0.6)
+        return row
+
+    monkeypatch.setattr(analysis_logic, "_fit_start", slow_fit_start)
+    x, y = noisy_sine()
+    result = analysis.perform_multistart_fit(x, y, "sine", starts=1, curve=False, budget=0.5)[-1]
+
+    assert result.fit_status == "timeout"
+    assert result.nfev == 0
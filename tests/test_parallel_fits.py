@@ -0,0 +1,70 @@
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def gapped_decays(points=200, series=6, seed=0):
+    """ Noisy exponential decays, every second one with NaN values, which makes model.fit raise. """
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 10, points)
+    y = (rng.uniform(1, 3, series) * np.exp(-x[:, None] / rng.uniform(2, 5, series))
+         + rng.normal(0, 0.02, (points, series)))
+    for i in range(0, series, 2):
+        y[rng.choice(points, size=3, replace=False), i] = np.nan
+    return x, y
+
+
+def test_perform_fits_workers_use_the_settings_of_the_parent(analysis):
+    x, y = gapped_decays()
+    analysis.fit_failure_policy = "error"
+    serial = analysis.perform_fits(x, y, "decayexponential").to_frame()
+    serial_failures = dict(analysis.fit_failures)
+    analysis.fit_failures.clear()
+    parallel = analysis.perform_fits(x, y, "decayexponential", workers=2).to_frame()
+
+    assert serial_failures == {("decayexponential", "error"): 3}
+    assert dict(analysis.fit_failures) == serial_failures
+    assert serial["error"].sum() == 3
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+def test_perform_rolling_fit_workers_use_the_settings_of_the_parent(analysis):
+    x, y = gapped_decays(series=1)
+    analysis.fit_failure_policy = "error"
+    analysis.use_analytic_jacobian = False
+    serial = analysis.perform_rolling_fit(x, y[:, 0], "decayexponential", window=60,
+                                          step=20).to_frame()
+    serial_failures = dict(analysis.fit_failures)
+    analysis.fit_failures.clear()
+    parallel = analysis.perform_rolling_fit(x, y[:, 0], "decayexponential", window=60, step=20,
+                                            workers=2).to_frame()
+
+    assert sum(serial_failures.values()) > 0
+    assert dict(analysis.fit_failures) == serial_failures
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+def test_perform_multistart_fit_final_fit_keeps_its_timeout(analysis):
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, 200)
+    y = (np.sin(2 * np.pi * 0.4 * x) + 0.5 * np.sin(2 * np.pi * 1.1 * x + 1)
+         + rng.normal(0, 0.05, x.size))
+    statuses = [analysis.perform_multistart_fit(x, y, "sinedouble", starts=3, workers=workers,
+                                                seed=0, curve=False, timeout=1e-9)[-1].fit_status
+                for workers in (1, 2)]
+
+    assert statuses == ["timeout", "timeout"]
+
+
+def test_perform_multistart_fit_stops_workers_at_the_budget(analysis):
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, 200000)
+    y = (np.sin(2 * np.pi * 0.4 * x) + 0.5 * np.sin(2 * np.pi * 1.1 * x + 1)
+         + 0.3 * np.sin(2 * np.pi * 2.3 * x) + rng.normal(0, 0.05, x.size))
+    with pytest.raises(RuntimeError, match="None of the 0 finished starts"):
+        analysis.perform_multistart_fit(x, y, "sinetriple", starts=4, workers=2, seed=0,
+                                        curve=False, budget=0.5)
+
+    assert multiprocessing.active_children() == []
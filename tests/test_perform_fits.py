@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def test_one_dimensional_y_is_fitted_as_one_series(analysis):
+    x = np.linspace(0, 10, 50)
+    y = 2 * x + 1
+    summaries = analysis.perform_fits(x, y, "linear")
+    frame = summaries.to_frame()
+    assert len(frame) == 1
+    assert frame["slope"].iloc[0] == pytest.approx(2)
+
+    series = pd.Series(y, name="asset")
+    assert list(analysis.perform_fits(x, series, "linear").to_frame().index) == ["asset"]
+
+
+def test_invalid_y_shape_raises(analysis):
+    x = np.linspace(0, 10, 50)
+    with pytest.raises(ValueError, match="2D"):
+        analysis.perform_fits(x, np.zeros((50, 2, 2)), "linear")
+    with pytest.raises(ValueError, match="rows"):
+        analysis.perform_fits(x, np.zeros((40, 2)), "linear")
@@ -0,0 +1,59 @@
+import sys
+import time
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def sinemethods(analysis):
+    # loads sinemethods, compute_ft and compute_lomb_scargle are module level
+    analysis.make_sine_model()
+    return sys.modules['sinemethods']
+
+
+def direct_lomb_scargle(x, y, frequencies):
+    """ Amplitude of the least squares sine and cosine at every frequency, fitted one by one. """
+    amplitudes = []
+    for frequency in frequencies[1:]:
+        design = np.column_stack([np.cos(2 * np.pi * frequency * x),
+                                  np.sin(2 * np.pi * frequency * x)])
+        coefficients = np.linalg.lstsq(design, y - y.mean(), rcond=None)[0]
+        amplitudes.append(np.hypot(*coefficients))
+    return np.array(amplitudes)
+
+
+def test_lomb_scargle_matches_direct_sums(sinemethods):
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(0, 30, 400))
+    y = 1.3 * np.sin(2 * np.pi * 0.8 * x + 0.4) + rng.normal(0, 0.3, x.size)
+    ls_x, ls_y = sinemethods.compute_lomb_scargle(x, y)
+
+    expected = direct_lomb_scargle(x, y, ls_x)
+    assert np.max(np.abs(ls_y[1:] - expected)) < 1e-3 * expected.max()
+    assert ls_x[ls_y.argmax()] == pytest.approx(0.8, abs=ls_x[1])
+
+
+def test_dropped_point_keeps_the_fft_grid(analysis, sinemethods):
+    x = np.linspace(0, 100, 40000)
+    y = np.sin(2 * np.pi * 0.37 * x)
+    dft_x, dft_y, stepsize = analysis._sine_spectrum(np.delete(x, 1234), np.delete(y, 1234))
+
+    full_x, full_y = sinemethods.compute_ft(x, y, zeropad_num=1)
+    assert np.array_equal(dft_x, full_x)
+    assert stepsize == pytest.approx(x[1] - x[0])
+    assert np.max(np.abs(dft_y - full_y)) < 1e-3
+
+
+def test_lomb_scargle_grows_about_linearly(sinemethods):
+    rng = np.random.default_rng(0)
+    timings = []
+    for size in (20000, 160000):
+        x = np.sort(rng.uniform(0, 30, size))
+        y = np.sin(2 * np.pi * 0.7 * x)
+        start = time.perf_counter()
+        ls_x, _ = sinemethods.compute_lomb_scargle(x, y)
+        timings.append(time.perf_counter() - start)
+        assert len(ls_x) < 2 * size
+    # 8 times the points would take 64 times as long with direct sums
+    assert timings[1] < 24 * timings[0] + 0.05